@@ -0,0 +1,63 @@
+"""
+Measures the tick cost of BeltSystem with 100k belt tiles.
+
+The belts are laid out as rows of straight lines over a flat world. Every tick,
+each line gets a new item at its start if there is room, and delivers its first
+item into a sink.
+
+Usage:
+    python -m benchmarks.bench_belts [LINES] [LINE_LENGTH] [TICKS]
+"""
+import sys
+import time
+
+from core.config import Config
+from core.map import Map, TerrainType
+from entities.belt import BeltSystem, Direction
+from entities.ore import CoalItem
+
+
+class Sink:
+    def __init__(self):
+        self.total = 0
+
+    def add_many(self, items):
+        self.total += sum(items.values())
+        return True
+
+
+def main(lines, line_length, ticks):
+    Config.MAP_SIZE = None
+    game_map = Map(seed=0)
+    game_map.load_area(0, 0, line_length, lines)
+    for chunk in game_map.chunks.values():
+        chunk[:] = TerrainType.GRASS.value
+
+    belts = BeltSystem(game_map)
+    start = time.perf_counter()
+    for y in range(lines):
+        for x in range(line_length):
+            belts.place(x, y, Direction.RIGHT)
+    print(f"{len(belts)} belt tiles in {len(belts.lines)} lines, placed in {time.perf_counter() - start:.2f} s")
+
+    sink = Sink()
+    starts = [belts.tile_lines[(0, y)] for y in range(lines)]
+    for y in range(lines):
+        belts.connect_output(line_length - 1, y, sink)
+
+    for label, feeding in (("filling", True), ("draining", False)):
+        start = time.perf_counter()
+        for _ in range(ticks):
+            if feeding:
+                for line in starts:
+                    line.add_many({CoalItem: 1})
+            belts.tick()
+        elapsed = time.perf_counter() - start
+        on_belts = sum(len(line) for line in belts.lines)
+        print(f"{label}: {elapsed / ticks * 1000:.3f} ms/tick, {on_belts} items on belts, {sink.total} delivered")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 2000)
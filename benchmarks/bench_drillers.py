@@ -0,0 +1,54 @@
+"""
+Measures the tick cost of DrillerSystem with 1k, 10k and 100k drillers.
+
+The drillers are laid out side by side over a world turned into coal and iron
+fields, so every one of them mines, and all deposit into one inventory large
+enough to never fill up.
+
+Usage:
+    python -m benchmarks.bench_drillers [TICKS]
+"""
+import sys
+import time
+
+import numpy as np
+
+from core.config import Config
+from core.inventory import Inventory
+from core.map import Map, TerrainType
+from core.scheduler import Scheduler
+from entities.driller import Driller, DrillerSystem
+
+
+def main(ticks):
+    Config.MAP_SIZE = None
+    game_map = Map(seed=0)
+
+    for count in (1_000, 10_000, 100_000):
+        side = int(np.ceil(np.sqrt(count)))
+        index = np.arange(count)
+        xs = index % side * Driller.SHAPE[0]
+        ys = index // side * Driller.SHAPE[1]
+        game_map.load_area(0, 0, side * Driller.SHAPE[0], side * Driller.SHAPE[1])
+        for (cx, cy), chunk in game_map.chunks.items():
+            chunk[:] = TerrainType.COAL.value if (cx + cy) % 2 else TerrainType.IRON.value
+
+        scheduler = Scheduler()
+        drillers = DrillerSystem(game_map, scheduler)
+        inventory = Inventory(1000, 100)
+        # Placed in batches over a mining cycle, as drillers placed over time are
+        for batch in np.array_split(index, Config.DRILLER_MINING_TIME):
+            drillers.add_many(xs[batch], ys[batch], inventory)
+            scheduler.step()
+        mined = inventory.total
+
+        start = time.perf_counter()
+        scheduler.advance(scheduler.tick + ticks)
+        elapsed = time.perf_counter() - start
+
+        print(f"{count:>7} drillers: {elapsed / ticks * 1000:.3f} ms/tick, "
+              f"{inventory.total - mined} ores mined in {ticks} ticks")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
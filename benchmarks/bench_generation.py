@@ -0,0 +1,80 @@
+"""
+Times the generation of a whole map for several map sizes, serially and on a process pool.
+
+Usage:
+    python -m benchmarks.bench_generation [SIZE ...]
+"""
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.config import Config
+from core.generation import generate_parallel
+from core.map import Map, TerrainType
+
+
+def bench_generation(size, seed=0):
+    """
+    Generates every chunk of a map of the given size, one chunk after the other.
+
+    Args:
+        size (int): Side of the map in tiles.
+        seed (int): Seed of the world generation.
+
+    Returns:
+        tuple: (seconds, generated map)
+    """
+    Config.MAP_SIZE = size
+    game_map = Map(seed=seed)
+    start = time.perf_counter()
+    game_map.load_area(0, 0, size, size)
+    return time.perf_counter() - start, game_map
+
+
+def bench_parallel(size, workers, seed=0):
+    """
+    Generates a map of the given size region by region on `workers` processes.
+
+    Returns:
+        tuple: (seconds, tiles of the map)
+    """
+    Config.MAP_SIZE = size
+    chunks = -(-size // Config.CHUNK_SIZE)
+    side = chunks * Config.CHUNK_SIZE
+    memory = shared_memory.SharedMemory(create=True, size=side * side * np.dtype(Map.TILE_DTYPE).itemsize)
+    tiles = np.ndarray((side, side), dtype=Map.TILE_DTYPE, buffer=memory.buf)
+
+    game_map = Map(seed=seed)
+    start = time.perf_counter()
+    generate_parallel(game_map, 0, 0, chunks, chunks, memory.name, tiles, workers=workers)
+    seconds = time.perf_counter() - start
+
+    result = tiles[:size, :size].copy()
+    del game_map, tiles
+    memory.close()
+    memory.unlink()
+    return seconds, result
+
+
+def main(sizes):
+    workers = os.cpu_count() or 1
+    print(f"{'size':>6} {'chunks':>7} {'serial s':>9} {'tiles/s':>12} {f'{workers} proc s':>9} {'identical':>10} {'water':>9}")
+    for size in sizes:
+        seconds, game_map = bench_generation(size)
+        parallel_seconds, tiles = bench_parallel(size, workers)
+
+        serial_tiles = np.zeros_like(tiles)
+        for (cx, cy), chunk in game_map.chunks.items():
+            x, y = cx * game_map.chunk_size, cy * game_map.chunk_size
+            serial_tiles[y:y + game_map.chunk_size, x:x + game_map.chunk_size] = chunk[:size - y, :size - x]
+        identical = np.array_equal(serial_tiles, tiles)
+
+        water = int((tiles == TerrainType.WATER.value).sum())
+        print(f"{size:>6} {len(game_map.chunks):>7} {seconds:>9.3f} {size * size / seconds:>12.0f} {parallel_seconds:>9.3f} {identical!s:>10} {water:>9}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [200, 1000, 4000])
@@ -0,0 +1,69 @@
+"""
+Compares the per-tile rendering loop with the batched chunk rendering of MapRenderer.
+
+Usage:
+    python -m benchmarks.bench_render [CHUNKS]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from core.camera import Camera
+from core.config import Config
+from core.map import Map, MapRenderer, TerrainType
+
+
+def render_per_tile(renderer, surface, cx, cy):
+    """The former rendering loop: one TerrainType lookup chain and one draw call per tile."""
+    chunk = renderer.game_map.get_chunk(cx, cy)
+    for y in range(chunk.shape[0]):
+        for x in range(chunk.shape[1]):
+            tile_value = chunk[y][x]
+            if TerrainType(tile_value) == TerrainType.GRASS:
+                surface.blit(renderer.grass_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
+            elif TerrainType(tile_value) == TerrainType.COAL:
+                surface.blit(renderer.coal_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
+            elif TerrainType(tile_value) == TerrainType.IRON:
+                surface.blit(renderer.iron_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
+            else:
+                color = renderer.COLOR_MAP.get(TerrainType(tile_value), (255, 255, 255))
+                pygame.draw.rect(
+                    surface, color, pygame.Rect(x * Config.TILES_SIZE, y * Config.TILES_SIZE, Config.TILES_SIZE, Config.TILES_SIZE)
+                )
+
+
+def bench(render, renderer, keys):
+    surface = pygame.Surface((renderer.chunk_pixels, renderer.chunk_pixels))
+    start = time.perf_counter()
+    for cx, cy in keys:
+        render(surface, cx, cy)
+    return time.perf_counter() - start, pygame.surfarray.array3d(surface)
+
+
+def main(side):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    Config.MAP_SIZE = None
+    game_map = Map(seed=0)
+    renderer = MapRenderer(game_map, Camera(0, 0, Config.TILES_SIZE, None))
+    keys = [(cx, cy) for cy in range(side) for cx in range(side)]
+    game_map.load_area(0, 0, side * game_map.chunk_size, side * game_map.chunk_size)
+
+    per_tile, per_tile_pixels = bench(lambda surface, cx, cy: render_per_tile(renderer, surface, cx, cy), renderer, keys)
+    batched, batched_pixels = bench(renderer.render_static_map, renderer, keys)
+
+    tiles = len(keys) * game_map.chunk_size**2
+    print(f"{len(keys)} chunks, {tiles} tiles")
+    print(f"per tile: {per_tile:.3f} s ({tiles / per_tile:.0f} tiles/s)")
+    print(f"batched:  {batched:.3f} s ({tiles / batched:.0f} tiles/s)")
+    print(f"speedup:  {per_tile / batched:.1f}x, identical output: {np.array_equal(per_tile_pixels, batched_pixels)}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8)
@@ -0,0 +1,104 @@
+"""
+Replays a recorded session headlessly and reports its tick timings and final state hash.
+
+Sessions are recorded with `python main.py --record session.npz`. The replay runs on
+the world the session was recorded on and times every tick of the main scene, the
+world generation is left out.
+
+Given a baseline run saved with --out, the run is compared to it: the exit status is
+1 if the final states differ, or if the mean tick got slower than the tolerance.
+
+Usage:
+    python -m benchmarks.bench_replay RECORDING [--out RUN.json] [--baseline RUN.json] [--tolerance 0.1]
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from core.game import Game
+from core.input import InputRecording, ReplayInput
+from core.scenes import MainScene
+
+STATS = ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+def replay(recording):
+    """Returns the duration of every tick in seconds and the final state hash."""
+    game = Game(headless=True, seed=recording.seed, game_input=ReplayInput(recording))
+    game.alpha = 1
+    timings = []
+    while game.running:
+        game.scene_manager.handle_events()
+        if not game.running:
+            break
+        scene = game.scene_manager.current_scene
+        start = time.perf_counter()
+        game.update()
+        if isinstance(scene, MainScene):
+            timings.append(time.perf_counter() - start)
+    state_hash = game.scene_manager.current_scene.state_hash()
+    game.close()
+    return np.array(timings), state_hash
+
+
+def summarize(timings, state_hash):
+    milliseconds = timings * 1000
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99]) if len(milliseconds) else (0, 0, 0)
+    return {"ticks": len(milliseconds),
+            "hash": state_hash,
+            "total_s": float(timings.sum()),
+            "mean_ms": float(milliseconds.mean()) if len(milliseconds) else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(milliseconds.max()) if len(milliseconds) else 0.0,
+            "tick_ms": np.round(milliseconds, 4).tolist()}
+
+
+def compare(run, baseline, tolerance):
+    """Prints the run next to the baseline, returns False on a different state or a slowdown."""
+    print(f"{'':>8} {'baseline':>10} {'run':>10} {'ratio':>7}")
+    for stat in STATS:
+        ratio = run[stat] / baseline[stat] if baseline[stat] else float("nan")
+        print(f"{stat:>8} {baseline[stat]:>10.3f} {run[stat]:>10.3f} {ratio:>7.2f}")
+
+    same_state = run["hash"] == baseline["hash"] and run["ticks"] == baseline["ticks"]
+    if not same_state:
+        print(f"state differs: {run['hash']} after {run['ticks']} ticks, "
+              f"{baseline['hash']} after {baseline['ticks']} ticks in the baseline")
+    slower = run["mean_ms"] > baseline["mean_ms"] * (1 + tolerance)
+    if slower:
+        print(f"mean tick slower than the baseline by more than {tolerance:.0%}")
+    return same_state and not slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session and time it")
+    parser.add_argument("recording", help="recording written by main.py --record")
+    parser.add_argument("--out", metavar="PATH", help="save the run, with every tick duration, as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="run saved with --out to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="accepted mean tick slowdown, 0.1 for 10%%")
+    args = parser.parse_args()
+
+    recording = InputRecording.load(args.recording)
+    run = summarize(*replay(recording))
+    print(f"{run['ticks']} ticks in {run['total_s']:.3f} s, "
+          + ", ".join(f"{stat} {run[stat]:.3f}" for stat in STATS))
+    print(f"state {run['hash']}")
+
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(run, file)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if not compare(run, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares updating every entity each tick with waking entities through the Scheduler.
+
+Every entity has work to do once per period, drawn between 60 and 6000 ticks, as
+machines waiting on a craft or a blocked output do.
+
+Usage:
+    python -m benchmarks.bench_scheduler [ENTITIES] [TICKS]
+"""
+import sys
+import time
+
+import numpy as np
+
+from core.scheduler import Scheduler
+
+
+class PolledEntity:
+    def __init__(self, period):
+        self.period = period
+        self.remaining = period
+        self.work_done = 0
+
+    def update(self):
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.work_done += 1
+            self.remaining = self.period
+
+
+class ScheduledEntity:
+    def __init__(self, period, scheduler):
+        self.period = period
+        self.scheduler = scheduler
+        self.work_done = 0
+        scheduler.schedule_in(period, self.wake)
+
+    def wake(self, tick):
+        self.work_done += 1
+        self.scheduler.schedule(tick + self.period, self.wake)
+
+
+def main(count, ticks):
+    periods = np.random.default_rng(0).integers(60, 6000, count).tolist()
+
+    polled = [PolledEntity(period) for period in periods]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for entity in polled:
+            entity.update()
+    polled_time = time.perf_counter() - start
+
+    scheduler = Scheduler()
+    scheduled = [ScheduledEntity(period, scheduler) for period in periods]
+    start = time.perf_counter()
+    scheduler.advance(ticks)
+    scheduled_time = time.perf_counter() - start
+
+    work = sum(entity.work_done for entity in scheduled)
+    print(f"{count} entities, {ticks} ticks, {work} wake-ups")
+    print(f"update every entity: {polled_time / ticks * 1000:.3f} ms/tick")
+    print(f"scheduler:           {scheduled_time / ticks * 1000:.3f} ms/tick")
+    print(f"same work done: {work == sum(entity.work_done for entity in polled)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 600)
@@ -0,0 +1,170 @@
+import hashlib
+import math
+import os
+import tempfile
+
+import numpy as np
+import pygame
+from core.config import Config
+
+
+class TextureAtlas:
+    def __init__(self, surface, rects):
+        """
+        Sprites packed on one surface.
+
+        Args:
+            surface (pygame.Surface): The packed sprites.
+            rects (dict): {file name: pygame.Rect} of each sprite on the surface.
+        """
+        self.surface = surface
+        self.rects = rects
+        self.sprites = {}
+
+    def sprite(self, name):
+        """Returns a sprite as a subsurface sharing the atlas pixels."""
+        if name not in self.sprites:
+            self.sprites[name] = self.surface.subsurface(self.rects[name])
+        return self.sprites[name]
+
+
+class AssetManager:
+    BAKE_VERSION = 1  # Bump when the baking changes, to ignore older bakes
+
+    def __init__(self, image_path=Config.PATH_IMAGES, cache_dir=Config.ASSET_CACHE_DIR):
+        """
+        Shared images, loaded on first use.
+
+        Sprites used at the tile size are packed into atlases. A baked atlas is saved
+        raw in `cache_dir` under a key made of the image file hashes and the tile size,
+        so later launches read the pixels back without decoding nor rescaling.
+
+        Args:
+            image_path (str): Folder of the image files.
+            cache_dir (str): Folder of the baked atlases, None to disable the bake cache.
+        """
+        self.image_path = image_path
+        self.cache_dir = cache_dir
+        self.images = {}  # {(name, size): surface}
+        self.atlases = {}  # {(names, tile size): TextureAtlas}
+        self.solids = {}
+        self.file_hashes = {}
+
+    def prepare(self, surface):
+        """Converts a surface to the display format once a display exists."""
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha()
+
+    def file_hash(self, name):
+        if name not in self.file_hashes:
+            with open(os.path.join(self.image_path, name), "rb") as file:
+                self.file_hashes[name] = hashlib.sha256(file.read()).digest()
+        return self.file_hashes[name]
+
+    def get_image(self, name, size=None):
+        """
+        Returns an image file, loaded and scaled once.
+
+        Args:
+            name (str): File name in the image folder.
+            size (tuple): (width, height) to scale to, None for the file size.
+        """
+        key = (name, size)
+        if key not in self.images:
+            if size is None:
+                self.images[key] = self.prepare(pygame.image.load(os.path.join(self.image_path, name)))
+            else:
+                self.images[key] = self.prepare(pygame.transform.scale(self.get_image(name), size))
+        return self.images[key]
+
+    def get_atlas(self, names, tile_size=Config.TILES_SIZE):
+        """
+        Returns the atlas of sprites scaled to a tile size, baked once.
+
+        Args:
+            names (iterable): Image file names, packed in this order.
+            tile_size (int): Side of every sprite in the atlas.
+
+        Returns:
+            TextureAtlas: The atlas.
+        """
+        names = tuple(names)
+        key = (names, tile_size)
+        if key in self.atlases:
+            return self.atlases[key]
+
+        columns = math.ceil(math.sqrt(len(names)))
+        rows = math.ceil(len(names) / columns)
+        rects = {name: pygame.Rect(index % columns * tile_size, index // columns * tile_size, tile_size, tile_size)
+                 for index, name in enumerate(names)}
+
+        path = self.bake_path(names, tile_size)
+        surface = self.load_bake(path)
+        if surface is None:
+            surface = pygame.Surface((columns * tile_size, rows * tile_size), pygame.SRCALPHA)
+            for name, rect in rects.items():
+                surface.blit(pygame.transform.scale(pygame.image.load(os.path.join(self.image_path, name)),
+                                                    (tile_size, tile_size)), rect)
+            self.save_bake(path, surface)
+
+        atlas = self.atlases[key] = TextureAtlas(self.prepare(surface), rects)
+        return atlas
+
+    def bake_path(self, names, tile_size):
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(f"{self.BAKE_VERSION}:{tile_size}".encode())
+        for name in names:
+            digest.update(name.encode())
+            digest.update(self.file_hash(name))
+        return os.path.join(self.cache_dir, digest.hexdigest() + ".npy")
+
+    def load_bake(self, path):
+        """Reads a baked atlas, None if it is missing or unreadable."""
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            pixels = np.load(path)
+        except (OSError, ValueError):
+            return None
+        height, width = pixels.shape[:2]
+        return pygame.image.frombytes(pixels.tobytes(), (width, height), "RGBA")
+
+    def save_bake(self, path, surface):
+        """Writes the raw RGBA pixels of an atlas, through a temporary file so readers never see half of it."""
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        pixels = np.frombuffer(pygame.image.tobytes(surface, "RGBA"), dtype=np.uint8)
+        pixels = pixels.reshape(surface.get_height(), surface.get_width(), 4)
+        descriptor, temporary = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                np.save(file, pixels)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    def get_solid(self, color, size, border_color=None, border_width=0):
+        """
+        Returns a shared surface filled with a color, for the entities drawn as plain rectangles.
+
+        Args:
+            color (tuple): RGB fill color.
+            size (tuple): (width, height) in pixels.
+            border_color (tuple): RGB color of an outline, None for no outline.
+            border_width (int): Width of the outline.
+        """
+        key = (color, size, border_color, border_width)
+        if key not in self.solids:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            if border_color is not None:
+                pygame.draw.rect(surface, border_color, surface.get_rect(), border_width)
+            self.solids[key] = surface
+        return self.solids[key]
+
+
+assets = AssetManager()
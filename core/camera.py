@@ -1,3 +1,5 @@
+import math
+
 from core.config import Config
 from enum import Enum
 
@@ -8,32 +10,82 @@ class CameraMode(Enum):
     TRACKING = 1
 
 class Camera:
-    def __init__(self, x, y, tile_size):
+    def __init__(self, x, y, tile_size, map_size=Config.MAP_SIZE):
         self.x = x
         self.y = y
+        self.previous_x = x
+        self.previous_y = y
+        self.render_x = x
+        self.render_y = y
+        self.base_tile_size = tile_size
+        self.zoom_level = 0
+        self.tile_size = tile_size # pixels per tile at the current zoom level
         self.width = Config.WINDOW_SIZE[0]//tile_size
         self.height = Config.WINDOW_SIZE[1]//tile_size
+        self.map_size = map_size
 
         self.mode = False
         self.entity = None
         
         
+    def clamp(self, x, y):
+        """Keeps the view inside the map, unbounded maps are not clamped."""
+        if self.map_size is None:
+            return x, y
+        return (max(0, min(x, self.map_size - self.width)),
+                max(0, min(y, self.map_size - self.height)))
+
     def move_to(self, x, y):
-        self.x = max(0, min(x, Config.MAP_SIZE - self.width))
-        self.y = max(0, min(y, Config.MAP_SIZE - self.height))
+        self.x, self.y = self.clamp(x, y)
         
         
     def move(self, dx, dy):
-        self.x = max(0, min(self.x + dx, Config.MAP_SIZE - self.width))
-        self.y = max(0, min(self.y + dy, Config.MAP_SIZE - self.height))
+        self.x, self.y = self.clamp(self.x + dx, self.y + dy)
+
+
+    def set_zoom(self, level):
+        """
+        Changes the zoom level, keeping the center of the view in place.
+
+        Args:
+            level (int): Index in Config.ZOOM_LEVELS, 0 for the full resolution.
+        """
+        level = max(0, min(level, len(Config.ZOOM_LEVELS) - 1))
+        center_x = self.x + self.width / 2
+        center_y = self.y + self.height / 2
+        self.zoom_level = level
+        self.tile_size = self.base_tile_size / Config.ZOOM_LEVELS[level]
+        self.width = int(Config.WINDOW_SIZE[0] // self.tile_size)
+        self.height = int(Config.WINDOW_SIZE[1] // self.tile_size)
+        self.move_to(center_x - self.width / 2, center_y - self.height / 2)
+        # Don't interpolate across the zoom change
+        self.previous_x, self.previous_y = self.render_x, self.render_y = self.x, self.y
+
+    def zoom(self, steps):
+        """Zooms out by `steps` levels, in for negative steps."""
+        self.set_zoom(self.zoom_level + steps)
 
+    def save_position(self):
+        """Remembers the position of the last tick, to interpolate the rendering."""
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+    def interpolate(self, alpha):
+        """
+        Places the rendered view between the last two ticks.
+
+        Args:
+            alpha (float): 0 for the previous tick position, 1 for the current one.
+        """
+        self.render_x = self.previous_x + (self.x - self.previous_x) * alpha
+        self.render_y = self.previous_y + (self.y - self.previous_y) * alpha
 
     def set_mode(self, mode, entity=None):
         self.mode = mode        
         self.entity = entity
 
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
+    def handle_input(self, keys):
+        """Moves a free camera with the arrow keys, `keys` being the KeyState of the tick."""
         if keys[pygame.K_UP]:
             self.move(0, -0.2)
         if keys[pygame.K_DOWN]:
@@ -49,14 +101,24 @@ class Camera:
                 self.move_to(self.entity.x - self.width//2, self.entity.y - self.height//2)
                 
                 
+    def get_tile(self, screen_x, screen_y):
+        """
+        Returns the map tile under a screen position.
+
+        Uses the position of the last tick rather than the interpolated one, so that
+        the result doesn't depend on the frame timing and replays the same.
+        """
+        return (math.floor(screen_x / self.tile_size + self.x),
+                math.floor(screen_y / self.tile_size + self.y))
+
     def get_offset(self):
         """
         Calculate the camera's offset for rendering.
         Returns:
             tuple: (offset_x, offset_y)
         """
-        offset_x = self.x * Config.TILES_SIZE
-        offset_y = self.y * Config.TILES_SIZE
+        offset_x = self.render_x * self.tile_size
+        offset_y = self.render_y * self.tile_size
         return offset_x, offset_y
 
         
@@ -3,16 +3,57 @@ class Config:
     TITLE = "Pyfactorio"
     FPS = 60
 
+    #SIMULATION CONFIG
+    SIMULATION_RATE = 60 # ticks per second, independent of FPS
+    MAX_FRAME_TIME = 0.25 # seconds of simulation caught up at most per frame
+    INTERPOLATE = True # interpolate rendering between the last two ticks
+
+    #PROFILER CONFIG
+    PROFILER_SAMPLES = 600 # durations kept per profiled section
+    PROFILE_DUMP_PATH = "profile.json" # .json or .csv
+
     #MAP CONFIG
-    MAP_SIZE = 200
-    
+    MAP_SIZE = 200 # None for an unbounded world
+    CHUNK_SIZE = 32
+    CHUNK_KEEP_RADIUS = 4 # chunks kept loaded around the camera and the player
+    SPATIAL_CELL_SIZE = 8 # tiles per side of the entity index cells
+
+    #SCHEDULER CONFIG
+    SCHEDULER_WHEEL_SIZE = 256 # ticks covered by the timer wheel, later events wait in a heap
+
+    #DRILLER CONFIG
+    DRILLER_MINING_TIME = 60 # ticks to mine one ore
+    DRILLER_BUFFER_SIZE = 10 # ores held by a driller that could not deposit them
+
+    #BELT CONFIG
+    BELT_TILE_LENGTH = 32 # position units along a belt tile
+    BELT_ITEM_SPACING = 8 # units between two items on a belt, 4 items per tile
+    BELT_SPEED = 1 # units moved per tick
+
+    #MAP GENERATION CONFIG
+    LAKE_DENSITY = 10 / 200**2 # lakes per tile
+    LAKE_MAX_SIZE = 30
+    FEATURE_DENSITY = 5 / 200**2 # ore patches per tile, for each ore
+    FEATURE_SIZE = 5
+    GENERATION_REGION_SIZE = 8 # chunks per side of the regions generated in parallel
+    GENERATION_WORKERS = None # processes generating regions, None for one per core
+    WORLD_CACHE_DIR = ".cache/worlds/" # generated worlds keyed by seed and generation parameters, None to disable
+
     #MAP RENDER CONFIG
     TILES_SIZE = 20
-    
+    RENDER_CACHE_BUDGET = 64 * 1024 * 1024 # bytes of pre-rendered chunk surfaces, must cover the view
+    ZOOM_LEVELS = (1, 2, 4, 10, 20, 40) # downsampling factors, must divide TILES_SIZE or be multiples of it dividing CHUNK_SIZE * TILES_SIZE
+    MINIMAP_SIZE = 200 # pixels, drawn from the last zoom level
+    CHUNK_GENERATION_BUDGET = 0.004 # seconds per frame generating the chunks shown by zoomed out views
+
     #INVENTORY CONFIG
     MAX_STACK_SIZE = 64
-    
+
     #INVENTORY RENDER CONFIG
     INVENTORY_CELL_SIZE = 60
-    
-    PATH_IMAGES = "assets/images/"
\ No newline at end of file
+
+    #TEXT RENDER CONFIG
+    TEXT_CACHE_SIZE = 512 # rendered text surfaces kept
+
+    PATH_IMAGES = "assets/images/"
+    ASSET_CACHE_DIR = ".cache/assets/" # baked sprite atlases, safe to delete
\ No newline at end of file
@@ -1,5 +1,7 @@
 import pygame
+import numpy as np
 from core.config import Config
+from core.items import item_registry
 
 class Recipe:
     def __init__(self, name, ingredients, output):
@@ -13,64 +15,183 @@ class Recipe:
         self.name = name
         self.ingredients = ingredients
         self.output = output
+        self.ingredient_ids = np.array([item_registry.get(item).id for item in ingredients], dtype=np.intp)
+        self.ingredient_amounts = np.array(list(ingredients.values()), dtype=np.int64)
+        self.output_id = item_registry.get(output[0]).id
+
+    def get_vector(self):
+        """Returns the ingredients as a vector of len(item_registry) counts indexed by item ID."""
+        vector = np.zeros(len(item_registry), dtype=np.int64)
+        vector[self.ingredient_ids] = self.ingredient_amounts
+        return vector
 
 
 class CraftingMenu:
     def __init__(self, inventory):
         """Initializes the crafting menu.
 
+        The recipes are compiled into an ingredient matrix, one row per recipe and one
+        column per item ID, so the craftability of every recipe comes from a single
+        comparison with the inventory count vector. It is only recomputed after the
+        inventory changed.
+
         Args:
             inventory (Inventory): The player's inventory instance.
         """
-class CraftingMenu:
-    def __init__(self, inventory):
         self.inventory = inventory
         self.recipes = []
+        self.recipe_indices = {}  # {recipe: matrix row}
+        self.producers = {}  # {item ID: recipe producing it}
         self.selected_recipe = None
         self.windows_open = False
-        self.recipe_cells = {}  # Initialisation correcte
 
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+        self.craftable = np.zeros(0, dtype=bool)
+        self.max_crafts = np.zeros(0, dtype=np.int64)
+        self.outdated = True
+        self.inventory.add_listener(self.on_inventory_change)
 
-        
     def add_recipe(self, recipe):
         """Adds a new recipe to the crafting menu.
 
         Args:
             recipe (Recipe): The recipe to add.
         """
+        self.recipe_indices[recipe] = len(self.recipes)
         self.recipes.append(recipe)
+        self.producers.setdefault(recipe.output_id, recipe)
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+        self.outdated = True
 
-    def can_craft(self, recipe):
+    def on_inventory_change(self, inventory, changes):
+        self.outdated = True
+
+    def get_matrix(self):
+        """Returns the ingredient matrix, rebuilt when recipes or items were registered since."""
+        if self.matrix.shape != (len(self.recipes), len(item_registry)):
+            self.matrix = np.zeros((len(self.recipes), len(item_registry)), dtype=np.int64)
+            for row, recipe in enumerate(self.recipes):
+                self.matrix[row, recipe.ingredient_ids] = recipe.ingredient_amounts
+        return self.matrix
+
+    def update_craftable(self):
+        """Recomputes which recipes can be crafted, and how many times, if the inventory changed."""
+        if not self.outdated:
+            return
+        matrix = self.get_matrix()
+        counts = self.inventory.count_vector()[:matrix.shape[1]]
+        self.craftable = np.all(counts >= matrix, axis=1)
+        ratios = np.where(matrix > 0, counts // np.maximum(matrix, 1), np.iinfo(np.int64).max)
+        self.max_crafts = ratios.min(axis=1, initial=np.iinfo(np.int64).max)
+        self.outdated = False
+
+    def can_craft(self, recipe, n=1):
         """Checks if a recipe can be crafted.
 
         Args:
             recipe (Recipe): The recipe to check.
+            n (int): Number of crafts.
 
         Returns:
             bool: True if crafting is possible, False otherwise.
         """
-        for item, amount in recipe.ingredients.items():
-            if self.inventory.get_item_count(item) < amount:
+        self.update_craftable()
+        if recipe not in self.recipe_indices:
+            counts = self.inventory.count_vector()
+            return bool(np.all(counts[recipe.ingredient_ids] >= recipe.ingredient_amounts * n))
+        return bool(self.max_crafts[self.recipe_indices[recipe]] >= n)
+
+    def craft(self, recipe, n=1):
+        """Attempts to craft an item n times if possible.
+
+        The ingredients are removed and the output added as one transaction: nothing
+        changes if the ingredients are missing or the output does not fit.
+
+        Args:
+            recipe (Recipe): The recipe to craft.
+            n (int): Number of crafts.
+
+        Returns:
+            bool: True if crafting succeeded, False otherwise.
+        """
+        if n <= 0 or not self.can_craft(recipe, n):
+            return False
+
+        ingredients = {item: amount * n for item, amount in recipe.ingredients.items()}
+        output_item, output_amount = recipe.output
+        if not self.inventory.remove_many(ingredients):
+            return False
+        if not self.inventory.add_many({output_item: output_amount * n}):
+            self.inventory.add_many(ingredients)
+            return False
+        return True
+
+    def plan_craft(self, recipe, n=1):
+        """Resolves the intermediate crafts needed to craft a recipe n times.
+
+        Missing ingredients are crafted with the recipe producing them, recursively,
+        against a copy of the inventory count vector.
+
+        Args:
+            recipe (Recipe): The recipe to craft.
+            n (int): Number of crafts.
+
+        Returns:
+            list: (recipe, n) steps in crafting order, or None if the ingredients are missing.
+        """
+        counts = self.inventory.count_vector().copy()
+        steps = []
+        if not self.resolve(recipe, n, counts, steps, set()):
+            return None
+        return steps
+
+    def resolve(self, recipe, n, counts, steps, path):
+        if recipe in path:
+            return False  # Cyclic recipe
+        path.add(recipe)
+
+        for item_id, amount in zip(recipe.ingredient_ids.tolist(), recipe.ingredient_amounts.tolist()):
+            missing = amount * n - counts[item_id]
+            if missing <= 0:
+                continue
+            producer = self.producers.get(item_id)
+            if producer is None:
+                return False
+            crafts = -(-missing // producer.output[1])
+            if not self.resolve(producer, int(crafts), counts, steps, path):
                 return False
+        path.discard(recipe)
+
+        # An intermediate craft may have consumed an ingredient checked before it
+        needed = recipe.ingredient_amounts * n
+        if np.any(counts[recipe.ingredient_ids] < needed):
+            return False
+        counts[recipe.ingredient_ids] -= needed
+        counts[recipe.output_id] += recipe.output[1] * n
+        steps.append((recipe, n))
         return True
 
-    def craft(self, recipe):
-        """Attempts to craft an item if possible.
+    def craft_recursive(self, recipe, n=1):
+        """Crafts a recipe n times, crafting the missing intermediate items first.
+
+        Either every step succeeds or the inventory is restored.
 
         Args:
             recipe (Recipe): The recipe to craft.
+            n (int): Number of crafts.
 
         Returns:
             bool: True if crafting succeeded, False otherwise.
         """
-        if not self.can_craft(recipe):
+        steps = self.plan_craft(recipe, n)
+        if steps is None:
             return False
 
-        for item, amount in recipe.ingredients.items():
-            self.inventory.remove_item(item, amount)
-
-        output_item, output_amount = recipe.output
-        self.inventory.add_item(output_item, output_amount)
+        snapshot = self.inventory.save_slots()
+        for step_recipe, step_n in steps:
+            if not self.craft(step_recipe, step_n):
+                self.inventory.load_slots(snapshot)
+                return False
         return True
     
     def handle_click(self, mouse_pos):
@@ -78,28 +199,46 @@ class CraftingMenu:
         if not self.windows_open:
             return
 
-        for (row_idx, col_idx), recipe_index in self.recipe_cells.items():
-            cell_x = Config.WINDOW_SIZE[0]//2 + col_idx * Config.INVENTORY_CELL_SIZE - len(self.recipes) * Config.INVENTORY_CELL_SIZE // 2
-            cell_y = Config.WINDOW_SIZE[1]//2 + row_idx * Config.INVENTORY_CELL_SIZE - len(self.recipes) * Config.INVENTORY_CELL_SIZE // 2
-
-            cell_rect = pygame.Rect(
-                cell_x, cell_y, Config.INVENTORY_CELL_SIZE, Config.INVENTORY_CELL_SIZE
-            )
-            if cell_rect.collidepoint(mouse_pos) and recipe_index < len(self.recipes):
-                recipe = self.recipes[recipe_index]
-                self.craft(recipe)
-                break
+        # Same layout as render, without depending on a rendered frame so that replays click the same cells
+        cell = self.cell_at(mouse_pos, Config.WINDOW_SIZE[0]//2, Config.WINDOW_SIZE[1]//2)
+        if cell is not None:
+            recipe_index = cell[0] * self.get_grid_size() + cell[1]
+            if recipe_index < len(self.recipes):
+                self.craft_recursive(self.recipes[recipe_index])
 
 
-    def render(self, screen, x, y):
-        """Renders the crafting menu."""
+    def get_grid_size(self):
         grid_size = 1
         while grid_size**2 < len(self.recipes):
             grid_size += 1
+        return grid_size
+
+    def get_rect(self, x, y):
+        """Returns the screen rectangle covered by the menu centered on (x, y)."""
+        size = self.get_grid_size() * Config.INVENTORY_CELL_SIZE
+        return pygame.Rect(x - size // 2, y - size // 2, size, size)
+
+    def cell_at(self, pos, x, y):
+        """Returns the (row, column) of the cell under a screen position, None outside the menu centered on (x, y)."""
+        rect = self.get_rect(x, y)
+        if not rect.collidepoint(pos):
+            return None
+        return ((pos[1] - rect.y) // Config.INVENTORY_CELL_SIZE, (pos[0] - rect.x) // Config.INVENTORY_CELL_SIZE)
+
+    def render_state(self, x, y):
+        """Returns what the drawn menu depends on, it only needs a redraw when this changes."""
+        if not self.windows_open:
+            return None
+        return (self.outdated, self.craftable.tobytes(), self.cell_at(pygame.mouse.get_pos(), x, y))
+
+    def render(self, screen, x, y):
+        """Renders the crafting menu."""
+        grid_size = self.get_grid_size()
+        hovered = self.cell_at(pygame.mouse.get_pos(), x, y)
 
         if self.windows_open:
+            self.update_craftable()
             recipe_index = 0
-            self.recipe_cells.clear()
 
             for row_idx in range(grid_size):
                 for col_idx in range(grid_size):
@@ -112,12 +251,13 @@ class CraftingMenu:
 
                     if recipe_index < len(self.recipes):
                         recipe = self.recipes[recipe_index]
-                        color = recipe.output[0].COLOR
-                        self.recipe_cells[(row_idx, col_idx)] = recipe_index
+                        color = item_registry.get(recipe.output_id).color
+                        if not self.craftable[recipe_index]:
+                            color = tuple(channel // 3 for channel in color)
                     else:
                         color = (100, 100, 100)
 
-                    if cell_rect.collidepoint(pygame.mouse.get_pos()):
+                    if (row_idx, col_idx) == hovered:
                         color = (200, 200, 50)
 
                     pygame.draw.rect(screen, color, cell_rect)
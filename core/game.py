@@ -1,25 +1,109 @@
+import time
+
 import pygame
 from core.config import Config
 from core.scenes import SceneManager
+from core.profiler import profiler
+from core.input import Input, LiveInput
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode(Config.WINDOW_SIZE)
-        pygame.display.set_caption(Config.TITLE)
+    def __init__(self, headless=False, seed=0, game_input=None):
+        """
+        Initializes the game.
+
+        Args:
+            headless (bool): Run the simulation without opening a window, nothing is
+                rendered and no input is read unless `game_input` replays some.
+            seed (int): Seed of the world generation.
+            game_input (Input): Source of the events and held keys, by default the
+                pygame input, or none at all when headless.
+        """
+        self.headless = headless
+        self.seed = seed
+        if game_input is None:
+            game_input = Input() if headless else LiveInput()
+        self.input = game_input
+        if headless:
+            pygame.font.init()
+            self.screen = None
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode(Config.WINDOW_SIZE)
+            pygame.display.set_caption(Config.TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
+        self.tick = 0 # ticks of the simulation, the ones spent loading the world don't count
+        self.alpha = 0 # progress between the last two simulation ticks, used to interpolate rendering
         self.scene_manager = SceneManager(self)
 
-    def run(self):
+    def update(self):
+        """Advances the simulation by one fixed tick."""
+        scene = self.scene_manager.current_scene
+        self.scene_manager.update()
+        # The loading time depends on the world cache, counting it would make max_ticks vary between runs
+        if scene.SIMULATED:
+            self.tick += 1
+        if self.input.finished:
+            self.running = False
+
+    def run(self, max_ticks=None):
+        """
+        Runs the game loop.
+
+        The simulation advances by fixed ticks of 1 / Config.SIMULATION_RATE seconds,
+        consumed from an accumulator of real time, while rendering happens once per
+        frame at up to Config.FPS. A slow frame delays rendering but not the simulation.
+
+        Args:
+            max_ticks (int): Stop after this number of simulation ticks, the world
+                generation not included.
+        """
+        if self.headless:
+            self.run_headless(max_ticks)
+            return
+
+        step = 1 / Config.SIMULATION_RATE
+        accumulator = 0
+        previous = time.perf_counter()
         while self.running:
+            now = time.perf_counter()
+            # Cap the catch up after a stall so the simulation can't spiral behind
+            accumulator += min(now - previous, Config.MAX_FRAME_TIME)
+            previous = now
+
             self.scene_manager.handle_events()
-            self.scene_manager.update()
-            self.scene_manager.render(self.screen)
+            while accumulator >= step and self.running:
+                self.update()
+                accumulator -= step
+                if max_ticks is not None and self.tick >= max_ticks:
+                    self.running = False
+
+            self.alpha = accumulator / step if Config.INTERPOLATE else 1
+            dirty_rects = self.scene_manager.render(self.screen)
             
             #print(f"FPS: {self.clock.get_fps():.2f}")
             
-            pygame.display.flip()
+            with profiler.section("flip"):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
             self.clock.tick(Config.FPS)
+            profiler.record("frame", time.perf_counter() - now)
         
+        self.close()
+
+    def run_headless(self, max_ticks=None):
+        """Runs the simulation as fast as possible, without display nor rendering."""
+        self.alpha = 1
+        while self.running and (max_ticks is None or self.tick < max_ticks):
+            self.scene_manager.handle_events()
+            if self.running:
+                self.update()
+
+        self.close()
+
+    def close(self):
+        self.scene_manager.close()
+        self.input.close()
         pygame.quit()
@@ -0,0 +1,246 @@
+import json
+
+import numpy as np
+import pygame
+
+
+class KeyState:
+    # Keys read as held down each tick, the only ones whose state is recorded
+    HELD_KEYS = (pygame.K_q, pygame.K_d, pygame.K_z, pygame.K_s,
+                 pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+    BITS = {key: 1 << bit for bit, key in enumerate(HELD_KEYS)}
+
+    def __init__(self, mask=0):
+        """
+        Held keys of one tick, indexed like `pygame.key.get_pressed()`.
+
+        Args:
+            mask (int): One bit per key of HELD_KEYS.
+        """
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        """Builds the state from the result of `pygame.key.get_pressed()`."""
+        mask = 0
+        for key, bit in cls.BITS.items():
+            if pressed[key]:
+                mask |= bit
+        return cls(mask)
+
+    def __getitem__(self, key):
+        return bool(self.mask & self.BITS.get(key, 0))
+
+
+class InputRecording:
+    VERSION = 1
+    # Fields of an event: key for the keyboard, button for the mouse, (x, y) for the mouse position or the wheel
+    EVENT_DTYPE = np.dtype([("tick", "<u4"), ("type", "<u4"), ("code", "<i4"), ("x", "<i4"), ("y", "<i4")])
+    KEY_DTYPE = np.dtype([("tick", "<u4"), ("mask", "<u4")])
+    EVENT_TYPES = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                   pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL)
+
+    def __init__(self, params=None, ticks=0, events=None, keys=None):
+        """
+        The input of a play session, tick by tick.
+
+        Events are stored with the tick they were handled before, held keys only when
+        they change, so an idle session costs almost nothing.
+
+        Args:
+            params (dict): `Map.generator_params()` of the world the session was played on.
+            ticks (int): Number of recorded ticks.
+            events (numpy.ndarray): EVENT_DTYPE records, ordered by tick.
+            keys (numpy.ndarray): KEY_DTYPE records of the held keys, from their change tick on.
+        """
+        self.params = params or {}
+        self.ticks = ticks
+        self.events = np.zeros(0, dtype=self.EVENT_DTYPE) if events is None else events
+        self.keys = np.zeros(0, dtype=self.KEY_DTYPE) if keys is None else keys
+
+    @property
+    def seed(self):
+        return self.params.get("seed", 0)
+
+    @classmethod
+    def encode(cls, tick, event):
+        """Returns the EVENT_DTYPE fields of an event, None for the events the game doesn't handle."""
+        if event.type not in cls.EVENT_TYPES:
+            return None
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            return (tick, event.type, event.key, 0, 0)
+        if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            return (tick, event.type, event.button, *event.pos)
+        if event.type == pygame.MOUSEMOTION:
+            return (tick, event.type, 0, *event.pos)
+        if event.type == pygame.MOUSEWHEEL:
+            return (tick, event.type, 0, event.x, event.y)
+        return (tick, event.type, 0, 0, 0)
+
+    @staticmethod
+    def decode(record):
+        """Rebuilds the pygame event of an EVENT_DTYPE record."""
+        event_type, code, x, y = int(record["type"]), int(record["code"]), int(record["x"]), int(record["y"])
+        if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+            return pygame.event.Event(event_type, key=code, mod=0, unicode="")
+        if event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            return pygame.event.Event(event_type, button=code, pos=(x, y))
+        if event_type == pygame.MOUSEMOTION:
+            return pygame.event.Event(event_type, pos=(x, y), rel=(0, 0), buttons=(0, 0, 0))
+        if event_type == pygame.MOUSEWHEEL:
+            return pygame.event.Event(event_type, x=x, y=y)
+        return pygame.event.Event(event_type)
+
+    def save(self, filename):
+        """Writes the recording as a compressed .npz file."""
+        meta = json.dumps({"version": self.VERSION, "params": self.params, "ticks": self.ticks})
+        with open(filename, "wb") as file:
+            np.savez_compressed(file, meta=np.frombuffer(meta.encode(), dtype=np.uint8),
+                                events=self.events, keys=self.keys)
+
+    @classmethod
+    def load(cls, filename):
+        with np.load(filename) as data:
+            meta = json.loads(data["meta"].tobytes().decode())
+            if meta["version"] != cls.VERSION:
+                raise ValueError(f"{filename} is a version {meta['version']} recording, expected {cls.VERSION}")
+            return cls(meta["params"], meta["ticks"], data["events"], data["keys"])
+
+
+class Input:
+    def __init__(self):
+        """
+        Input source of the game, the scenes never read pygame directly.
+
+        The base source has no events and no held keys, it is used by the headless
+        runs. `tick` counts the ticks of the session started by `start`, events
+        polled before a tick belong to it.
+        """
+        self.tick = 0
+        self.started = False
+        self.keys = KeyState()
+        self.mouse_pos = (0, 0)
+
+    @property
+    def finished(self):
+        """True once there is no more input, the game then stops."""
+        return False
+
+    def start(self, game_map):
+        """Starts the session once the world is ready, the input before it isn't part of it."""
+        self.tick = 0
+        self.started = True
+
+    def poll_events(self):
+        return []
+
+    def step(self):
+        """
+        Reads the held keys of the current tick and moves to the next one.
+
+        Returns:
+            KeyState: The held keys.
+        """
+        if self.started:
+            self.tick += 1
+        return self.keys
+
+    def close(self):
+        pass
+
+
+class LiveInput(Input):
+    def __init__(self, record_path=None):
+        """
+        Reads pygame events and keys.
+
+        Args:
+            record_path (str): Records the session to this file on close, None to not record.
+        """
+        super().__init__()
+        self.record_path = record_path
+        self.params = None
+        self.events = []
+        self.key_changes = []
+
+    def start(self, game_map):
+        super().start(game_map)
+        self.params = game_map.generator_params()
+        self.events.clear()
+        self.key_changes.clear()
+
+    def poll_events(self):
+        events = pygame.event.get()
+        self.mouse_pos = pygame.mouse.get_pos()
+        if self.record_path is not None and self.started:
+            for event in events:
+                record = InputRecording.encode(self.tick, event)
+                if record is not None:
+                    self.events.append(record)
+        return events
+
+    def step(self):
+        keys = KeyState.from_pressed(pygame.key.get_pressed())
+        if self.record_path is not None and self.started and keys.mask != self.keys.mask:
+            self.key_changes.append((self.tick, keys.mask))
+        self.keys = keys
+        return super().step()
+
+    def get_recording(self):
+        return InputRecording(self.params, self.tick,
+                              np.array(self.events, dtype=InputRecording.EVENT_DTYPE),
+                              np.array(self.key_changes, dtype=InputRecording.KEY_DTYPE))
+
+    def close(self):
+        if self.record_path is not None and self.started:
+            self.get_recording().save(self.record_path)
+
+
+class ReplayInput(Input):
+    def __init__(self, recording):
+        """
+        Plays a recording back, tick for tick.
+
+        Args:
+            recording (InputRecording): The recorded session.
+        """
+        super().__init__()
+        self.recording = recording
+        self.next_event = 0
+        self.next_key = 0
+
+    @property
+    def finished(self):
+        return self.started and self.tick >= self.recording.ticks
+
+    def start(self, game_map):
+        params = game_map.generator_params()
+        if params != self.recording.params:
+            raise ValueError(f"the recording was played on another world: {self.recording.params}, not {params}")
+        super().start(game_map)
+        self.next_event = 0
+        self.next_key = 0
+
+    def poll_events(self):
+        if pygame.display.get_init():
+            # Keep the window responsive, its own events are ignored
+            pygame.event.pump()
+        if not self.started:
+            return []
+        records = self.recording.events
+        end = self.next_event
+        while end < len(records) and records[end]["tick"] <= self.tick:
+            end += 1
+        events = [InputRecording.decode(record) for record in records[self.next_event:end]]
+        self.next_event = end
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                self.mouse_pos = event.pos
+        return events
+
+    def step(self):
+        changes = self.recording.keys
+        while self.next_key < len(changes) and changes[self.next_key]["tick"] <= self.tick:
+            self.keys = KeyState(int(changes[self.next_key]["mask"]))
+            self.next_key += 1
+        return super().step()
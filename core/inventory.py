@@ -0,0 +1,268 @@
+import heapq
+import numpy as np
+
+from core.items import item_registry
+
+
+class Inventory:
+    def __init__(self, rows, cols):
+        """
+        Slot-based item storage.
+
+        Every slot holds a stack of a single item, limited to the item stack size. Item
+        totals, the slots used by each item and the free slots are maintained on every
+        change, so counts and capacity checks never scan the slots. Totals are also kept
+        in `counts`, a NumPy vector indexed by item ID.
+
+        Args:
+            rows (int): Number of slot rows.
+            cols (int): Number of slot columns.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.capacity = rows * cols  # Number of slots
+        self.slots = [None] * self.capacity  # [item, quantity] or None
+        self.items = {}  # Totals as {item: quantity}
+        self.counts = np.zeros(len(item_registry), dtype=np.int64)  # Totals per item ID
+        self.item_slots = {}  # {item: slot indices}
+        self.free_slots = list(range(self.capacity))  # Heap of the free slots
+        self.total = 0
+        self.listeners = []
+
+    def stack_size(self, item):
+        return item_registry.get(item).stack_size
+
+    def count_vector(self):
+        """Returns the item totals as a vector of len(item_registry) counts indexed by item ID."""
+        if len(self.counts) < len(item_registry):
+            self.counts = np.concatenate((self.counts, np.zeros(len(item_registry) - len(self.counts), dtype=np.int64)))
+        return self.counts
+
+    def add_listener(self, listener):
+        """
+        Registers a callback called once per applied change.
+
+        Args:
+            listener (callable): `listener(inventory, changes)` where `changes` is {item: quantity delta}.
+        """
+        self.listeners.append(listener)
+
+    def notify(self, changes):
+        for listener in self.listeners:
+            listener(self, changes)
+
+    def get_item_count(self, item):
+        """
+        Compte le nombre d'item
+
+        Args:
+            item (str): Nom de l'objet.
+        """
+        return self.items.get(item, 0)
+
+    def space_for(self, item):
+        """Returns how many more `item` fit, in partial stacks and free slots."""
+        stack_size = self.stack_size(item)
+        partial = len(self.item_slots.get(item, ())) * stack_size - self.items.get(item, 0)
+        return partial + len(self.free_slots) * stack_size
+
+    def can_add_many(self, items):
+        """Checks if all the given quantities fit at once."""
+        needed_slots = 0
+        for item, quantity in items.items():
+            stack_size = self.stack_size(item)
+            partial = len(self.item_slots.get(item, ())) * stack_size - self.items.get(item, 0)
+            needed_slots += -(-max(0, quantity - partial) // stack_size)
+        return needed_slots <= len(self.free_slots)
+
+    def can_remove_many(self, items):
+        return all(self.items.get(item, 0) >= quantity for item, quantity in items.items())
+
+    def add_many(self, items):
+        """
+        Adds several items as one transaction: either everything fits or nothing changes.
+
+        Args:
+            items (dict): {item: quantity} to add.
+
+        Returns:
+            bool: True if the items were added.
+        """
+        items = {item: quantity for item, quantity in items.items() if quantity > 0}
+        if not self.can_add_many(items):
+            return False
+        if not items:
+            return True
+
+        for item, quantity in items.items():
+            self.fill_slots(item, quantity)
+        self.notify(items)
+        return True
+
+    def add_partial(self, items):
+        """
+        Adds as many of the given items as fit, for the producers that keep the rest.
+
+        Args:
+            items (dict): {item: quantity} to add.
+
+        Returns:
+            dict: {item: quantity} actually added.
+        """
+        added = {}
+        for item, quantity in items.items():
+            quantity = min(quantity, self.space_for(item))
+            if quantity > 0:
+                self.fill_slots(item, quantity)
+                added[item] = quantity
+        if added:
+            self.notify(added)
+        return added
+
+    def remove_many(self, items):
+        """
+        Removes several items as one transaction: either all are available or nothing changes.
+
+        Args:
+            items (dict): {item: quantity} to remove.
+
+        Returns:
+            bool: True if the items were removed.
+        """
+        items = {item: quantity for item, quantity in items.items() if quantity > 0}
+        if not self.can_remove_many(items):
+            return False
+        if not items:
+            return True
+
+        for item, quantity in items.items():
+            self.empty_slots(item, quantity)
+        self.notify({item: -quantity for item, quantity in items.items()})
+        return True
+
+    def add_item(self, item, quantity=1):
+        """
+        Ajoute un objet à l'inventaire.
+
+        Args:
+            item (str): Nom de l'objet.
+            quantity (int): Quantité à ajouter.
+
+        Returns:
+            bool: True si l'objet a été ajouté.
+        """
+        if not self.add_many({item: quantity}):
+            print("Inventory full!")
+            return False
+        return True
+
+    def remove_item(self, item, quantity=1):
+        """
+        Retire un objet de l'inventaire, au plus la quantité possédée.
+
+        Args:
+            item (str): Nom de l'objet.
+            quantity (int): Quantité à retirer.
+        """
+        self.remove_many({item: min(quantity, self.get_item_count(item))})
+
+    def fill_slots(self, item, quantity):
+        """Tops up the partial stacks of an item, then opens new slots. The space must have been checked."""
+        stack_size = self.stack_size(item)
+        slots = self.item_slots.setdefault(item, [])
+        self.items[item] = self.items.get(item, 0) + quantity
+        self.count_vector()[item.ID] += quantity
+        self.total += quantity
+
+        # Only the last slot of an item can be partial
+        if slots:
+            stack = self.slots[slots[-1]]
+            added = min(quantity, stack_size - stack[1])
+            stack[1] += added
+            quantity -= added
+
+        while quantity > 0:
+            index = heapq.heappop(self.free_slots)
+            added = min(quantity, stack_size)
+            self.slots[index] = [item, added]
+            slots.append(index)
+            quantity -= added
+
+    def empty_slots(self, item, quantity):
+        """Takes from the last stacks of an item first. The quantity must have been checked."""
+        slots = self.item_slots[item]
+        self.items[item] -= quantity
+        self.counts[item.ID] -= quantity
+        self.total -= quantity
+
+        while quantity > 0:
+            stack = self.slots[slots[-1]]
+            removed = min(quantity, stack[1])
+            stack[1] -= removed
+            quantity -= removed
+            if stack[1] == 0:
+                index = slots.pop()
+                self.slots[index] = None
+                heapq.heappush(self.free_slots, index)
+
+        if self.items[item] == 0:
+            del self.items[item]
+            del self.item_slots[item]
+
+    def save_slots(self):
+        """
+        Serializes the slots with item IDs instead of class references.
+
+        Returns:
+            numpy.ndarray: int32 array of shape (capacity, 2) holding [item ID, quantity], -1 for empty slots.
+        """
+        data = np.full((self.capacity, 2), -1, dtype=np.int32)
+        for index, stack in enumerate(self.slots):
+            if stack is not None:
+                data[index] = stack[0].ID, stack[1]
+        return data
+
+    def load_slots(self, data, names=None):
+        """
+        Replaces the content with slots produced by save_slots.
+
+        Args:
+            data (numpy.ndarray): Saved [item ID, quantity] rows.
+            names (list): Item names by saved ID (item_registry.names() at save time), to
+                remap the IDs if the registry changed since. None if the IDs are current.
+        """
+        if names is not None:
+            ids = [item_registry.get_by_name(name).id for name in names]
+        previous = dict(self.items)
+
+        self.slots = [None] * self.capacity
+        self.items = {}
+        self.counts = np.zeros(len(item_registry), dtype=np.int64)
+        self.item_slots = {}
+        self.total = 0
+        for index, (item_id, quantity) in enumerate(data[:self.capacity].tolist()):
+            if item_id < 0 or quantity <= 0:
+                continue
+            item = item_registry.item(ids[item_id] if names is not None else item_id)
+            self.slots[index] = [item, quantity]
+            self.items[item] = self.items.get(item, 0) + quantity
+            self.counts[item.ID] += quantity
+            self.total += quantity
+            self.item_slots.setdefault(item, []).append(index)
+
+        # Merges the stacks of each item into full stacks and one partial stack last, as
+        # fill_slots, empty_slots and the capacity checks expect
+        for item, slots in self.item_slots.items():
+            stack_size = self.stack_size(item)
+            quantity = self.items[item]
+            used = -(-quantity // stack_size)
+            for index in slots[used:]:
+                self.slots[index] = None
+            del slots[used:]
+            for index in slots:
+                self.slots[index][1] = min(quantity, stack_size)
+                quantity -= self.slots[index][1]
+        self.free_slots = [index for index, stack in enumerate(self.slots) if stack is None]
+
+        changes = {item: self.items.get(item, 0) - previous.get(item, 0) for item in set(previous) | set(self.items)}
+        self.notify({item: delta for item, delta in changes.items() if delta})
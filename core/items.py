@@ -0,0 +1,91 @@
+import numpy as np
+from core.config import Config
+
+
+class ItemType:
+    def __init__(self, item_id, item, name, color, stack_size, sprite):
+        """
+        Metadata of a registered item.
+
+        Args:
+            item_id (int): Dense integer ID of the item.
+            item (type): The item class.
+            name (str): Display name.
+            color (tuple): RGB color used when the item has no sprite.
+            stack_size (int): Maximum quantity per inventory slot.
+            sprite (str): Image file in Config.PATH_IMAGES, or None.
+        """
+        self.id = item_id
+        self.item = item
+        self.name = name
+        self.color = color
+        self.stack_size = stack_size
+        self.sprite = sprite
+
+
+class ItemRegistry:
+    DEFAULT_COLOR = (255, 0, 255)
+
+    def __init__(self):
+        """
+        Assigns every item class a dense integer ID, in registration order.
+
+        IDs index the NumPy count vectors of inventories and recipes, and are what save
+        files store instead of class references.
+        """
+        self.types = []
+        self.by_name = {}
+
+    def __len__(self):
+        return len(self.types)
+
+    def register(self, item):
+        """
+        Registers an item class from its NAME, COLOR, STACK_SIZE and SPRITE attributes.
+
+        Usable as a class decorator. The ID is stored on the class as `ID`.
+        """
+        if "ID" in vars(item):
+            return item
+        item_type = ItemType(len(self.types), item,
+                             item.NAME,
+                             getattr(item, "COLOR", self.DEFAULT_COLOR),
+                             getattr(item, "STACK_SIZE", Config.MAX_STACK_SIZE),
+                             getattr(item, "SPRITE", None))
+        self.types.append(item_type)
+        self.by_name[item_type.name] = item_type
+        item.ID = item_type.id
+        return item
+
+    def get(self, item):
+        """Returns the ItemType of an item class or ID."""
+        if isinstance(item, (int, np.integer)):
+            return self.types[item]
+        return self.types[item.ID]
+
+    def get_by_name(self, name):
+        return self.by_name[name]
+
+    def item(self, item_id):
+        """Returns the item class of an ID."""
+        return self.types[item_id].item
+
+    def vector(self, quantities):
+        """
+        Converts {item: quantity} to a count vector indexed by item ID.
+
+        Returns:
+            numpy.ndarray: int64 array of len(registry) counts.
+        """
+        vector = np.zeros(len(self.types), dtype=np.int64)
+        for item, quantity in quantities.items():
+            vector[self.get(item).id] += quantity
+        return vector
+
+    def names(self):
+        """Returns the item names by ID, saved with IDs to remap them if the registry changes."""
+        return [item_type.name for item_type in self.types]
+
+
+item_registry = ItemRegistry()
+register_item = item_registry.register
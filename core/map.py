@@ -1,6 +1,16 @@
-import random
+import json
+import math
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from collections import OrderedDict
 import numpy as np
 from core.config import Config
+from core.spatial import SpatialGrid
+from core.profiler import profiler
+from core.assets import assets
 import pygame
 
 from enum import Enum
@@ -13,74 +23,631 @@ class TerrainType(Enum):
     WATER = 4
 
 class Map:
+    TILE_DTYPE = np.uint8
+    GENERATION_STAGES = ("lakes", "coal", "iron", "grass")
+    BLOCKING_TERRAINS = (TerrainType.WATER.value,)
+    GENERATION_CACHE_SIZE = 4096
+    GENERATOR_VERSION = 1  # Bump when the generation changes, so cached worlds are generated again
+
+    # Map file: header, generator parameters as JSON, chunk index, then the raw tiles of every chunk
+    FILE_MAGIC = b"PYFMAP"
+    FILE_VERSION = 2
+    FILE_HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("chunk_size", "<u4"),
+                            ("seed", "<i8"), ("size", "<i8"), ("chunk_count", "<u8"), ("params_size", "<u8")])
+    FILE_INDEX = np.dtype([("cx", "<i8"), ("cy", "<i8"), ("offset", "<u8")])
+
     def __init__(self, filename=None, seed=0):
-        random.seed(seed)
-        
+        """
+        Initializes a chunked world.
+
+        Chunks are square arrays of Config.CHUNK_SIZE tiles stored in a dict keyed by
+        chunk coordinates. They are generated on first access, so memory grows with
+        the explored area instead of the world size.
+
+        Args:
+            filename (str): Optional saved map to load.
+            seed (int): Seed of the world generation.
+        """
+        self.seed = seed
+        self.size = Config.MAP_SIZE
+        self.chunk_size = Config.CHUNK_SIZE
+        self.chunks = {}
+        self.modified_chunks = set()
+        self.paged_chunks = set()
+        self.page_dir = None
+        self.page_cleanup = None
+        self.generation_cache = {}
+        self.blocked_tables = {}
+        self.tile_listeners = []
+        self.entities = SpatialGrid()
+        self.shared_memory = None
+        self.filename = None
+        self.file_data = None
+        self.file_chunks = {}
+
         if filename:
             self.load_map(filename)
-        else:            
-            self.map = np.zeros((Config.MAP_SIZE, Config.MAP_SIZE))
-            self.generate_lake(num=10, max_size=30)
-            self.generate_feature(TerrainType.COAL.value, num_features=5, feature_size=5)
-            self.generate_feature(TerrainType.IRON.value, num_features=5, feature_size=5)
-            
-            self.map[self.map == TerrainType.EMPTY.value] = TerrainType.GRASS.value
 
-    def generate_lake(self, num, max_size):
+    def __getstate__(self):
+        # The generation cache is rebuilt on demand and the map file is mapped again, don't ship them
+        state = self.__dict__.copy()
+        state["generation_cache"] = {}
+        state["file_data"] = None
+        state["shared_memory"] = None
+        # Copies don't own the page directory
+        state["page_cleanup"] = None
+        state["tile_listeners"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.filename is not None:
+            self.file_data = np.memmap(self.filename, dtype=np.uint8, mode="c")
+
+    def in_bounds(self, x, y):
+        """Returns True if the tile coordinates are inside the world, works on arrays too."""
+        if self.size is None:
+            return np.ones_like(x, dtype=bool) if isinstance(x, np.ndarray) else True
+        return (0 <= x) & (x < self.size) & (0 <= y) & (y < self.size)
+
+    def chunk_in_bounds(self, cx, cy):
+        """Returns True if the chunk overlaps the world."""
+        if self.size is None:
+            return True
+        chunk_count = -(-self.size // self.chunk_size)
+        return 0 <= cx < chunk_count and 0 <= cy < chunk_count
+
+    def chunk_random(self, cx, cy, stage):
         """
-        Generates lakes with random shapes on the map.
+        Returns a random generator seeded from the world seed and the chunk coordinates.
 
         Args:
-            num (int): Number of lakes to generate.
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+            stage (int): Generation stage, so that every stage draws an independent stream.
+
+        Returns:
+            numpy.random.Generator: The generator of the chunk.
+        """
+        mask = 2**64 - 1
+        return np.random.default_rng(np.random.SeedSequence([self.seed & mask, cx & mask, cy & mask, stage]))
+
+    def get_chunk(self, cx, cy):
+        """
+        Returns the chunk at the given chunk coordinates, loading or generating it if needed.
+
+        Args:
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+
+        Returns:
+            numpy.ndarray: The (CHUNK_SIZE, CHUNK_SIZE) tiles of the chunk.
+        """
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if key in self.paged_chunks:
+                chunk = self.page_in(key)
+            elif key in self.file_chunks:
+                chunk = self.read_file_chunk(key)
+            else:
+                chunk = self.generate_chunk(cx, cy)
+            self.chunks[key] = chunk
+        return chunk
+
+    def is_generated(self, cx, cy):
+        """Returns True if the chunk can be read without generating it."""
+        key = (cx, cy)
+        return key in self.chunks or key in self.paged_chunks or key in self.file_chunks
+
+    def get_tile(self, x, y):
+        cx, tx = divmod(x, self.chunk_size)
+        cy, ty = divmod(y, self.chunk_size)
+        return self.get_chunk(cx, cy)[ty][tx]
+
+    def get_tiles(self, xs, ys):
+        """
+        Vectorized get_tile: the tiles are grouped by chunk and read with one fancy index per chunk.
+
+        Args:
+            xs (array-like): Tile x coordinates.
+            ys (array-like): Tile y coordinates.
+
+        Returns:
+            numpy.ndarray: The tile values, EMPTY outside the world.
+        """
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        tiles = np.full(len(xs), TerrainType.EMPTY.value, dtype=self.TILE_DTYPE)
+        inside = np.flatnonzero(self.in_bounds(xs, ys))
+        if len(inside) == 0:
+            return tiles
+
+        cx, tx = np.divmod(xs[inside], self.chunk_size)
+        cy, ty = np.divmod(ys[inside], self.chunk_size)
+        # One sort on a scalar chunk key, each run of equal keys is a chunk
+        rows = cy - cy.min()
+        keys = (cx - cx.min()) * (int(rows.max()) + 1) + rows
+        order = np.argsort(keys, kind="stable")
+        bounds = np.flatnonzero(np.diff(keys[order], prepend=-1, append=-1))
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            members = order[start:end]
+            first = members[0]
+            tiles[inside[members]] = self.get_chunk(int(cx[first]), int(cy[first]))[ty[members], tx[members]]
+        return tiles
+
+    def set_tile(self, x, y, value):
+        cx, tx = divmod(x, self.chunk_size)
+        cy, ty = divmod(y, self.chunk_size)
+        chunk = self.get_chunk(cx, cy)
+        old_value = chunk[ty][tx]
+        chunk[ty][tx] = value
+        self.modified_chunks.add((cx, cy))
+        self.update_blocked_table(x, y, old_value, value)
+        for listener in self.tile_listeners:
+            listener(x, y)
+
+    def add_tile_listener(self, listener):
+        """
+        Registers a callback called on every set_tile.
+
+        Nothing is recorded for the changed tiles otherwise, headless runs don't keep
+        them for a renderer that will never draw them.
+
+        Args:
+            listener (callable): `listener(x, y)` with the coordinates of the changed tile.
+        """
+        self.tile_listeners.append(listener)
+
+    def load_area(self, x, y, width, height):
+        """Makes sure every chunk overlapping the tile rectangle is loaded."""
+        for cy in range(y // self.chunk_size, (y + height - 1) // self.chunk_size + 1):
+            for cx in range(x // self.chunk_size, (x + width - 1) // self.chunk_size + 1):
+                if self.chunk_in_bounds(cx, cy):
+                    self.get_chunk(cx, cy)
+
+    def evict_chunks(self, positions, radius=Config.CHUNK_KEEP_RADIUS):
+        """
+        Unloads the chunks far from every given position.
+
+        Unmodified chunks are dropped and regenerated from the seed or read again from
+        the map file when needed, modified chunks are paged out to disk.
+
+        Args:
+            positions (list of tuple): Tile coordinates to keep chunks around (camera, player...).
+            radius (int): Distance in chunks under which chunks are kept.
+
+        Returns:
+            list of tuple: Coordinates of the evicted chunks.
+        """
+        centers = [(math.floor(x) // self.chunk_size, math.floor(y) // self.chunk_size) for x, y in positions]
+        evicted = []
+        for key in list(self.chunks):
+            if all(max(abs(key[0] - cx), abs(key[1] - cy)) > radius for cx, cy in centers):
+                chunk = self.chunks.pop(key)
+                self.blocked_tables.pop(key, None)
+                if key in self.modified_chunks:
+                    self.page_out(key, chunk)
+                evicted.append(key)
+        return evicted
+
+    def page_path(self, key):
+        return os.path.join(self.page_dir, f"{key[0]}_{key[1]}.npy")
+
+    def page_out(self, key, chunk):
+        if self.page_dir is None:
+            self.page_dir = tempfile.mkdtemp(prefix="pyfactorio_chunks_")
+            # Removed with the map, or at exit at the latest
+            self.page_cleanup = weakref.finalize(self, shutil.rmtree, self.page_dir, True)
+        np.save(self.page_path(key), chunk)
+        self.paged_chunks.add(key)
+
+    def page_in(self, key):
+        path = self.page_path(key)
+        chunk = np.load(path)
+        os.remove(path)
+        self.paged_chunks.discard(key)
+        return chunk
+
+    def clear_pages(self):
+        """Deletes the paged out chunks and their directory, their edits are lost."""
+        if self.page_cleanup is not None:
+            self.page_cleanup()
+        self.page_dir = None
+        self.page_cleanup = None
+        self.paged_chunks = set()
+
+    def generate_chunk(self, cx, cy):
+        """
+        Generates the tiles of a chunk.
+
+        Args:
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+
+        Returns:
+            numpy.ndarray: The generated chunk.
+        """
+        chunk = np.zeros((self.chunk_size, self.chunk_size), dtype=self.TILE_DTYPE)
+        for stage in self.GENERATION_STAGES:
+            self.generate_stage(chunk, cx, cy, stage)
+        return chunk
+
+    def generator_params(self):
+        """Returns everything the generated tiles depend on, cached worlds are keyed by it."""
+        return {"version": self.GENERATOR_VERSION, "seed": self.seed, "size": self.size,
+                "chunk_size": self.chunk_size, "stages": list(self.GENERATION_STAGES),
+                "lake_density": Config.LAKE_DENSITY, "lake_max_size": Config.LAKE_MAX_SIZE,
+                "feature_density": Config.FEATURE_DENSITY, "feature_size": Config.FEATURE_SIZE}
+
+    def generate_stage(self, chunk, cx, cy, stage):
+        """
+        Runs one of the GENERATION_STAGES on a chunk.
+
+        Stages must run in order, each one only depends on the previous stages of the
+        chunk itself.
+        """
+        if stage == "lakes":
+            self.generate_lake(chunk, cx, cy, max_size=Config.LAKE_MAX_SIZE)
+        elif stage == "coal":
+            self.generate_feature(chunk, cx, cy, TerrainType.COAL.value, feature_size=Config.FEATURE_SIZE)
+        elif stage == "iron":
+            self.generate_feature(chunk, cx, cy, TerrainType.IRON.value, feature_size=Config.FEATURE_SIZE)
+        elif stage == "grass":
+            chunk[chunk == TerrainType.EMPTY.value] = TerrainType.GRASS.value
+
+    def generate_area(self, cx, cy, columns, rows, out=None, progress=None):
+        """
+        Generates a block of chunks stage by stage and loads them.
+
+        Args:
+            cx (int): Chunk x coordinate of the top left chunk.
+            cy (int): Chunk y coordinate of the top left chunk.
+            columns (int): Number of chunks horizontally.
+            rows (int): Number of chunks vertically.
+            out (numpy.ndarray): Optional (rows * CHUNK_SIZE, columns * CHUNK_SIZE) array of
+                TILE_DTYPE to generate into, e.g. a shared memory buffer. Loaded chunks are
+                views into it.
+            progress (callable): Optional `progress(stage, done, total)` called after each chunk.
+
+        Returns:
+            numpy.ndarray: The tiles of the area.
+        """
+        if out is None:
+            out = np.zeros((rows * self.chunk_size, columns * self.chunk_size), dtype=self.TILE_DTYPE)
+        out[...] = TerrainType.EMPTY.value
+
+        chunks = self.split_area(out, cx, cy)
+        for stage in self.GENERATION_STAGES:
+            for done, (key, chunk) in enumerate(chunks.items(), 1):
+                self.generate_stage(chunk, *key, stage)
+                if progress is not None:
+                    progress(stage, done, len(chunks))
+
+        self.chunks.update(chunks)
+        return out
+
+    def split_area(self, tiles, cx, cy):
+        """Returns views on the chunks of a block of tiles whose top left chunk is (cx, cy)."""
+        chunks = {}
+        for row in range(tiles.shape[0] // self.chunk_size):
+            for column in range(tiles.shape[1] // self.chunk_size):
+                if self.chunk_in_bounds(cx + column, cy + row):
+                    chunks[(cx + column, cy + row)] = tiles[row * self.chunk_size:(row + 1) * self.chunk_size,
+                                                            column * self.chunk_size:(column + 1) * self.chunk_size]
+        return chunks
+
+    def add_area(self, tiles, cx, cy):
+        """
+        Loads a block of generated tiles without copying it, chunks are views into `tiles`.
+
+        Args:
+            tiles (numpy.ndarray): Tiles of whole chunks, as returned by `generate_area`.
+            cx (int): Chunk x coordinate of the top left chunk.
+            cy (int): Chunk y coordinate of the top left chunk.
+        """
+        self.chunks.update(self.split_area(tiles, cx, cy))
+
+    def chunk_lakes(self, cx, cy, max_size):
+        """
+        Generates the lakes starting in a chunk, in world coordinates.
+
+        Each lake grows by batches: parents are drawn among the cells already in the
+        lake, moved by one random step, clipped to the map and deduplicated with array
+        operations. Lakes may spread over the neighbouring chunks, which paint them too.
+
+        Args:
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
             max_size (int): Maximum size of each lake (number of cells).
+
+        Returns:
+            numpy.ndarray: (n, 2) array of the (x, y) cells of every lake.
+        """
+        key = (TerrainType.WATER.value, cx, cy)
+        if key in self.generation_cache:
+            return self.generation_cache[key]
+
+        rng = self.chunk_random(cx, cy, TerrainType.WATER.value)
+        count = rng.poisson(Config.LAKE_DENSITY * self.chunk_size**2)
+        starts = rng.integers(0, self.chunk_size, (count, 2)) + (cx * self.chunk_size, cy * self.chunk_size)
+        starts = starts[self.in_bounds(starts[:, 0], starts[:, 1])]
+
+        # Cells are encoded relative to the lake start, which they can't be further than max_size from
+        span = 2 * max_size + 1
+        lakes = []
+        for start in starts:
+            cells = np.empty((max_size, 2), dtype=np.int64)
+            cells[0] = start
+            codes = np.array([max_size * span + max_size])
+            size = 1
+            for _ in range(max_size):
+                if size >= max_size:
+                    break
+                parents = cells[rng.integers(0, size, max_size)]
+                candidates = parents + rng.integers(-1, 2, (max_size, 2))
+                candidates = candidates[self.in_bounds(candidates[:, 0], candidates[:, 1])]
+
+                candidate_codes = (candidates[:, 0] - start[0] + max_size) * span + candidates[:, 1] - start[1] + max_size
+                candidate_codes, first = np.unique(candidate_codes, return_index=True)
+                order = np.argsort(first)
+                new = ~np.isin(candidate_codes[order], codes)
+                added = candidates[first[order][new]][:max_size - size]
+
+                cells[size:size + len(added)] = added
+                codes = np.concatenate([codes, candidate_codes[order][new][:len(added)]])
+                size += len(added)
+            lakes.append(cells[:size])
+
+        lakes = np.concatenate(lakes) if lakes else np.empty((0, 2), dtype=np.int64)
+        self.cache_generation(key, lakes)
+        return lakes
+
+    def generate_lake(self, chunk, cx, cy, max_size):
+        """
+        Paints on a chunk the lakes starting in it or in its neighbours.
+
+        Args:
+            chunk (numpy.ndarray): Tiles of the chunk.
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+            max_size (int): Maximum size of each lake (number of cells), lower than CHUNK_SIZE.
         """
-        for _ in range(num):
-            start_x = random.randint(0, self.map.shape[1] - 1)
-            start_y = random.randint(0, self.map.shape[0] - 1)
+        cells = np.concatenate([self.chunk_lakes(nx, ny, max_size)
+                                for ny in (cy - 1, cy, cy + 1)
+                                for nx in (cx - 1, cx, cx + 1)])
+        local_x = cells[:, 0] - cx * self.chunk_size
+        local_y = cells[:, 1] - cy * self.chunk_size
+        inside = (0 <= local_x) & (local_x < self.chunk_size) & (0 <= local_y) & (local_y < self.chunk_size)
+        chunk[local_y[inside], local_x[inside]] = TerrainType.WATER.value
 
-            lake_cells = {(start_x, start_y)}
 
-            while len(lake_cells) < max_size:
-                current_x, current_y = random.choice(list(lake_cells))
+    def chunk_features(self, cx, cy, feature_type, feature_size):
+        """
+        Generates the features starting in a chunk, in world coordinates.
+
+        Every feature is a random walk starting on a tile of the chunk left empty by the
+        lakes. All the walks are drawn at once and may spread over the neighbouring
+        chunks, which paint them too.
+
+        Args:
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+            feature_type (int): The type of feature to place (e.g., TerrainType.ORE.value).
+            feature_size (int): Approximate size of each feature in cells, lower than CHUNK_SIZE.
+
+        Returns:
+            numpy.ndarray: (n, 2) array of the (x, y) cells of every feature.
+        """
+        key = (feature_type, cx, cy)
+        if key in self.generation_cache:
+            return self.generation_cache[key]
 
-                neighbor_x = current_x + random.choice([-1, 0, 1])
-                neighbor_y = current_y + random.choice([-1, 0, 1])
+        rng = self.chunk_random(cx, cy, feature_type)
+        count = rng.poisson(Config.FEATURE_DENSITY * self.chunk_size**2)
 
-                if 0 <= neighbor_x < self.map.shape[1] and 0 <= neighbor_y < self.map.shape[0]:
-                    lake_cells.add((neighbor_x, neighbor_y))
+        lakes = np.zeros((self.chunk_size, self.chunk_size), dtype=self.TILE_DTYPE)
+        self.generate_lake(lakes, cx, cy, max_size=Config.LAKE_MAX_SIZE)
+        ys, xs = np.indices(lakes.shape)
+        free = (lakes == TerrainType.EMPTY.value) & self.in_bounds(xs + cx * self.chunk_size, ys + cy * self.chunk_size)
+        free = np.flatnonzero(free)
 
-            for x, y in lake_cells:
-                self.map[y][x] = TerrainType.WATER.value
+        if count == 0 or free.size == 0:
+            features = np.empty((0, 2), dtype=np.int64)
+        else:
+            start_y, start_x = np.divmod(rng.choice(free, count), self.chunk_size)
+            steps = rng.integers(-1, 2, (count, feature_size, 2))
+            steps[:, 0] = np.stack([start_x + cx * self.chunk_size, start_y + cy * self.chunk_size], axis=1)
+            features = np.cumsum(steps, axis=1).reshape(-1, 2)
+            if self.size is not None:
+                features = np.clip(features, 0, self.size - 1)
 
+        self.cache_generation(key, features)
+        return features
 
-    def generate_feature(self, feature_type, num_features, feature_size):
+    def generate_feature(self, chunk, cx, cy, feature_type, feature_size):
         """
-        Generates features on the map, avoiding lakes or other predefined terrains.
+        Paints on a chunk the features starting in it or in its neighbours, avoiding
+        lakes or other predefined terrains.
 
         Args:
+            chunk (numpy.ndarray): Tiles of the chunk.
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
             feature_type (int): The type of feature to place (e.g., TerrainType.ORE.value).
-            num_features (int): Number of features to generate.
             feature_size (int): Approximate size of each feature in cells.
         """
-        for _ in range(num_features):
-            while True:
-                start_x = random.randint(0, Config.MAP_SIZE - 1)
-                start_y = random.randint(0, Config.MAP_SIZE - 1)
-                if self.map[start_y][start_x] == TerrainType.EMPTY.value:
-                    break
+        cells = np.concatenate([self.chunk_features(nx, ny, feature_type, feature_size)
+                                for ny in (cy - 1, cy, cy + 1)
+                                for nx in (cx - 1, cx, cx + 1)])
+        local_x = cells[:, 0] - cx * self.chunk_size
+        local_y = cells[:, 1] - cy * self.chunk_size
+        inside = (0 <= local_x) & (local_x < self.chunk_size) & (0 <= local_y) & (local_y < self.chunk_size)
+        xs, ys = local_x[inside], local_y[inside]
 
-            for _ in range(feature_size):
-                if self.map[start_y][start_x] == TerrainType.EMPTY.value:
-                    self.map[start_y][start_x] = feature_type
+        empty_cells = chunk[ys, xs] == TerrainType.EMPTY.value
+        chunk[ys[empty_cells], xs[empty_cells]] = feature_type
 
-                start_x = max(0, min(Config.MAP_SIZE - 1, start_x + random.choice([-1, 0, 1])))
-                start_y = max(0, min(Config.MAP_SIZE - 1, start_y + random.choice([-1, 0, 1])))
+    def cache_generation(self, key, cells):
+        """Keeps the cells generated from an origin chunk, neighbouring chunks need them too."""
+        if len(self.generation_cache) >= self.GENERATION_CACHE_SIZE:
+            self.generation_cache.clear()
+        self.generation_cache[key] = cells
+
+    def read_file_chunk(self, key):
+        """Returns a copy-on-write view of a chunk of the map file, only its pages are read."""
+        offset = self.file_chunks[key]
+        tiles = self.file_data[offset:offset + self.chunk_size**2]
+        return tiles.view(self.TILE_DTYPE).reshape(self.chunk_size, self.chunk_size)
 
     def save_map(self, filename):
-        np.save(filename, self.map)
+        """
+        Saves every generated chunk, including the paged out ones and the ones of the loaded map file.
+
+        The file starts with a FILE_HEADER record and the `generator_params` of the map
+        as JSON, followed by one FILE_INDEX record per chunk, then the raw tiles of the
+        chunks in index order, so that `load_map` can memory map it.
+
+        Args:
+            filename (str): Path of the map file.
+        """
+        keys = sorted(set(self.chunks) | self.paged_chunks | set(self.file_chunks))
+        chunk_bytes = self.chunk_size**2 * np.dtype(self.TILE_DTYPE).itemsize
+
+        header = np.zeros(1, dtype=self.FILE_HEADER)
+        header["magic"] = self.FILE_MAGIC
+        header["version"] = self.FILE_VERSION
+        header["chunk_size"] = self.chunk_size
+        header["seed"] = self.seed
+        header["size"] = -1 if self.size is None else self.size
+        header["chunk_count"] = len(keys)
+        params = json.dumps(self.generator_params(), sort_keys=True).encode()
+        header["params_size"] = len(params)
+
+        index = np.zeros(len(keys), dtype=self.FILE_INDEX)
+        index["cx"] = [cx for cx, _ in keys]
+        index["cy"] = [cy for _, cy in keys]
+        index["offset"] = self.FILE_HEADER.itemsize + len(params) + index.nbytes + np.arange(len(keys)) * chunk_bytes
+
+        # Write next to the target and swap, the current map file may still be mapped
+        temporary = filename + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(header.tobytes())
+            file.write(params)
+            file.write(index.tobytes())
+            for key in keys:
+                if key in self.chunks:
+                    chunk = self.chunks[key]
+                elif key in self.paged_chunks:
+                    chunk = np.load(self.page_path(key))
+                else:
+                    chunk = self.read_file_chunk(key)
+                file.write(np.ascontiguousarray(chunk, dtype=self.TILE_DTYPE).tobytes())
+        os.replace(temporary, filename)
 
     def load_map(self, filename):
-        self.map = np.load(filename)
+        """
+        Opens a map file written by `save_map`.
+
+        The file is memory mapped in copy-on-write mode: chunks are read when first
+        accessed and editing them never writes back to the file.
+
+        Chunks missing from the file are generated on demand, so the file is rejected
+        when it was written with other generator parameters, those chunks wouldn't
+        match their saved neighbours.
+
+        Args:
+            filename (str): Path of the map file.
+
+        Raises:
+            ValueError: If the file isn't a map file of FILE_VERSION, or its generator
+                parameters differ from the current ones.
+        """
+        file_data = np.memmap(filename, dtype=np.uint8, mode="c")
+        header = file_data[:self.FILE_HEADER.itemsize].view(self.FILE_HEADER)[0]
+        if header["magic"] != self.FILE_MAGIC or header["version"] != self.FILE_VERSION:
+            raise ValueError(f"{filename} is not a map file")
+
+        params_end = self.FILE_HEADER.itemsize + int(header["params_size"])
+        params = json.loads(file_data[self.FILE_HEADER.itemsize:params_end].tobytes().decode())
+        seed = int(header["seed"])
+        size = None if header["size"] < 0 else int(header["size"])
+        chunk_size = int(header["chunk_size"])
+        current = dict(self.generator_params(), seed=seed, size=size, chunk_size=chunk_size)
+        if params != current:
+            raise ValueError(f"{filename} was generated with other generator parameters: {params}, not {current}")
+
+        index_end = params_end + int(header["chunk_count"]) * self.FILE_INDEX.itemsize
+        index = file_data[params_end:index_end].view(self.FILE_INDEX)
+
+        self.filename = filename
+        self.file_data = file_data
+        self.file_chunks = {(int(cx), int(cy)): int(offset) for cx, cy, offset in index}
+        self.seed = seed
+        self.size = size
+        self.chunk_size = chunk_size
+        self.chunks = {}
+        self.modified_chunks = set()
+        self.clear_pages()
+        self.generation_cache = {}
+        self.blocked_tables = {}
+
+    def get_blocked_table(self, cx, cy):
+        """
+        Returns the summed-area table of the blocked tiles of a chunk, built on first use.
+
+        `table[y, x]` is the number of blocked tiles in the chunk rows `[0, y)` and
+        columns `[0, x)`, so any rectangle count takes four lookups.
+
+        Args:
+            cx (int): Chunk x coordinate.
+            cy (int): Chunk y coordinate.
+
+        Returns:
+            numpy.ndarray: (CHUNK_SIZE + 1, CHUNK_SIZE + 1) int32 array.
+        """
+        table = self.blocked_tables.get((cx, cy))
+        if table is None:
+            blocked = np.isin(self.get_chunk(cx, cy), self.BLOCKING_TERRAINS)
+            table = np.zeros((self.chunk_size + 1, self.chunk_size + 1), dtype=np.int32)
+            table[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+            self.blocked_tables[(cx, cy)] = table
+        return table
+
+    def update_blocked_table(self, x, y, old_value, new_value):
+        """Keeps the summed-area table of a chunk in sync with a tile change."""
+        cx, tx = divmod(x, self.chunk_size)
+        cy, ty = divmod(y, self.chunk_size)
+        table = self.blocked_tables.get((cx, cy))
+        if table is None:
+            return
+        delta = int(new_value in self.BLOCKING_TERRAINS) - int(old_value in self.BLOCKING_TERRAINS)
+        if delta:
+            table[ty + 1:, tx + 1:] += delta
+
+    def blocked_count(self, x0, y0, x1, y1):
+        """
+        Counts the blocked tiles of the tile rectangle [x0, x1) x [y0, y1).
+
+        Args:
+            x0 (int): First tile column.
+            y0 (int): First tile row.
+            x1 (int): Column after the last one.
+            y1 (int): Row after the last one.
+
+        Returns:
+            int: Number of blocked tiles.
+        """
+        count = 0
+        for cy in range(y0 // self.chunk_size, (y1 - 1) // self.chunk_size + 1):
+            for cx in range(x0 // self.chunk_size, (x1 - 1) // self.chunk_size + 1):
+                table = self.get_blocked_table(cx, cy)
+                left = max(x0 - cx * self.chunk_size, 0)
+                right = min(x1 - cx * self.chunk_size, self.chunk_size)
+                top = max(y0 - cy * self.chunk_size, 0)
+                bottom = min(y1 - cy * self.chunk_size, self.chunk_size)
+                count += table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+        return int(count)
 
     def is_walkable(self, x, y, shape):
         """
@@ -94,22 +661,96 @@ class Map:
         Returns:
             bool: True si la zone est entièrement traversable, sinon False.
         """
-
-        map_height, map_width = self.map.shape
         width, height = shape
 
-        for dy in range(height +1):
-            for dx in range(width +1):
-                tile_x = x + dx
-                tile_y = y + dy
+        if not (self.in_bounds(x, y) and self.in_bounds(x + width, y + height)):
+            return False
 
-                if not (0 <= tile_x < map_width and 0 <= tile_y < map_height):
-                    return False
+        return self.blocked_count(math.floor(x), math.floor(y),
+                                  math.floor(x + width) + 1, math.floor(y + height) + 1) == 0
 
-                if self.map[int(tile_y)][int(tile_x)] == TerrainType.WATER.value:
-                    return False
+    def can_place(self, x, y, shape):
+        """
+        Checks if an entity footprint fits on walkable tiles free of other entities.
+
+        Args:
+            x (int): Tile x of the top left corner.
+            y (int): Tile y of the top left corner.
+            shape (tuple): (width, height) of the footprint in tiles.
+
+        Returns:
+            bool: True if the entity can be placed.
+        """
+        width, height = shape
+        if not (self.in_bounds(x, y) and self.in_bounds(x + width - 1, y + height - 1)):
+            return False
+        if self.blocked_count(x, y, x + width, y + height):
+            return False
+        return not self.entities.query_rect(x, y, x + width, y + height)
 
+    def place_entity(self, entity):
+        """
+        Adds an entity to the map index if its footprint is free.
+
+        Returns:
+            bool: True if the entity was placed.
+        """
+        if not self.can_place(entity.x, entity.y, entity.shape):
+            return False
+        self.entities.insert(entity)
         return True
+
+    def remove_entity(self, entity):
+        self.entities.remove(entity)
+
+    def are_walkable(self, xs, ys, shapes):
+        """
+        Vectorized is_walkable: checks many rectangular areas in one call.
+
+        The rectangles are split per chunk and grouped, each group is checked with four
+        vectorized reads in the summed-area table of its chunk.
+
+        Args:
+            xs (array-like): x coordinates of the areas.
+            ys (array-like): y coordinates of the areas.
+            shapes (array-like): (width, height) of every area, or a single one for all.
+
+        Returns:
+            numpy.ndarray: Booleans, True where the area is entirely walkable.
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        shapes = np.broadcast_to(np.asarray(shapes, dtype=float), (len(xs), 2))
+
+        walkable = self.in_bounds(xs, ys) & self.in_bounds(xs + shapes[:, 0], ys + shapes[:, 1])
+        x0 = np.floor(xs).astype(np.int64)
+        y0 = np.floor(ys).astype(np.int64)
+        x1 = np.floor(xs + shapes[:, 0]).astype(np.int64) + 1
+        y1 = np.floor(ys + shapes[:, 1]).astype(np.int64) + 1
+
+        first_cx, first_cy = x0 // self.chunk_size, y0 // self.chunk_size
+        spans_x = (x1 - 1) // self.chunk_size - first_cx + 1
+        spans_y = (y1 - 1) // self.chunk_size - first_cy + 1
+        blocked = np.zeros(len(xs), dtype=np.int64)
+
+        for j in range(int(spans_y[walkable].max(initial=0))):
+            for i in range(int(spans_x[walkable].max(initial=0))):
+                rects = np.flatnonzero(walkable & (i < spans_x) & (j < spans_y))
+                cx = first_cx[rects] + i
+                cy = first_cy[rects] + j
+                left = np.maximum(x0[rects] - cx * self.chunk_size, 0)
+                right = np.minimum(x1[rects] - cx * self.chunk_size, self.chunk_size)
+                top = np.maximum(y0[rects] - cy * self.chunk_size, 0)
+                bottom = np.minimum(y1[rects] - cy * self.chunk_size, self.chunk_size)
+
+                keys, groups = np.unique(np.stack([cx, cy], axis=1), axis=0, return_inverse=True)
+                for group, (key_x, key_y) in enumerate(keys):
+                    member = groups.ravel() == group
+                    table = self.get_blocked_table(int(key_x), int(key_y))
+                    blocked[rects[member]] += (table[bottom[member], right[member]] - table[top[member], right[member]]
+                                               - table[bottom[member], left[member]] + table[top[member], left[member]])
+
+        return walkable & (blocked == 0)
     
             
 class MapRenderer:
@@ -121,69 +762,371 @@ class MapRenderer:
                 }
     
     COLOR_MOUSE = (255, 255, 0)
+    PLACEHOLDER_COLOR = (30, 30, 30)  # Chunks of zoomed out views waiting for their generation
+    TILE_SPRITES = {TerrainType.GRASS: "grass.png",
+                    TerrainType.COAL: "coal.png",
+                    TerrainType.IRON: "iron.png"}
 
     
-    def __init__(self, game_map, camera):
+    def __init__(self, game_map, camera, cache_budget=Config.RENDER_CACHE_BUDGET):
         """
         Initializes the MapRenderer.
 
+        Chunks are pre-rendered on demand into their own surfaces, kept in a least
+        recently used cache bounded by `cache_budget`. Zoomed out views use smaller
+        surfaces per zoom level, reduced from the tile data with NumPy. Zoomed out
+        views span many chunks, those not generated yet are drawn as placeholders and
+        generated a few per frame by `generate_pending`.
+
         Args:
-            game_map (numpy.ndarray): The 2D array representing the map.
-            tile_size (int): Size of each tile in pixels.
-            camera_width (int): Number of tiles the camera displays horizontally.
-            camera_height (int): Number of tiles the camera displays vertically.
+            game_map (Map): The chunked map to render.
+            camera (Camera): The camera giving the visible area.
+            cache_budget (int): Maximum number of bytes of cached chunk surfaces.
         """
         self.game_map = game_map
         self.camera = camera
         self.mouse_pos = (0, 0)
+        self.hovered_entity = None
         
-        self.grass_image = pygame.image.load(Config.PATH_IMAGES + "grass.png").convert_alpha()
-        self.grass_image = pygame.transform.scale(self.grass_image, (Config.TILES_SIZE, Config.TILES_SIZE))
-        
-        self.coal_image = pygame.image.load(Config.PATH_IMAGES + "coal.png").convert_alpha()
-        self.coal_image = pygame.transform.scale(self.coal_image, (Config.TILES_SIZE, Config.TILES_SIZE))
-        
-        self.iron_image = pygame.image.load(Config.PATH_IMAGES + "iron.png").convert_alpha()
-        self.iron_image = pygame.transform.scale(self.iron_image, (Config.TILES_SIZE, Config.TILES_SIZE))
-        
-        self.static_surface = pygame.Surface((game_map.map.shape[1] * Config.TILES_SIZE, game_map.map.shape[0] * Config.TILES_SIZE))
-        self.static_surface.fill((0, 0, 0))
-        self.render_static_map()
+        self.atlas = assets.get_atlas(self.TILE_SPRITES.values(), Config.TILES_SIZE)
+        self.grass_image = self.atlas.sprite(self.TILE_SPRITES[TerrainType.GRASS])
+        self.coal_image = self.atlas.sprite(self.TILE_SPRITES[TerrainType.COAL])
+        self.iron_image = self.atlas.sprite(self.TILE_SPRITES[TerrainType.IRON])
+        self.tile_images = {terrain.value: self.atlas.sprite(name) for terrain, name in self.TILE_SPRITES.items()}
+        self.tile_values = [terrain.value for terrain in TerrainType] + [None]
+        self.tile_surfaces = None
+        self.tile_atlas = None
+        self.level_atlases = {}
+
+        self.chunk_pixels = game_map.chunk_size * Config.TILES_SIZE
+        self.chunk_surfaces = OrderedDict()  # {(cx, cy, zoom level): surface}
+        self.cache_budget = cache_budget
+        self.cache_size = 0
+        self.pending_chunks = {}  # {(cx, cy, zoom level): None}, in request order
+        self.pending_level = 0
+        self.dirty_tiles = set()  # Tiles changed since they were last drawn
+        game_map.add_tile_listener(self.mark_tile)
 
     def set_mouse_pos(self, x, y):
         self.mouse_pos = (x, y)
+        self.hovered_entity = self.game_map.entities.query_point(*self.get_mouse_tile())
 
-    def render_static_map(self):
-        for y in range(self.game_map.map.shape[0]):
-            for x in range(self.game_map.map.shape[1]):
-                tile_value = self.game_map.map[y][x]
-                if TerrainType(tile_value) == TerrainType.GRASS:
-                    self.static_surface.blit(self.grass_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
-                elif TerrainType(tile_value) == TerrainType.COAL:
-                    self.static_surface.blit(self.coal_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
-                elif TerrainType(tile_value) == TerrainType.IRON:
-                    self.static_surface.blit(self.iron_image, (x * Config.TILES_SIZE, y * Config.TILES_SIZE))
+    def get_mouse_tile(self):
+        """Returns the map tile under the mouse."""
+        offset_x, offset_y = self.camera.get_offset()
+        return (math.floor((self.mouse_pos[0] + offset_x) / self.camera.tile_size),
+                math.floor((self.mouse_pos[1] + offset_y) / self.camera.tile_size))
+
+    def render_entities(self, screen):
+        """Renders the placed entities overlapping the camera view."""
+        x0, y0 = math.floor(self.camera.x), math.floor(self.camera.y)
+        visible = self.game_map.entities.query_rect(x0, y0, x0 + self.camera.width + 2, y0 + self.camera.height + 2)
+        for entity in visible:
+            entity.render(self.camera, screen)
+
+    def surface_bytes(self, surface):
+        return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+    def drop_surface(self, key):
+        surface = self.chunk_surfaces.pop(key, None)
+        if surface is not None:
+            self.cache_size -= self.surface_bytes(surface)
+
+    def forget_chunks(self, keys):
+        """
+        Drops the full resolution surfaces of chunks unloaded from the map.
+
+        The downsampled levels are small and stay valid: an unloaded chunk can't change
+        before it is loaded again, so they are left to the LRU eviction.
+        """
+        for cx, cy in keys:
+            self.drop_surface((cx, cy, 0))
+
+    def get_chunk_surface(self, cx, cy, level=0):
+        """Returns the pre-rendered surface of a chunk at a zoom level, rendering it on first use."""
+        key = (cx, cy, level)
+        surface = self.chunk_surfaces.get(key)
+        if surface is None:
+            size = self.chunk_pixels // Config.ZOOM_LEVELS[level]
+            surface = pygame.Surface((size, size))
+            surface.fill((0, 0, 0))
+            with profiler.section("render.map.chunk"):
+                if level == 0:
+                    self.render_static_map(surface, cx, cy)
+                else:
+                    self.render_level(surface, cx, cy, level)
+            self.chunk_surfaces[key] = surface
+            self.cache_size += self.surface_bytes(surface)
+        else:
+            self.chunk_surfaces.move_to_end(key)
+        return surface
+
+    def get_ready_surface(self, cx, cy, level):
+        """
+        Returns the surface of a chunk at a zoom level without generating the chunk.
+
+        Returns:
+            pygame.Surface: The surface, or None if the chunk must be generated first,
+                it is then queued for `generate_pending`.
+        """
+        if level > 0 and (cx, cy, level) not in self.chunk_surfaces and not self.game_map.is_generated(cx, cy):
+            self.pending_chunks[(cx, cy, level)] = None
+            return None
+        return self.get_chunk_surface(cx, cy, level)
+
+    def generate_pending(self, budget=Config.CHUNK_GENERATION_BUDGET):
+        """
+        Generates the chunks queued by `get_ready_surface` for up to `budget` seconds.
+
+        The queue is dropped when the zoom level changes, the new view queues its own
+        chunks.
+
+        Returns:
+            tuple: (list of pygame.Rect, bool) screen rectangles of the generated chunks
+                at the current zoom level, and whether any chunk was generated.
+        """
+        level = self.camera.zoom_level
+        if level != self.pending_level:
+            self.pending_chunks.clear()
+            self.pending_level = level
+        if not self.pending_chunks:
+            return [], False
+
+        offset_x, offset_y = self.camera.get_offset()
+        chunk_pixels = self.chunk_pixels // Config.ZOOM_LEVELS[level]
+        rects = []
+        start = time.perf_counter()
+        with profiler.section("render.map.generate"):
+            while self.pending_chunks and time.perf_counter() - start < budget:
+                key = next(iter(self.pending_chunks))
+                del self.pending_chunks[key]
+                cx, cy, chunk_level = key
+                self.get_chunk_surface(cx, cy, chunk_level)
+                if chunk_level == level:
+                    rects.append(pygame.Rect(cx * chunk_pixels - math.floor(offset_x), cy * chunk_pixels - math.floor(offset_y),
+                                             chunk_pixels, chunk_pixels))
+        return rects, True
+
+    def mark_tile(self, x, y):
+        self.dirty_tiles.add((x, y))
+
+    def pop_dirty_tiles(self):
+        """
+        Returns the tiles changed on the map since the last call, and forgets them.
+
+        Returns:
+            numpy.ndarray: (count, 2) array of tile (x, y).
+        """
+        tiles = np.array(list(self.dirty_tiles), dtype=np.int64).reshape(-1, 2)
+        self.dirty_tiles.clear()
+        return tiles
+
+    def update_tiles(self):
+        """
+        Redraws the tiles changed on the map in the cached chunk surfaces.
+
+        Only the changed tiles are written, grouped per chunk with one NumPy
+        assignment, instead of rendering the whole chunk again. Chunks without a
+        cached surface are skipped, they are rendered up to date when next drawn.
+        The downsampled surfaces of the changed chunks are dropped, rebuilding them
+        costs a reduction over the chunk tiles.
+
+        Returns:
+            list of pygame.Rect: Screen rectangles of the changed tiles, to redraw.
+        """
+        tiles = self.pop_dirty_tiles()
+        if len(tiles) == 0:
+            return []
+
+        size = self.game_map.chunk_size
+        chunk_keys = tiles // size
+        for key in {tuple(key) for key in chunk_keys.tolist()}:
+            for level in range(1, len(Config.ZOOM_LEVELS)):
+                self.drop_surface((*key, level))
+            surface = self.chunk_surfaces.get((*key, 0))
+            if surface is None:
+                continue
+            member = np.all(chunk_keys == key, axis=1)
+            tx = tiles[member, 0] - key[0] * size
+            ty = tiles[member, 1] - key[1] * size
+            if surface.get_bytesize() != 4:
+                self.render_static_map(surface, *key)
+                continue
+            values = self.game_map.get_chunk(*key)[ty, tx]
+            indices = self.get_atlas_indices(values)
+            pixels = pygame.surfarray.pixels2d(surface)
+            # (tile x, pixel x, tile y, pixel y) view, as in render_static_map
+            view = pixels.reshape(size, Config.TILES_SIZE, size, Config.TILES_SIZE)
+            view[tx, :, ty, :] = self.get_tile_atlas(surface)[indices]
+            del view, pixels
+
+        offset_x, offset_y = self.camera.get_offset()
+        tile_size = self.camera.tile_size
+        return [pygame.Rect(math.floor(x * tile_size - offset_x), math.floor(y * tile_size - offset_y),
+                            math.ceil(tile_size) + 1, math.ceil(tile_size) + 1) for x, y in tiles.tolist()]
+
+    def evict_surfaces(self):
+        """Drops the least recently used chunk surfaces until the cache fits in its budget."""
+        while self.cache_size > self.cache_budget and len(self.chunk_surfaces) > 1:
+            _, surface = self.chunk_surfaces.popitem(last=False)
+            self.cache_size -= self.surface_bytes(surface)
+
+    def render_static_map(self, surface, cx, cy):
+        """
+        Renders the tiles of a chunk on its surface.
+
+        Every tile value indexes an atlas of mapped tile pixels, so the whole chunk is
+        written through `pygame.surfarray` with one NumPy gather instead of one blit
+        per tile.
+        """
+        chunk = self.game_map.get_chunk(cx, cy)
+        ys, xs = np.indices(chunk.shape)
+        visible = self.game_map.in_bounds(xs + cx * chunk.shape[1], ys + cy * chunk.shape[0])
+        indices = np.where(visible, self.get_atlas_indices(chunk), self.tile_values.index(TerrainType.EMPTY.value))
+
+        # surfarray indexes pixels as [x, y]: (tile y, tile x, pixel x, pixel y) -> (tile x, pixel x, tile y, pixel y)
+        tiles = self.get_tile_atlas(surface)[indices].transpose(1, 2, 0, 3)
+        if surface.get_bytesize() == 4:
+            pixels = pygame.surfarray.pixels2d(surface)
+            pixels.reshape(tiles.shape)[...] = tiles
+            del pixels
+        else:
+            pygame.surfarray.blit_array(surface, tiles.reshape(surface.get_size()))
+
+    def render_level(self, surface, cx, cy, level):
+        """
+        Renders a chunk downsampled by the factor of a zoom level.
+
+        Factors dividing the tile size gather block means of the tile images, larger
+        factors average the mean colors of blocks of tiles. Either way it is one
+        NumPy reduction over the chunk tiles, never a scale of a rendered surface.
+        """
+        factor = Config.ZOOM_LEVELS[level]
+        chunk = self.game_map.get_chunk(cx, cy)
+        ys, xs = np.indices(chunk.shape)
+        visible = self.game_map.in_bounds(xs + cx * chunk.shape[1], ys + cy * chunk.shape[0])
+        indices = np.where(visible, self.get_atlas_indices(chunk), self.tile_values.index(TerrainType.EMPTY.value))
+        atlas = self.get_level_atlas(level)
+
+        if Config.TILES_SIZE % factor == 0:
+            # (tile y, tile x, pixel x, pixel y, rgb) -> (tile x, pixel x, tile y, pixel y, rgb)
+            pixels = atlas[indices].transpose(1, 2, 0, 3, 4).reshape(surface.get_width(), surface.get_height(), 3)
+        else:
+            tiles = factor // Config.TILES_SIZE
+            colors = atlas[indices.T]
+            side = chunk.shape[0] // tiles
+            pixels = colors.reshape(side, tiles, side, tiles, 3).mean(axis=(1, 3))
+        pygame.surfarray.blit_array(surface, pixels.astype(np.uint8))
+
+    def get_level_atlas(self, level):
+        """
+        Returns the tile images reduced for a zoom level, built once.
+
+        Returns:
+            numpy.ndarray: (tile count, size, size, 3) RGB block means if the factor
+            divides the tile size, (tile count, 3) mean colors otherwise.
+        """
+        if level not in self.level_atlases:
+            factor = Config.ZOOM_LEVELS[level]
+            tiles = np.stack([pygame.surfarray.array3d(tile) for tile in self.get_tile_surfaces()]).astype(np.float32)
+            if Config.TILES_SIZE % factor == 0:
+                size = Config.TILES_SIZE // factor
+                atlas = tiles.reshape(len(tiles), size, factor, size, factor, 3).mean(axis=(2, 4))
+            else:
+                atlas = tiles.mean(axis=(1, 2))
+            self.level_atlases[level] = np.rint(atlas)
+        return self.level_atlases[level]
+
+    def get_atlas_indices(self, chunk):
+        """Maps tile values to their index in the tile atlas."""
+        values = chunk.astype(np.intp)
+        lookup = np.full(max(len(self.tile_values), values.max() + 1), self.tile_values.index(None))
+        for index, tile_value in enumerate(self.tile_values):
+            if tile_value is not None:
+                lookup[tile_value] = index
+        return lookup[values]
+
+    def get_tile_atlas(self, surface):
+        """
+        Returns the atlas of tile pixels mapped to the format of the chunk surfaces, built once.
+
+        Returns:
+            numpy.ndarray: (tile count, TILES_SIZE, TILES_SIZE) array, in the order of
+            `tile_values`. The last tile is the white tile drawn for unknown values.
+        """
+        if self.tile_atlas is None:
+            self.tile_atlas = np.stack([pygame.surfarray.map_array(surface, pygame.surfarray.array3d(tile))
+                                        for tile in self.get_tile_surfaces()])
+        return self.tile_atlas
+
+    def get_tile_surfaces(self):
+        """Returns one full resolution surface per tile value, in the order of `tile_values`."""
+        if self.tile_surfaces is None:
+            self.tile_surfaces = []
+            for tile_value in self.tile_values:
+                tile = pygame.Surface((Config.TILES_SIZE, Config.TILES_SIZE))
+                tile.fill((0, 0, 0))
+                if tile_value is None:
+                    tile.fill((255, 255, 255))
+                elif tile_value in self.tile_images:
+                    tile.blit(self.tile_images[tile_value], (0, 0))
                 else:
-                    color = self.COLOR_MAP.get(TerrainType(tile_value), (255, 255, 255))
-                    pygame.draw.rect(
-                        self.static_surface, color, pygame.Rect(x * Config.TILES_SIZE, y * Config.TILES_SIZE, Config.TILES_SIZE, Config.TILES_SIZE)
-                    )
+                    tile.fill(self.COLOR_MAP[TerrainType(tile_value)])
+                self.tile_surfaces.append(tile)
+        return self.tile_surfaces
 
     def render_mouse(self, screen):
+        if self.hovered_entity is not None:
+            offset_x, offset_y = self.camera.get_offset()
+            tile_size = self.camera.tile_size
+            x0, y0, x1, y1 = self.game_map.entities.footprints[self.hovered_entity]
+            pygame.draw.rect(
+                screen,
+                self.COLOR_MOUSE,
+                pygame.Rect(x0 * tile_size - offset_x, y0 * tile_size - offset_y,
+                            (x1 - x0) * tile_size, (y1 - y0) * tile_size),
+                2)
+            return
+
+        tile_size = self.camera.tile_size
         pygame.draw.rect(
             screen,
             self.COLOR_MOUSE,
-            pygame.Rect(self.mouse_pos[0]//Config.TILES_SIZE * Config.TILES_SIZE,
-                        self.mouse_pos[1]//Config.TILES_SIZE * Config.TILES_SIZE, 
-                        Config.TILES_SIZE, 
-                        Config.TILES_SIZE))
-
-    def render(self, screen):
-        """Renders the visible portion of the map."""
-        view_rect = pygame.Rect(
-            self.camera.x * Config.TILES_SIZE,
-            self.camera.y * Config.TILES_SIZE,
-            self.camera.width * Config.TILES_SIZE,
-            self.camera.height * Config.TILES_SIZE,
-        )
-        screen.blit(self.static_surface, (0, 0), view_rect)
\ No newline at end of file
+            pygame.Rect(self.mouse_pos[0]//tile_size * tile_size,
+                        self.mouse_pos[1]//tile_size * tile_size, 
+                        tile_size, 
+                        tile_size))
+
+    def render(self, screen, area=None):
+        """
+        Renders the visible portion of the map.
+
+        Args:
+            screen (pygame.Surface): Surface to render on.
+            area (pygame.Rect): Part of the screen to redraw, the whole screen if None.
+        """
+        if area is None:
+            area = screen.get_rect()
+        offset_x, offset_y = self.camera.get_offset()
+        origin_x = math.floor(offset_x) + area.x
+        origin_y = math.floor(offset_y) + area.y
+        level = self.camera.zoom_level
+        chunk_pixels = self.chunk_pixels // Config.ZOOM_LEVELS[level]
+
+        screen.fill((0, 0, 0), area)
+        for cy in range(origin_y // chunk_pixels, (origin_y + area.height - 1) // chunk_pixels + 1):
+            for cx in range(origin_x // chunk_pixels, (origin_x + area.width - 1) // chunk_pixels + 1):
+                if not self.game_map.chunk_in_bounds(cx, cy):
+                    continue
+                chunk_x = cx * chunk_pixels - origin_x
+                chunk_y = cy * chunk_pixels - origin_y
+                # Only copy the part of the chunk inside the area
+                source = pygame.Rect(-chunk_x, -chunk_y, area.width, area.height).clip(0, 0, chunk_pixels, chunk_pixels)
+                surface = self.get_ready_surface(cx, cy, level)
+                if surface is None:
+                    screen.fill(self.PLACEHOLDER_COLOR, source.move(area.x + chunk_x, area.y + chunk_y))
+                else:
+                    screen.blit(surface, (area.x + chunk_x + source.x, area.y + chunk_y + source.y), source)
+
+        # Evict after blitting so the chunks of the current view are never dropped mid-frame
+        self.evict_surfaces()
@@ -0,0 +1,109 @@
+import math
+import pygame
+from core.config import Config
+
+
+class Minimap:
+    BORDER_COLOR = (255, 255, 255)
+    VIEW_COLOR = (255, 255, 0)
+    PLAYER_COLOR = (255, 0, 0)
+    MARGIN = 10
+
+    def __init__(self, map_renderer, size=Config.MINIMAP_SIZE):
+        """
+        Overview of the map around the player, in the top right corner of the screen.
+
+        It is drawn from the chunk surfaces of the last zoom level into a cached
+        surface, rebuilt only when it must be re-centered on another chunk or when
+        tiles changed. Every frame only blits the cache and draws the markers.
+
+        Args:
+            map_renderer (MapRenderer): Renderer providing the downsampled chunk surfaces.
+            size (int): Side of the minimap in pixels.
+        """
+        self.map_renderer = map_renderer
+        self.size = size
+        self.level = len(Config.ZOOM_LEVELS) - 1
+        self.tile_size = Config.TILES_SIZE / Config.ZOOM_LEVELS[self.level]
+        self.surface = pygame.Surface((size, size))
+        self.rect = pygame.Rect(Config.WINDOW_SIZE[0] - size - self.MARGIN, self.MARGIN, size, size)
+        self.origin = None  # Tile at the top left corner of the cached surface
+        self.outdated = True
+        self.is_open = True
+
+    def invalidate(self):
+        self.outdated = True
+
+    def get_origin(self, center_x, center_y):
+        """Returns the tile at the top left corner of the surface centered on a tile, aligned on chunks."""
+        chunk_size = self.map_renderer.game_map.chunk_size
+        span = self.size / self.tile_size
+        return (math.floor((center_x - span / 2) / chunk_size) * chunk_size,
+                math.floor((center_y - span / 2) / chunk_size) * chunk_size)
+
+    def update_surface(self, center_x, center_y):
+        """Redraws the cached surface if the center moved to another chunk or tiles changed."""
+        chunk_size = self.map_renderer.game_map.chunk_size
+        span = self.size / self.tile_size
+        origin = self.get_origin(center_x, center_y)
+        if origin == self.origin and not self.outdated:
+            return
+        self.origin = origin
+        self.outdated = False
+
+        self.surface.fill((0, 0, 0))
+        chunk_pixels = round(chunk_size * self.tile_size)
+        first_cx, first_cy = origin[0] // chunk_size, origin[1] // chunk_size
+        count = math.ceil(span / chunk_size) + 1
+        for cy in range(first_cy, first_cy + count):
+            for cx in range(first_cx, first_cx + count):
+                if not self.map_renderer.game_map.chunk_in_bounds(cx, cy):
+                    continue
+                position = ((cx - first_cx) * chunk_pixels, (cy - first_cy) * chunk_pixels)
+                surface = self.map_renderer.get_ready_surface(cx, cy, self.level)
+                if surface is None:
+                    # Drawn again once the renderer generated it
+                    self.surface.fill(self.map_renderer.PLACEHOLDER_COLOR, (*position, chunk_pixels, chunk_pixels))
+                    self.outdated = True
+                else:
+                    self.surface.blit(surface, position)
+
+    def to_screen(self, x, y, origin):
+        return (self.rect.x + (x - origin[0]) * self.tile_size,
+                self.rect.y + (y - origin[1]) * self.tile_size)
+
+    def get_markers(self, player, camera, origin):
+        """Returns the screen rectangles of the camera view and of the player."""
+        view_x, view_y = self.to_screen(camera.render_x, camera.render_y, origin)
+        player_x, player_y = self.to_screen(player.x, player.y, origin)
+        return (pygame.Rect(view_x, view_y, max(2, camera.width * self.tile_size), max(2, camera.height * self.tile_size)),
+                pygame.Rect(player_x - 1, player_y - 1, 3, 3))
+
+    def render_state(self, player, camera):
+        """Returns what the drawn minimap depends on, it only needs a redraw when this changes."""
+        if not self.is_open:
+            return None
+        origin = self.get_origin(player.x, player.y)
+        return (self.outdated, origin) + tuple(tuple(rect) for rect in self.get_markers(player, camera, origin))
+
+    def render(self, screen, player, camera):
+        """
+        Draws the minimap with the camera view and the player.
+
+        Returns:
+            pygame.Rect: The screen rectangle of the minimap, None if it is closed.
+        """
+        if not self.is_open:
+            return None
+        self.update_surface(player.x, player.y)
+        screen.blit(self.surface, self.rect)
+
+        previous_clip = screen.get_clip()
+        screen.set_clip(self.rect.clip(previous_clip))
+        view_rect, player_rect = self.get_markers(player, camera, self.origin)
+        pygame.draw.rect(screen, self.VIEW_COLOR, view_rect, 1)
+        pygame.draw.rect(screen, self.PLAYER_COLOR, player_rect)
+        screen.set_clip(previous_clip)
+
+        pygame.draw.rect(screen, self.BORDER_COLOR, self.rect, 1)
+        return self.rect
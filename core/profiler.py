@@ -0,0 +1,128 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+from core.config import Config
+from core.text import text_cache
+
+
+class Profiler:
+    COLUMNS = ["section", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    OVERLAY_POSITION = (10, 10)
+    OVERLAY_COLUMNS = (220, 70, 70, 70)
+    OVERLAY_COLOR = (255, 255, 0)
+    OVERLAY_BACKGROUND = (0, 0, 0, 180)
+
+    def __init__(self, samples=Config.PROFILER_SAMPLES):
+        """
+        Records the duration of named sections of the frame.
+
+        Each section keeps its last `samples` durations in a ring buffer, from which
+        percentiles are computed on demand.
+
+        Args:
+            samples (int): Number of durations kept per section.
+        """
+        self.samples = samples
+        self.timings = {}  # {section: deque of seconds}
+        self.enabled = True
+        self.show_overlay = False
+
+    @contextmanager
+    def section(self, name):
+        """Times the enclosed block under `name`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        timings = self.timings.get(name)
+        if timings is None:
+            timings = self.timings[name] = deque(maxlen=self.samples)
+        timings.append(seconds)
+
+    def reset(self):
+        self.timings.clear()
+
+    def stats(self):
+        """
+        Summarizes every section.
+
+        Returns:
+            list of dict: One row per section with the COLUMNS keys, durations in milliseconds.
+        """
+        rows = []
+        for name in sorted(self.timings):
+            milliseconds = np.fromiter(self.timings[name], dtype=float) * 1000
+            p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+            rows.append({"section": name,
+                         "count": len(milliseconds),
+                         "mean_ms": float(milliseconds.mean()),
+                         "p50_ms": float(p50),
+                         "p95_ms": float(p95),
+                         "p99_ms": float(p99),
+                         "max_ms": float(milliseconds.max())})
+        return rows
+
+    def dump_csv(self, filename):
+        with open(filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.stats())
+
+    def dump_json(self, filename):
+        with open(filename, "w") as file:
+            json.dump(self.stats(), file, indent=2)
+
+    def dump(self, filename):
+        """Dumps the statistics as JSON or CSV depending on the file extension."""
+        if filename.endswith(".csv"):
+            self.dump_csv(filename)
+        else:
+            self.dump_json(filename)
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+
+    def render(self, screen):
+        """
+        Draws the percentiles of every section on top of the screen, if the overlay is shown.
+
+        Returns:
+            pygame.Rect: The area covered by the overlay, None if it is hidden.
+        """
+        if not self.show_overlay:
+            return None
+        # Timings change every frame, render them directly instead of filling the text cache
+        font = text_cache.get_font(22)
+
+        rows = [("section (ms)", "p50", "p95", "p99")]
+        rows += [(row["section"], f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['p99_ms']:.2f}") for row in self.stats()]
+
+        line_height = font.get_linesize()
+        x, y = self.OVERLAY_POSITION
+        background = pygame.Surface((sum(self.OVERLAY_COLUMNS) + 20, line_height * len(rows) + 10), pygame.SRCALPHA)
+        background.fill(self.OVERLAY_BACKGROUND)
+        overlay_rect = screen.blit(background, (x, y))
+
+        for row_index, row in enumerate(rows):
+            cell_x = x + 10
+            for cell, width in zip(row, self.OVERLAY_COLUMNS):
+                text = font.render(cell, True, self.OVERLAY_COLOR)
+                # Names are left aligned, numbers right aligned
+                offset = 0 if cell_x == x + 10 else width - text.get_width()
+                screen.blit(text, (cell_x + offset, y + 5 + row_index * line_height))
+                cell_x += width
+        return overlay_rect
+
+
+profiler = Profiler()
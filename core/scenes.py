@@ -1,71 +1,183 @@
 import pygame.locals
 from core.map import Map, MapRenderer
+from core.minimap import Minimap
+from core.worldcache import world_cache
 from core.config import Config
 from core.camera import Camera, CameraMode
 from entities.player import Player
-from entities.driller import DrillerItem
+from entities.driller import Driller, DrillerItem, DrillerSystem
+from entities.belt import BeltSystem
 from entities.ore import CoalItem, IronItem
 from core.window import Window, Table
+from core.profiler import profiler
+from core.scheduler import Scheduler
+from core.text import text_cache
 
+import hashlib
+import math
 import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
 
 class SceneManager:
     def __init__(self, game):
         self.game = game
-        self.current_scene = GenerateMapScene(game)
+        self.current_scene = GenerateMapScene(game, game.seed)
         
     def handle_events(self):
-        self.current_scene.handle_events()
+        with profiler.section("events"):
+            self.current_scene.handle_events()
 
     def update(self):
-        self.current_scene.update()
+        with profiler.section("update"):
+            self.current_scene.update()
 
     def render(self, screen):
-        self.current_scene.render(screen)
+        """
+        Renders the current scene and the profiler overlay.
+
+        Returns:
+            list of pygame.Rect: The changed parts of the screen, None if it all changed.
+        """
+        with profiler.section("render"):
+            dirty_rects = self.current_scene.render(screen)
+
+        overlay_rect = profiler.render(screen)
+        if overlay_rect is not None:
+            if dirty_rects is not None:
+                dirty_rects.append(overlay_rect)
+            # The overlay changes every frame, redraw what is under it next frame
+            self.current_scene.invalidate(overlay_rect)
+        return dirty_rects
+
+    def close(self):
+        self.current_scene.close()
 
 
 class GenerateMapScene:
-    def __init__(self, game):
+    SIMULATED = False # its ticks don't count as simulation ticks
+    STAGE_NAMES = {"lakes": "Lakes", "coal": "Coal", "iron": "Iron", "grass": "Grass"}
+
+    def __init__(self, game, seed=0):
+        """
+        Generates the chunks around the spawn in a worker process.
+
+        The worker writes the tiles straight into a shared memory block that the map
+        then uses without copying, and streams its progress through a queue. A world
+        already generated with the same seed and settings is opened from the world
+        cache instead.
+
+        The spawn area is a few chunks generated in milliseconds, the worker generates
+        it serially: starting the processes of `generate_parallel` costs more than the
+        generation, the pool is meant for pre-generating large areas.
+        """
         self.game = game
         self.map = None
         self.is_generating = True
+        self.seed = seed
+        self.progress = None
+
+        # Chunks covering the view at spawn, the others are generated on demand
+        self.area = (0, 0,
+                     -(-Config.WINDOW_SIZE[0] // (Config.TILES_SIZE * Config.CHUNK_SIZE)),
+                     -(-Config.WINDOW_SIZE[1] // (Config.TILES_SIZE * Config.CHUNK_SIZE)))
+
+        self.map = world_cache.load(self.seed, self.area)
+        if self.map is not None:
+            self.is_generating = False
+            return
+
+        self.shape = (self.area[3] * Config.CHUNK_SIZE, self.area[2] * Config.CHUNK_SIZE)
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=self.shape[0] * self.shape[1] * np.dtype(Map.TILE_DTYPE).itemsize)
 
         self.queue = multiprocessing.Queue()
-        self.process = multiprocessing.Process(target=self.generate_map, args=(self.queue,))
+        self.process = multiprocessing.Process(target=self.generate_map,
+                                               args=(self.queue, self.shared_memory.name, self.shape, self.area, self.seed))
         self.process.start()
 
-    def generate_map(self, queue):
-        generated_map = Map()
-        queue.put(generated_map)
+    @staticmethod
+    def generate_map(queue, memory_name, shape, area, seed):
+        memory = shared_memory.SharedMemory(name=memory_name)
+        tiles = np.ndarray(shape, dtype=Map.TILE_DTYPE, buffer=memory.buf)
+
+        def progress(stage, done, total):
+            queue.put(("progress", stage, done, total))
+
+        generated_map = Map(seed=seed)
+        generated_map.generate_area(*area, out=tiles, progress=progress)
+
+        # Views must be released before the block can be closed
+        del generated_map, tiles
+        memory.close()
+        queue.put(("done",))
 
     def handle_events(self):
-        for event in pygame.event.get():
+        for event in self.game.input.poll_events():
             if event.type == pygame.QUIT:
                 self.game.running = False
 
     def update(self):
-        if self.is_generating and not self.queue.empty():
-            self.map = self.queue.get()
-            self.is_generating = False
-            self.game.scene_manager.current_scene = MainScene(self.game, self.map)
+        if not self.is_generating:
+            # Opened from the world cache
+            self.start()
+            return
+        while self.is_generating and not self.queue.empty():
+            message = self.queue.get()
+            if message[0] == "progress":
+                self.progress = message[1:]
+            elif message[0] == "done":
+                self.finish()
+
+    def finish(self):
+        """Wraps the shared tiles in a map and starts the game."""
+        self.process.join()
+        self.map = Map(seed=self.seed)
+        self.map.add_area(np.ndarray(self.shape, dtype=Map.TILE_DTYPE, buffer=self.shared_memory.buf), *self.area[:2])
+        # The map keeps the block mapped, unlinking only removes its name
+        self.map.shared_memory = self.shared_memory
+        self.shared_memory.unlink()
+        world_cache.store(self.map, self.area)
+
+        self.is_generating = False
+        self.start()
+
+    def start(self):
+        self.game.scene_manager.current_scene = MainScene(self.game, self.map)
+
+    def invalidate(self, rect):
+        pass
+
+    def close(self):
+        """Stops the generation if the game quits before it ends."""
+        if self.is_generating:
+            self.process.terminate()
+            self.process.join()
+            self.shared_memory.close()
+            self.shared_memory.unlink()
 
     def render(self, screen):
         screen.fill((0, 0, 0))
         if self.is_generating:
-            font = pygame.font.Font(None, 36)
-            text = font.render("Generating Map...", True, (255, 255, 255))
+            message = "Generating Map..."
+            if self.progress is not None:
+                stage, done, total = self.progress
+                message = f"Generating Map... {self.STAGE_NAMES[stage]} {done}/{total}"
+            text = text_cache.render(message, 36, (255, 255, 255))
             screen.blit(text, (50, 50))
         else:
-            font = pygame.font.Font(None, 36)
-            text = font.render("Map Generated! Transitioning...", True, (0, 255, 0))
+            text = text_cache.render("Map Generated! Transitioning...", 36, (0, 255, 0))
             screen.blit(text, (50, 50))
+        return None
 
 
 class MainScene:
+    SIMULATED = True
+
     def __init__(self, game, generated_map=None):
         self.game = game
         
-        self.camera = Camera(0, 0, Config.TILES_SIZE)
+        self.camera = Camera(0, 0, Config.TILES_SIZE, generated_map.size)
         self.player = Player(5, 5)
         
         #add driller in player inventory
@@ -74,13 +186,24 @@ class MainScene:
         self.player.inventory.add_item(CoalItem, 10)
         
         self.map = generated_map
-        self.map_renderer = MapRenderer(generated_map, self.camera)
-                
-        pygame.mouse.set_visible(True)
-        
+        self.scheduler = Scheduler()
+        self.drillers = DrillerSystem(self.map, self.scheduler)
+        self.belts = BeltSystem(self.map)
+        # Dirty rectangles of the last frame, see render
+        self.full_redraw = True
+        self.last_offset = None
+        self.last_layers = {}
+        self.pending_rects = []
+        self.map_renderer = None
+        self.minimap = None
+        if not game.headless:
+            self.map_renderer = MapRenderer(generated_map, self.camera)
+            self.minimap = Minimap(self.map_renderer)
+            pygame.mouse.set_visible(True)
+        self.game.input.start(self.map)
 
     def handle_events(self):
-        events = pygame.event.get()
+        events = self.game.input.poll_events()
         for event in events:
             if event.type == pygame.QUIT:
                 self.game.running = False
@@ -93,18 +216,192 @@ class MainScene:
                     else:
                         self.camera.set_mode(CameraMode.FREE)
                         print("Free")
-                            
-        self.player.handle_input(events, self.map)
 
-        self.camera.handle_input()
-        self.map_renderer.set_mouse_pos(*pygame.mouse.get_pos())
+                if event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                if event.key == pygame.K_F4:
+                    profiler.dump(Config.PROFILE_DUMP_PATH)
+                    print(f"Profile dumped to {Config.PROFILE_DUMP_PATH}")
+                if event.key == pygame.K_m and self.minimap is not None:
+                    self.minimap.is_open = not self.minimap.is_open
+                    self.invalidate()
 
+            if event.type == pygame.MOUSEWHEEL and event.y:
+                self.camera.zoom(-1 if event.y > 0 else 1)
+                self.invalidate()
+
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+                self.place_driller(*self.camera.get_tile(*event.pos))
+
+            # Handled event by event, so that merging the polls of a tick on replay keeps the order
+            self.player.handle_event(event)
+
+        if self.map_renderer is not None:
+            self.map_renderer.set_mouse_pos(*self.game.input.mouse_pos)
+
+
+    def place_driller(self, x, y):
+        """Places a driller from the player inventory on the map."""
+        if self.player.inventory.get_item_count(DrillerItem) < 1:
+            return
+        driller = Driller(x, y)
+        if self.map.place_entity(driller):
+            self.player.inventory.remove_item(DrillerItem)
+            self.drillers.add(x, y, self.player.inventory, driller)
+            if self.map_renderer is not None:
+                offset_x, offset_y = self.camera.get_offset()
+                tile_size = self.camera.tile_size
+                self.invalidate(pygame.Rect(math.floor(x * tile_size - offset_x), math.floor(y * tile_size - offset_y),
+                                            math.ceil(driller.shape[0] * tile_size) + 1, math.ceil(driller.shape[1] * tile_size) + 1))
 
     def update(self):
+        self.player.save_position()
+        self.camera.save_position()
+        keys = self.game.input.step()
+        with profiler.section("update.player"):
+            self.player.update(self.map, keys)
+        self.camera.handle_input(keys)
         self.camera.update()
 
+        with profiler.section("update.scheduler"):
+            self.scheduler.step()
+        with profiler.section("update.belts"):
+            self.belts.tick()
+
+        with profiler.section("update.chunks"):
+            camera_center = (self.camera.x + self.camera.width / 2, self.camera.y + self.camera.height / 2)
+            # Zoomed out views are drawn from the downsampled surfaces, the chunks behind them needn't stay loaded
+            evicted = self.map.evict_chunks([camera_center, (self.player.x, self.player.y)])
+            if self.map_renderer is not None:
+                self.map_renderer.forget_chunks(evicted)
+
+    def close(self):
+        self.map.clear_pages()
+
+    def state_hash(self):
+        """
+        Hashes the simulation state: player, camera, inventory, edited tiles, drillers and belts.
+
+        Two runs of the same recording must end on the same hash, whatever their timing.
+
+        Returns:
+            str: Hex SHA-256 digest.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.array([self.scheduler.tick, self.camera.zoom_level, self.camera.mode is CameraMode.TRACKING],
+                               dtype=np.int64).tobytes())
+        digest.update(np.array([self.player.x, self.player.y, self.camera.x, self.camera.y], dtype=np.float64).tobytes())
+        digest.update(self.player.inventory.save_slots().tobytes())
+        for key in sorted(self.map.modified_chunks):
+            digest.update(np.array(key, dtype=np.int64).tobytes())
+            digest.update(np.ascontiguousarray(self.map.get_chunk(*key)).tobytes())
+
+        drillers = self.drillers
+        for array in (drillers.xs, drillers.ys, drillers.next_ticks, drillers.buffers):
+            digest.update(array[:drillers.count].tobytes())
+        for tile in sorted(self.belts.tile_lines):
+            line = self.belts.tile_lines[tile]
+            if line.tiles[0] == tile:
+                digest.update(np.array(tile, dtype=np.int64).tobytes())
+                digest.update(line.positions().tobytes())
+                digest.update(line.items[line.head:line.tail].tobytes())
+        return digest.hexdigest()
+
+    def invalidate(self, rect=None):
+        """
+        Marks a part of the screen to redraw on the next frame.
+
+        Args:
+            rect (pygame.Rect): Changed rectangle, None to redraw the whole screen.
+        """
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.pending_rects.append(pygame.Rect(rect))
+
+    def get_layers(self):
+        """
+        Returns what is drawn over the map, for the dirty rectangles.
+
+        Returns:
+            dict: {name: (list of pygame.Rect, state)}, the state changes whenever the
+                drawn layer would.
+        """
+        player_rect = self.player.get_screen_rect(self.camera, self.game.alpha)
+        layers = {"player": ([player_rect], tuple(player_rect))}
+        layers.update(self.player.get_ui_layers())
+        layers["minimap"] = ([], None)
+        if self.minimap.is_open:
+            layers["minimap"] = ([self.minimap.rect.copy()], self.minimap.render_state(self.player, self.camera))
+        return layers
+
+    @staticmethod
+    def merge_rects(rects, bounds):
+        """Clips rectangles to the screen, dropping the empty ones and the ones inside another."""
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height or any(other.contains(rect) for other in merged):
+                continue
+            merged = [other for other in merged if not rect.contains(other)]
+            merged.append(rect)
+        return merged
+
     def render(self, screen):
-        self.map_renderer.render(screen)
-        
-        self.player.render(self.camera, screen)
+        """
+        Renders the scene, redrawing only what changed when the camera didn't move.
+
+        A layer drawn over the map (player, windows, minimap) is redrawn at its
+        previous and current positions only when its state changed, along with the
+        rectangles passed to `invalidate`. The map is drawn under each dirty rectangle,
+        the layers over it once, clipped to their union.
+
+        Returns:
+            list of pygame.Rect: The changed parts of the screen, None if it all changed.
+        """
+        self.camera.interpolate(self.game.alpha)
+        offset = self.camera.get_offset()
+        with profiler.section("render.map.tiles"):
+            changed = self.map_renderer.update_tiles()
+            for rect in changed:
+                self.invalidate(rect)
+            if changed:
+                self.minimap.invalidate()
+            generated, any_generated = self.map_renderer.generate_pending()
+            for rect in generated:
+                self.invalidate(rect)
+            if any_generated and self.minimap.is_open:
+                self.minimap.invalidate()
+                self.invalidate(self.minimap.rect)
+
+        if self.full_redraw or offset != self.last_offset:
+            dirty_rects = None
+            areas = [screen.get_rect()]
+        else:
+            rects = list(self.pending_rects)
+            for name, (layer_rects, state) in self.get_layers().items():
+                last_rects, last_state = self.last_layers.get(name, ([], None))
+                if state != last_state:
+                    rects += last_rects + layer_rects
+            dirty_rects = areas = self.merge_rects(rects, screen.get_rect())
+
+        if areas:
+            for area in areas:
+                screen.set_clip(area)
+                with profiler.section("render.map"):
+                    self.map_renderer.render(screen, area)
+                with profiler.section("render.entities"):
+                    self.map_renderer.render_entities(screen)
+            screen.set_clip(areas[0].unionall(areas[1:]))
+            self.player.render(self.camera, screen, self.game.alpha)
+            with profiler.section("render.minimap"):
+                self.minimap.render(screen, self.player, self.camera)
+            screen.set_clip(None)
+
+        # States once drawn: tables rebuilt, minimap re-centered
+        self.last_layers = self.get_layers()
+        self.last_offset = offset
+        self.pending_rects = []
+        self.full_redraw = False
+        return dirty_rects
         #self.map_renderer.render_mouse(screen)
\ No newline at end of file
@@ -0,0 +1,90 @@
+import heapq
+
+from core.config import Config
+
+
+class TimerEvent:
+    def __init__(self, tick, callback, args):
+        """
+        A callback due at a simulation tick.
+
+        Args:
+            tick (int): Tick the callback runs at.
+            callback (callable): Called as `callback(tick, *args)`.
+            args (tuple): Extra arguments of the callback.
+        """
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self.done = False
+
+
+class Scheduler:
+    def __init__(self, wheel_size=Config.SCHEDULER_WHEEL_SIZE):
+        """
+        Runs callbacks at the tick entities asked to wake up at.
+
+        Events due within `wheel_size` ticks sit in the slot of their tick in a timer
+        wheel, later ones wait in a heap and move to the wheel when they get close. A
+        tick only visits its own slot, so its cost depends on the events due then and
+        not on the number of entities.
+
+        Args:
+            wheel_size (int): Number of ticks covered by the wheel.
+        """
+        self.tick = 0
+        self.wheel_size = wheel_size
+        self.wheel = [[] for _ in range(wheel_size)]
+        self.overflow = []  # Heap of (tick, sequence number, event)
+        self.sequence = 0  # Keeps the heap order stable for events of the same tick
+        self.pending = 0  # Events neither run nor cancelled, cancelled ones stay in their slot until due
+
+    def __len__(self):
+        return self.pending
+
+    def schedule(self, tick, callback, *args):
+        """
+        Schedules a callback, at the next tick at the earliest.
+
+        Returns:
+            TimerEvent: The event, to cancel it.
+        """
+        event = TimerEvent(max(tick, self.tick + 1), callback, args)
+        if event.tick - self.tick < self.wheel_size:
+            self.wheel[event.tick % self.wheel_size].append(event)
+        else:
+            heapq.heappush(self.overflow, (event.tick, self.sequence, event))
+            self.sequence += 1
+        self.pending += 1
+        return event
+
+    def schedule_in(self, delay, callback, *args):
+        """Schedules a callback `delay` ticks from now."""
+        return self.schedule(self.tick + delay, callback, *args)
+
+    def cancel(self, event):
+        if not event.cancelled and not event.done:
+            self.pending -= 1
+        event.cancelled = True
+
+    def step(self):
+        """Advances one tick and runs the events due."""
+        self.tick += 1
+        while self.overflow and self.overflow[0][0] - self.tick < self.wheel_size:
+            _, _, event = heapq.heappop(self.overflow)
+            self.wheel[event.tick % self.wheel_size].append(event)
+
+        index = self.tick % self.wheel_size
+        slot = self.wheel[index]
+        self.wheel[index] = []
+        for event in slot:
+            if not event.cancelled:
+                event.done = True
+                self.pending -= 1
+                event.callback(self.tick, *event.args)
+
+    def advance(self, tick):
+        """Runs every event due up to the given tick."""
+        while self.tick < tick:
+            self.step()
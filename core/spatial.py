@@ -0,0 +1,104 @@
+import math
+
+from core.config import Config
+
+
+class SpatialGrid:
+    def __init__(self, cell_size=Config.SPATIAL_CELL_SIZE):
+        """
+        Uniform grid indexing the tile footprints of entities.
+
+        Every entity is registered in each grid cell its footprint overlaps, so queries
+        only visit the cells of the queried area and cost time proportional to the
+        number of entities found.
+
+        Args:
+            cell_size (int): Side of a grid cell in tiles.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # {(gx, gy): set of entities}
+        self.footprints = {}  # {entity: (x0, y0, x1, y1)}
+
+    def __len__(self):
+        return len(self.footprints)
+
+    def __contains__(self, entity):
+        return entity in self.footprints
+
+    def footprint(self, entity, x=None, y=None):
+        """Returns the tiles [x0, x1) x [y0, y1) covered by an entity."""
+        # Floored rather than truncated, so that -0.5 is in tile -1 and not 0
+        x = math.floor(entity.x if x is None else x)
+        y = math.floor(entity.y if y is None else y)
+        width, height = entity.shape
+        return (x, y, x + width, y + height)
+
+    def cells_of(self, x0, y0, x1, y1):
+        for gy in range(y0 // self.cell_size, (y1 - 1) // self.cell_size + 1):
+            for gx in range(x0 // self.cell_size, (x1 - 1) // self.cell_size + 1):
+                yield (gx, gy)
+
+    def insert(self, entity):
+        """
+        Adds an entity at its current position.
+
+        Args:
+            entity (Entity): Entity with integer `x`, `y` and a `shape` (width, height) in tiles.
+        """
+        footprint = self.footprint(entity)
+        self.footprints[entity] = footprint
+        for cell in self.cells_of(*footprint):
+            self.cells.setdefault(cell, set()).add(entity)
+
+    def remove(self, entity):
+        """Removes an entity from the index."""
+        footprint = self.footprints.pop(entity)
+        for cell in self.cells_of(*footprint):
+            entities = self.cells[cell]
+            entities.discard(entity)
+            if not entities:
+                del self.cells[cell]
+
+    def move(self, entity, x, y):
+        """Moves an indexed entity to a new position."""
+        self.remove(entity)
+        entity.x = x
+        entity.y = y
+        self.insert(entity)
+
+    def query_rect(self, x0, y0, x1, y1):
+        """
+        Finds the entities overlapping the tiles [x0, x1) x [y0, y1).
+
+        Returns:
+            set: The entities found.
+        """
+        found = set()
+        gx0, gy0 = x0 // self.cell_size, y0 // self.cell_size
+        gx1, gy1 = (x1 - 1) // self.cell_size + 1, (y1 - 1) // self.cell_size + 1
+        if (gx1 - gx0) * (gy1 - gy0) > len(self.cells):
+            # Large areas, such as zoomed out views: visit the occupied cells instead
+            cells = [cell for cell in self.cells if gx0 <= cell[0] < gx1 and gy0 <= cell[1] < gy1]
+        else:
+            cells = self.cells_of(x0, y0, x1, y1)
+        for cell in cells:
+            for entity in self.cells.get(cell, ()):
+                ex0, ey0, ex1, ey1 = self.footprints[entity]
+                if ex0 < x1 and x0 < ex1 and ey0 < y1 and y0 < ey1:
+                    found.add(entity)
+        return found
+
+    def query_point(self, x, y):
+        """Returns an entity covering the tile (x, y), or None."""
+        for entity in self.cells.get((x // self.cell_size, y // self.cell_size), ()):
+            ex0, ey0, ex1, ey1 = self.footprints[entity]
+            if ex0 <= x < ex1 and ey0 <= y < ey1:
+                return entity
+        return None
+
+    def query_neighbours(self, entity, radius=1):
+        """Returns the other entities within `radius` tiles of an indexed entity."""
+        x0, y0, x1, y1 = self.footprints[entity]
+        found = self.query_rect(x0 - radius, y0 - radius, x1 + radius, y1 + radius)
+        found.discard(entity)
+        return found
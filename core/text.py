@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+import pygame
+from core.config import Config
+
+
+class TextCache:
+    def __init__(self, max_surfaces=Config.TEXT_CACHE_SIZE):
+        """
+        Shared fonts and rendered text surfaces.
+
+        Fonts are created once per (name, size). Rendered surfaces are kept in a least
+        recently used cache keyed by (font, text, color, antialias), so static labels
+        are rasterized once instead of every frame.
+
+        Args:
+            max_surfaces (int): Maximum number of cached text surfaces.
+        """
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def get_font(self, size, name=None):
+        """
+        Returns the shared font of the given size.
+
+        Args:
+            size (int): Font size.
+            name (str): Font file, None for the default pygame font.
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(name, size)
+        return font
+
+    def render(self, text, size, color, antialias=True, name=None):
+        """
+        Returns the surface of a text, rendering it only if it is not cached.
+
+        Args:
+            text (str): Text to render.
+            size (int): Font size.
+            color (tuple): RGB color of the text.
+            antialias (bool): Smooth the glyphs.
+            name (str): Font file, None for the default pygame font.
+
+        Returns:
+            pygame.Surface: The rendered text, shared: don't draw on it.
+        """
+        key = (name, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.get_font(size, name).render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_surfaces:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
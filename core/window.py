@@ -1,4 +1,5 @@
 import pygame
+from core.text import text_cache
 
 class Window:
     def __init__(self, x, y, width, height, title="Window"):
@@ -29,13 +30,12 @@ class Window:
 
         # Barre de titre
         pygame.draw.rect(screen, (40, 40, 40), self.title_bar_rect)
-        font = pygame.font.Font(None, 36)
-        title_surface = font.render(self.title, True, (255, 255, 255))
+        title_surface = text_cache.render(self.title, 36, (255, 255, 255))
         screen.blit(title_surface, (self.title_bar_rect.x + 10, self.title_bar_rect.y + 5))
 
         # Bouton de fermeture
         pygame.draw.rect(screen, (200, 50, 50), self.close_button_rect)
-        close_text = font.render("X", True, (255, 255, 255))
+        close_text = text_cache.render("X", 36, (255, 255, 255))
         screen.blit(close_text, (self.close_button_rect.x + 7, self.close_button_rect.y + 2))
 
         # Affichage des composants
@@ -50,7 +50,7 @@ class Window:
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.close_button_rect.collidepoint(event.pos):
                 self.is_open = False
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+                self.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
             elif self.title_bar_rect.collidepoint(event.pos):
                 self.dragging = True
                 self.drag_offset = (event.pos[0] - self.rect.x, event.pos[1] - self.rect.y)
@@ -122,21 +122,26 @@ class Window:
         self.title_bar_rect.topleft = self.rect.topleft
         self.close_button_rect.topleft = (self.rect.right - 30, self.rect.top)
 
+    def set_cursor(self, cursor):
+        # Les parties rejouées sans fenêtre n'ont pas de curseur
+        if pygame.display.get_init():
+            pygame.mouse.set_cursor(cursor)
+
     def update_cursor(self, pos):
         if self.title_bar_rect.collidepoint(pos):
-            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
+            self.set_cursor(pygame.SYSTEM_CURSOR_HAND)
         elif self.is_on_border(pos):
             resize_dir = self.get_resize_dir(pos)
             if ("top" in resize_dir and "left" in resize_dir) or ("bottom" in resize_dir and "right" in resize_dir) and self.is_resizable:
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZENWSE)
+                self.set_cursor(pygame.SYSTEM_CURSOR_SIZENWSE)
             elif ("top" in resize_dir and "right" in resize_dir) or ("bottom" in resize_dir and "left" in resize_dir) and self.is_resizable:
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZENESW)
+                self.set_cursor(pygame.SYSTEM_CURSOR_SIZENESW)
             elif "right" in resize_dir or "left" in resize_dir and self.is_resizable:
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZEWE)
+                self.set_cursor(pygame.SYSTEM_CURSOR_SIZEWE)
             elif "top" in resize_dir or "bottom" in resize_dir and self.is_resizable:
-                pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_SIZENS)
+                self.set_cursor(pygame.SYSTEM_CURSOR_SIZENS)
         else:
-            pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+            self.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
 
 import pygame
 
@@ -145,6 +150,9 @@ class Table:
         """
         Crée un tableau interactif.
 
+        Seules les lignes visibles sont dessinées, dans une surface mise en cache qui
+        n'est redessinée que lorsque les données ou le défilement changent.
+
         Args:
             x (int): Position X du tableau relative à la fenêtre.
             y (int): Position Y du tableau relative à la fenêtre.
@@ -155,53 +163,78 @@ class Table:
             header (list of str): Titres des colonnes (facultatif).
         """
         self.relative_rect = pygame.Rect(x, y, width, height)
-        self.data = data
         self.column_widths = column_widths
+        self.column_offsets = [sum(column_widths[:col_index]) for col_index in range(len(column_widths))]
         self.header = header
         self.cell_height = 30  # Hauteur de chaque cellule
         self.scroll_offset = 0  # Décalage pour le défilement vertical
-        self.font = pygame.font.Font(None, 24)
+        self.font_size = 24
         self.scroll_speed = 10  # Vitesse de défilement
+        self.surface = pygame.Surface((width, height))
+        self.data = data
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """Remplace les données et marque le tableau à redessiner."""
+        self._data = data
+        self.dirty = True
+
+    def mark_dirty(self):
+        """Force le rendu du tableau au prochain affichage, après une modification de `data` en place."""
+        self.dirty = True
 
     def render(self, screen, window_rect):
         """Affiche le tableau."""
         # Calcul des coordonnées absolues en fonction de la fenêtre
         self.rect = self.relative_rect.move(window_rect.topleft)
 
+        if self.dirty:
+            self.render_body()
+            self.dirty = False
+        screen.blit(self.surface, self.rect)
+
+    def render_body(self):
+        """Dessine les lignes visibles dans la surface du tableau."""
         # Bordure et fond
-        pygame.draw.rect(screen, (200, 200, 200), self.rect)
-        pygame.draw.rect(screen, (0, 0, 0), self.rect, 2)
+        self.surface.fill((200, 200, 200))
 
         # Coordonnée Y pour commencer à dessiner
-        y_offset = self.rect.y - self.scroll_offset
+        y_offset = -self.scroll_offset
 
         # Affiche l'en-tête (s'il existe)
         if self.header:
             for col_index, col_name in enumerate(self.header):
-                x_offset = self.rect.x + sum(self.column_widths[:col_index])
-                column_rect = pygame.Rect(x_offset, y_offset, self.column_widths[col_index], self.cell_height)
-                pygame.draw.rect(screen, (150, 150, 150), column_rect)
-                pygame.draw.rect(screen, (0, 0, 0), column_rect, 1)
-                text_surface = self.font.render(col_name, True, (0, 0, 0))
-                screen.blit(text_surface, text_surface.get_rect(center=column_rect.center))
+                self.render_cell(col_index, y_offset, col_name, (150, 150, 150))
             y_offset += self.cell_height
 
-        # Affiche les lignes de données
-        for row in self.data:
-            for col_index, cell_value in enumerate(row):
-                x_offset = self.rect.x + sum(self.column_widths[:col_index])
-                column_rect = pygame.Rect(x_offset, y_offset, self.column_widths[col_index], self.cell_height)
-                pygame.draw.rect(screen, (255, 255, 255), column_rect)
-                pygame.draw.rect(screen, (0, 0, 0), column_rect, 1)
-                text_surface = self.font.render(str(cell_value), True, (0, 0, 0))
-                screen.blit(text_surface, text_surface.get_rect(center=column_rect.center))
-            y_offset += self.cell_height
+        # Affiche uniquement les lignes de données visibles
+        first_row = max(0, -y_offset // self.cell_height)
+        last_row = min(len(self.data), (self.relative_rect.height - y_offset) // self.cell_height + 1)
+        for row_index in range(first_row, last_row):
+            for col_index, cell_value in enumerate(self.data[row_index]):
+                self.render_cell(col_index, y_offset + row_index * self.cell_height, str(cell_value), (255, 255, 255))
+
+        pygame.draw.rect(self.surface, (0, 0, 0), self.surface.get_rect(), 2)
+
+    def render_cell(self, col_index, y, text, color):
+        column_rect = pygame.Rect(self.column_offsets[col_index], y, self.column_widths[col_index], self.cell_height)
+        pygame.draw.rect(self.surface, color, column_rect)
+        pygame.draw.rect(self.surface, (0, 0, 0), column_rect, 1)
+        text_surface = text_cache.render(text, self.font_size, (0, 0, 0))
+        self.surface.blit(text_surface, text_surface.get_rect(center=column_rect.center))
 
     def handle_event(self, event):
         """Gère les interactions avec le tableau."""
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 4:  # Scroll up
                 self.scroll_offset = max(0, self.scroll_offset - self.scroll_speed)
+                self.dirty = True
             elif event.button == 5:  # Scroll down
-                max_scroll = max(0, len(self.data) * self.cell_height - self.relative_rect.height)
+                header_height = self.cell_height if self.header else 0
+                max_scroll = max(0, len(self.data) * self.cell_height + header_height - self.relative_rect.height)
                 self.scroll_offset = min(max_scroll, self.scroll_offset + self.scroll_speed)
+                self.dirty = True
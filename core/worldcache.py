@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+
+from core.config import Config
+from core.map import Map
+
+
+class WorldCache:
+    def __init__(self, cache_dir=Config.WORLD_CACHE_DIR):
+        """
+        Generated worlds saved as map files, so a known seed opens without generating.
+
+        A world is stored under a hash of `Map.generator_params` and of the generated
+        area: changing the seed, the map size, a generation setting or bumping
+        Map.GENERATOR_VERSION gives another file, stale ones are never read.
+
+        Args:
+            cache_dir (str): Folder of the cached map files, None to disable the cache.
+        """
+        self.cache_dir = cache_dir
+
+    def path(self, seed, area):
+        """
+        Returns the file of the world generated with a seed, None if the cache is disabled.
+
+        Args:
+            seed (int): Seed of the world generation.
+            area (tuple): (cx, cy, columns, rows) chunks generated up front.
+        """
+        if self.cache_dir is None:
+            return None
+        params = Map(seed=seed).generator_params()
+        params["area"] = list(area)
+        params["file_version"] = Map.FILE_VERSION
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode())
+        return os.path.join(self.cache_dir, digest.hexdigest() + ".map")
+
+    def load(self, seed, area):
+        """Opens a cached world, None on a miss or if the file is unreadable."""
+        path = self.path(seed, area)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            return Map(filename=path)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, game_map, area):
+        """Saves a freshly generated world, a failed write only costs the next launch a generation."""
+        path = self.path(game_map.seed, area)
+        if path is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            game_map.save_map(path)
+        except OSError:
+            if os.path.exists(path + ".tmp"):
+                os.remove(path + ".tmp")
+
+
+world_cache = WorldCache()
@@ -0,0 +1,481 @@
+from enum import Enum
+import numpy as np
+import pygame
+from core.config import Config
+from core.items import item_registry
+from core.assets import assets
+from entities.entity import Entity
+
+
+class Direction(Enum):
+    RIGHT = (1, 0)
+    DOWN = (0, 1)
+    LEFT = (-1, 0)
+    UP = (0, -1)
+
+
+class Belt(Entity):
+    COLOR = (90, 90, 60)
+
+    def __init__(self, x, y, direction):
+        """Footprint of a belt tile on the map, so that other entities can't be placed over it."""
+        super().__init__(x, y)
+        self.direction = direction
+        self.image = assets.get_solid(self.COLOR, (Config.TILES_SIZE, Config.TILES_SIZE), (0, 0, 0), 1)
+
+    def render(self, camera, screen):
+        offset_x, offset_y = camera.get_offset()
+        position = (self.x * camera.tile_size - offset_x, self.y * camera.tile_size - offset_y)
+        if camera.zoom_level == 0:
+            screen.blit(self.image, position)
+        else:
+            screen.fill(self.COLOR, pygame.Rect(position, (max(1, camera.tile_size), max(1, camera.tile_size))))
+
+
+class TransportLine:
+    def __init__(self, tiles, system=None):
+        """
+        A chain of belt tiles moving items as one queue.
+
+        Items are stored from the end of the line to its start as item IDs and gaps:
+        the gap of an item is the free distance in front of it, up to the item ahead or
+        to the end of the line for the first one. Items behind a gap move with it, so a
+        tick only shrinks the gap of the first moving item (`active`) instead of moving
+        every item. Items before it are compressed against the end of the line.
+
+        Args:
+            tiles (list): (x, y) of the belt tiles, from the start of the line to its end.
+            system (BeltSystem): System waking the line when items are inserted.
+        """
+        self.system = system
+        self.tiles = list(tiles)
+        self.tile_indices = {tile: index for index, tile in enumerate(self.tiles)}
+        self.tile_length = Config.BELT_TILE_LENGTH
+        self.spacing = Config.BELT_ITEM_SPACING
+        self.speed = Config.BELT_SPEED
+        self.length = len(self.tiles) * self.tile_length
+
+        # Items live in [head, tail), storage is compacted when tail reaches the end
+        capacity = 2 * (self.length // self.spacing) + 1
+        self.items = np.zeros(capacity, dtype=np.int64)
+        self.gaps = np.zeros(capacity, dtype=np.int64)
+        self.head = 0
+        self.tail = 0
+        self.active = 0  # First moving item, tail if the line is compressed
+        self.used = 0  # Distance from the end of the line to the back of the last item
+
+        self.output_tile = None  # Belt tile receiving the items at the end of the line
+        self.output = None  # Or an inventory, anything with add_many
+        self.listeners = []  # (port, listener) of the ports on the line, see BeltPort.add_listener
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def wake(self):
+        if self.system is not None:
+            self.system.active_lines.add(self)
+
+    def notify(self):
+        """Tells the ports on the line that items moved away, spots may have freed."""
+        for port, listener in self.listeners:
+            listener(port, {})
+
+    def positions(self):
+        """Returns the distance from the end of the line to the front of every item."""
+        count = self.tail - self.head
+        return np.cumsum(self.gaps[self.head:self.tail]) + self.spacing * np.arange(count)
+
+    def tile_position(self, tile):
+        """Returns the position of an item centered on one of the line tiles."""
+        from_end = len(self.tiles) - 1 - self.tile_indices[tile]
+        return from_end * self.tile_length + (self.tile_length - self.spacing) // 2
+
+    def reserve(self, count):
+        """Makes room for `count` more items after tail."""
+        if self.tail + count <= len(self.items):
+            return
+        size = self.tail - self.head
+        capacity = max(len(self.items), 2 * (size + count))
+        items = np.zeros(capacity, dtype=np.int64)
+        gaps = np.zeros(capacity, dtype=np.int64)
+        items[:size] = self.items[self.head:self.tail]
+        gaps[:size] = self.gaps[self.head:self.tail]
+        self.items, self.gaps = items, gaps
+        self.active -= self.head
+        self.head, self.tail = 0, size
+
+    def update_active(self):
+        moving = np.flatnonzero(self.gaps[self.head:self.tail])
+        self.active = self.head + int(moving[0]) if len(moving) else self.tail
+
+    def append(self, item_id, gap):
+        self.reserve(1)
+        self.items[self.tail] = item_id
+        self.gaps[self.tail] = gap
+        if self.active == self.tail and gap == 0:
+            self.active += 1
+        self.tail += 1
+        self.used += gap + self.spacing
+
+    def add_many(self, items):
+        """
+        Inserts items at the start of the line, as one transaction.
+
+        Args:
+            items (dict): {item: quantity} to insert.
+
+        Returns:
+            bool: True if every item fit.
+        """
+        total = sum(items.values())
+        if total == 0:
+            return True
+        if self.used + total * self.spacing > self.length:
+            return False
+        gap = self.length - self.used - total * self.spacing
+        for item, quantity in items.items():
+            item_id = item_registry.get(item).id
+            for _ in range(quantity):
+                self.append(item_id, gap)
+                gap = 0
+        self.wake()
+        return True
+
+    def free_positions(self, positions, candidates):
+        """Returns the candidate positions where an item fits between the items at `positions`."""
+        candidates = np.asarray(candidates)
+        inside = (0 <= candidates) & (candidates <= self.length - self.spacing)
+        if len(positions) == 0:
+            return candidates[inside]
+        index = np.searchsorted(positions, candidates)
+        ahead_free = (index == 0) | (positions[np.maximum(index - 1, 0)] + self.spacing <= candidates)
+        behind_free = (index == len(positions)) | (candidates + self.spacing <= positions[np.minimum(index, len(positions) - 1)])
+        return candidates[ahead_free & behind_free & inside]
+
+    def insert(self, item_id, position):
+        """
+        Inserts an item at a distance from the end of the line, if there is room there.
+
+        Returns:
+            bool: True if the item was inserted.
+        """
+        positions = self.positions()
+        if len(self.free_positions(positions, [position])) == 0:
+            return False
+        index = int(np.searchsorted(positions, position))
+        previous_end = positions[index - 1] + self.spacing if index > 0 else 0
+
+        self.reserve(1)
+        at = self.head + index
+        self.items[at + 1:self.tail + 1] = self.items[at:self.tail].copy()
+        self.gaps[at + 1:self.tail + 1] = self.gaps[at:self.tail].copy()
+        self.items[at] = item_id
+        self.gaps[at] = position - previous_end
+        if index < len(positions):
+            self.gaps[at + 1] = positions[index] - position - self.spacing
+        else:
+            self.used = position + self.spacing
+        self.tail += 1
+        self.update_active()
+        self.wake()
+        return True
+
+    def remove(self, index):
+        """Removes the item at an index from the front, the items behind keep their positions."""
+        at = self.head + index
+        item_id = int(self.items[at])
+        if at + 1 < self.tail:
+            self.gaps[at + 1] += self.gaps[at] + self.spacing
+        self.items[at:self.tail - 1] = self.items[at + 1:self.tail].copy()
+        self.gaps[at:self.tail - 1] = self.gaps[at + 1:self.tail].copy()
+        self.tail -= 1
+        positions = self.positions()
+        self.used = int(positions[-1]) + self.spacing if len(positions) else 0
+        self.update_active()
+        self.wake()
+        self.notify()
+        return item_id
+
+    def pop_front(self):
+        """Removes the first item, the O(1) path of remove(0)."""
+        item_id = int(self.items[self.head])
+        self.head += 1
+        if self.head < self.tail:
+            self.gaps[self.head] += self.spacing
+            self.active = self.head
+        else:
+            self.head = self.tail = self.active = 0
+            self.used = 0
+        return item_id
+
+    def deliver(self):
+        """Hands the first item to the output once it reached the end of the line."""
+        if self.head == self.tail or self.gaps[self.head] > 0:
+            return False
+        item_id = int(self.items[self.head])
+        if self.output_tile is not None:
+            target = self.system.tile_lines[self.output_tile]
+            delivered = target.insert(item_id, target.tile_position(self.output_tile))
+        elif self.output is not None:
+            delivered = self.output.add_many({item_registry.item(item_id): 1})
+        else:
+            return False
+        if delivered:
+            self.pop_front()
+        return delivered
+
+    def tick(self):
+        """
+        Moves the line by one tick.
+
+        Returns:
+            bool: False once the line can't change until something is inserted.
+        """
+        gaps = self.gaps
+        if self.head < self.tail and gaps[self.head] == 0:
+            self.deliver()
+
+        active = self.active
+        if active < self.tail and gaps[active] > self.speed:
+            # Uncongested: the whole line behind the active item moves with one decrement
+            gaps[active] -= self.speed
+            self.used -= self.speed
+        else:
+            move = self.speed
+            while move > 0 and active < self.tail:
+                moved = min(move, int(gaps[active]))
+                gaps[active] -= moved
+                self.used -= moved
+                move -= moved
+                if gaps[active] == 0:
+                    active += 1
+            self.active = active
+        waiting = self.head < self.tail and (self.output_tile is not None or self.output is not None)
+        return self.active < self.tail or waiting
+
+
+class BeltPort:
+    def __init__(self, system, x, y):
+        """
+        Insert and extract hook on one belt tile.
+
+        Drillers and inventories use it like an inventory: add_many and add_partial put
+        items on the tile, take removes one. It follows the tile when lines are joined.
+
+        Args:
+            system (BeltSystem): The belts.
+            x (int): Tile x coordinate of the belt.
+            y (int): Tile y coordinate of the belt.
+        """
+        self.system = system
+        self.tile = (x, y)
+
+    def add_listener(self, listener):
+        """
+        Registers a callback called when items leave the line, as for an inventory.
+
+        Args:
+            listener (callable): `listener(port, changes)`, `changes` is empty: the items
+                moved along the line rather than changed, free spots may have opened on
+                the tile.
+        """
+        self.system.tile_lines[self.tile].listeners.append((self, listener))
+
+    def free_spots(self):
+        """Returns the line of the tile and the free item positions on the tile."""
+        line = self.system.tile_lines[self.tile]
+        start = line.tile_position(self.tile) - (line.tile_length - line.spacing) // 2
+        candidates = start + line.spacing * np.arange(line.tile_length // line.spacing)
+        return line, line.free_positions(line.positions(), candidates).tolist()
+
+    def add_many(self, items):
+        """Puts items on the free spots of the tile, as one transaction."""
+        line, free = self.free_spots()
+        if len(free) < sum(items.values()):
+            return False
+        self.insert(line, free, items)
+        return True
+
+    def add_partial(self, items):
+        """
+        Puts as many items as there are free spots on the tile, in the order of `items`.
+
+        Returns:
+            dict: {item: quantity} actually put on the belt.
+        """
+        line, free = self.free_spots()
+        added = {}
+        for item, quantity in items.items():
+            quantity = min(quantity, len(free) - sum(added.values()))
+            if quantity > 0:
+                added[item] = quantity
+        self.insert(line, free, added)
+        return added
+
+    def insert(self, line, free, items):
+        free = iter(free)
+        for item, quantity in items.items():
+            item_id = item_registry.get(item).id
+            for _ in range(quantity):
+                line.insert(item_id, next(free))
+
+    def take(self, item=None):
+        """
+        Removes an item on the tile, the closest to the end of the line.
+
+        Args:
+            item (type): Only take this item, any item if None.
+
+        Returns:
+            type: The item class taken, or None.
+        """
+        line = self.system.tile_lines[self.tile]
+        start = line.tile_position(self.tile) - (line.tile_length - line.spacing) // 2
+        positions = line.positions()
+        on_tile = (positions + line.spacing > start) & (positions < start + line.tile_length)
+        if item is not None:
+            on_tile &= line.items[line.head:line.tail] == item_registry.get(item).id
+        found = np.flatnonzero(on_tile)
+        if len(found) == 0:
+            return None
+        return item_registry.item(line.remove(int(found[0])))
+
+    def feed_from(self, inventory, item):
+        """Moves one item from an inventory onto the tile."""
+        if inventory.get_item_count(item) < 1 or not self.add_many({item: 1}):
+            return False
+        inventory.remove_item(item)
+        return True
+
+    def drain_to(self, inventory, item=None):
+        """Moves one item from the tile into an inventory."""
+        taken = self.take(item)
+        if taken is None:
+            return False
+        if not inventory.add_many({taken: 1}):
+            self.add_many({taken: 1})
+            return False
+        return True
+
+
+class BeltSystem:
+    def __init__(self, game_map):
+        """
+        Belts placed on the map grid, merged into transport lines.
+
+        A belt continuing the end of a line into the start of another joins both lines,
+        other belts pointing into a line side-load onto it. Only the lines with items
+        that can still move are ticked.
+
+        Args:
+            game_map (Map): Map the belts are placed on.
+        """
+        self.game_map = game_map
+        self.directions = {}  # {(x, y): Direction}
+        self.tile_lines = {}  # {(x, y): TransportLine}
+        self.lines = set()
+        self.active_lines = set()
+
+    def __len__(self):
+        return len(self.directions)
+
+    def place(self, x, y, direction):
+        """
+        Places a belt tile and merges it with the belts it continues or feeds.
+
+        Returns:
+            bool: True if the belt was placed.
+        """
+        tile = (x, y)
+        # The footprint keeps drillers off the belt, and the belt off them
+        if tile in self.directions or not self.game_map.place_entity(Belt(x, y, direction)):
+            return False
+        self.directions[tile] = direction
+        line = TransportLine([tile], self)
+        self.tile_lines[tile] = line
+        self.lines.add(line)
+
+        dx, dy = direction.value
+        target = (x + dx, y + dy)
+        downstream = self.tile_lines.get(target)
+        if downstream is not None:
+            facing = self.directions[target].value == (-dx, -dy)
+            if downstream.tiles[0] == target and not facing:
+                line = self.join(line, downstream)
+            elif not facing:
+                line.output_tile = target
+
+        # Line ends pointing at the new belt: the one straight behind continues it, the others side-load
+        inputs = sorted(self.line_ends_into(tile), key=lambda end: self.directions[end] != direction)
+        for end in inputs:
+            upstream = self.tile_lines[end]
+            if line.tiles[0] == tile and upstream is not line:
+                line = self.join(upstream, line)
+            else:
+                upstream.output_tile = tile
+                upstream.wake()
+        return True
+
+    def line_ends_into(self, tile):
+        x, y = tile
+        for direction in Direction:
+            dx, dy = direction.value
+            neighbour = (x - dx, y - dy)
+            line = self.tile_lines.get(neighbour)
+            if line is not None and self.directions[neighbour] == direction and line.tiles[-1] == neighbour and line.output_tile is None:
+                yield neighbour
+
+    def join(self, upstream, downstream):
+        """Merges two lines, the end of `upstream` leading into the start of `downstream`."""
+        line = TransportLine(upstream.tiles + downstream.tiles, self)
+        line.output_tile = downstream.output_tile
+        line.output = downstream.output
+        line.listeners = upstream.listeners + downstream.listeners
+
+        down_count = len(downstream)
+        up_count = len(upstream)
+        line.reserve(down_count + up_count)
+        line.items[:down_count] = downstream.items[downstream.head:downstream.tail]
+        line.gaps[:down_count] = downstream.gaps[downstream.head:downstream.tail]
+        line.items[down_count:down_count + up_count] = upstream.items[upstream.head:upstream.tail]
+        line.gaps[down_count:down_count + up_count] = upstream.gaps[upstream.head:upstream.tail]
+        if up_count:
+            # The first upstream item now follows the last downstream item
+            line.gaps[down_count] += downstream.length - downstream.used
+            line.used = downstream.length + upstream.used
+        else:
+            line.used = downstream.used
+        line.tail = down_count + up_count
+        line.update_active()
+
+        for old in (upstream, downstream):
+            self.lines.discard(old)
+            self.active_lines.discard(old)
+        for tile in line.tiles:
+            self.tile_lines[tile] = line
+        self.lines.add(line)
+        if len(line):
+            line.wake()
+        return line
+
+    def port(self, x, y):
+        """Returns the insert and extract hook of a belt tile."""
+        return BeltPort(self, x, y)
+
+    def connect_output(self, x, y, inventory):
+        """Makes the line ending at (x, y) deliver its items into an inventory."""
+        line = self.tile_lines[(x, y)]
+        line.output = inventory
+        line.wake()
+
+    def tick(self):
+        for line in list(self.active_lines):
+            if not line.listeners:
+                if not line.tick():
+                    self.active_lines.discard(line)
+                continue
+            used, count = line.used, len(line)
+            if not line.tick():
+                self.active_lines.discard(line)
+            if line.used != used or len(line) != count:
+                line.notify()
@@ -1,5 +1,13 @@
+import pygame
+import numpy as np
+from core.config import Config
+from core.map import TerrainType
 from entities.entity import Entity
+from entities.ore import CoalItem, IronItem
+from core.items import register_item, item_registry
+from core.assets import assets
 
+@register_item
 class DrillerItem:
     COLOR = (136, 128, 123)
     NAME = "DRILLER"
@@ -7,4 +15,306 @@ class DrillerItem:
         pass
             
     def __str__(self):
-        return self.NAME
\ No newline at end of file
+        return self.NAME
+
+
+class Driller(Entity):
+    SHAPE = (2, 2)
+    ITEM = DrillerItem
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+
+        self.image = assets.get_solid(self.ITEM.COLOR, (Config.TILES_SIZE * self.shape[0], Config.TILES_SIZE * self.shape[1]), (0, 0, 0), 2)
+
+    def render(self, camera, screen):
+        offset_x, offset_y = camera.get_offset()
+        position = (self.x * camera.tile_size - offset_x, self.y * camera.tile_size - offset_y)
+        if camera.zoom_level == 0:
+            screen.blit(self.image, position)
+        else:
+            screen.fill(self.ITEM.COLOR, pygame.Rect(position, (max(1, self.shape[0] * camera.tile_size), max(1, self.shape[1] * camera.tile_size))))
+
+
+class DrillerSystem:
+    ORE_ITEMS = {TerrainType.COAL: CoalItem, TerrainType.IRON: IronItem}
+
+    def __init__(self, game_map, scheduler, capacity=64):
+        """
+        Simulates the drillers from struct-of-arrays state, driven by the scheduler.
+
+        Positions, mined tile types, wake-up ticks and output buffers are NumPy arrays
+        with one entry per driller. The mined tile is read at placement and read again
+        only when set_tile changes the footprint, so mining never loads a chunk. Drillers placed on the same tick share one
+        scheduler event per mining cycle, which processes the whole batch with
+        vectorized operations, so a tick only touches the drillers completing an ore.
+        Ores are deposited into the attached inventories with one partial add per
+        inventory and per batch, what doesn't fit stays in the driller buffers.
+        Drillers with a full buffer leave the scheduler: they are parked on their
+        inventory and scheduled again when its listener reports freed space.
+
+        Args:
+            game_map (Map): Map the ores are read from.
+            scheduler (Scheduler): Scheduler running the mining cycles.
+            capacity (int): Initial size of the arrays, doubled when full.
+        """
+        self.game_map = game_map
+        self.scheduler = scheduler
+        self.count = 0
+        self.xs = np.zeros(capacity, dtype=np.int64)
+        self.ys = np.zeros(capacity, dtype=np.int64)
+        self.tile_types = np.zeros(capacity, dtype=np.uint8)
+        self.next_ticks = np.full(capacity, -1, dtype=np.int64)  # End of the current ore, -1 when stopped
+        self.buffers = np.zeros(capacity, dtype=np.int64)  # Ores waiting to be deposited
+        self.inventory_ids = np.full(capacity, -1, dtype=np.int64)  # Index in self.inventories, -1 without inventory
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.batches = np.full(capacity, -1, dtype=np.int64)  # Scheduled batch, -1 when not scheduled
+        self.entities = [None] * capacity
+
+        # Scheduled batches hold stable IDs, since removals move drillers to other indices
+        self.next_id = 0
+        self.id_indices = np.full(capacity, -1, dtype=np.int64)
+        # Scheduler event of every batch and its drillers left, the event is cancelled when none is
+        self.next_batch = 0
+        self.batch_events = {}  # {batch: [event, driller count]}
+
+        self.inventories = []
+        self.inventory_indices = {}  # {id(inventory): index}
+        self.parked = {}  # {inventory index: [arrays of driller IDs]}, drillers waiting for space
+
+        # Item ID mined from each tile value, -1 for the tiles without ore
+        self.ore_lookup = np.full(256, -1, dtype=np.int64)
+        for terrain, item in self.ORE_ITEMS.items():
+            self.ore_lookup[terrain.value] = item.ID
+
+        self.mining_time = Config.DRILLER_MINING_TIME
+        self.buffer_size = Config.DRILLER_BUFFER_SIZE
+        game_map.add_tile_listener(self.on_tile_changed)
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, size):
+        capacity = len(self.xs)
+        while capacity < size:
+            capacity *= 2
+        if capacity == len(self.xs):
+            return
+        for name in ("xs", "ys", "tile_types", "next_ticks", "buffers", "inventory_ids", "ids", "batches"):
+            array = getattr(self, name)
+            grown = np.full(capacity, -1 if name in ("next_ticks", "inventory_ids", "batches") else 0, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+        self.entities.extend([None] * (capacity - len(self.entities)))
+
+    def attach_inventory(self, inventory):
+        """Returns the index of an inventory, registering it and listening to it on first use."""
+        key = id(inventory)
+        if key not in self.inventory_indices:
+            self.inventory_indices[key] = len(self.inventories)
+            self.inventories.append(inventory)
+            inventory.add_listener(self.on_inventory_change)
+        return self.inventory_indices[key]
+
+    def set_inventory(self, index, inventory):
+        """
+        Changes the inventory a driller deposits into, a driller stopped by its full buffer restarts.
+
+        Args:
+            index (int): Index of the driller.
+            inventory (Inventory): Inventory or BeltPort receiving the ores, None to keep them.
+        """
+        self.inventory_ids[index] = -1 if inventory is None else self.attach_inventory(inventory)
+        if inventory is not None and self.next_ticks[index] < 0 and self.ore_lookup[self.tile_types[index]] >= 0:
+            self.start_mining(np.array([index]), self.scheduler.tick)
+
+    def add(self, x, y, inventory=None, entity=None):
+        """
+        Adds a driller.
+
+        Args:
+            x (int): Tile x coordinate of the driller.
+            y (int): Tile y coordinate of the driller.
+            inventory (Inventory): Inventory receiving the ores, or a BeltPort to drop them on a belt,
+                or None to keep them in the driller buffer.
+            entity (Driller): Entity drawn on the map, its `index` attribute follows the driller.
+
+        Returns:
+            int: Index of the driller.
+        """
+        index = int(self.add_many([x], [y], inventory)[0])
+        self.entities[index] = entity
+        if entity is not None:
+            entity.index = index
+        return index
+
+    def add_many(self, xs, ys, inventory=None):
+        """
+        Adds drillers in bulk, they start mining on the current tick.
+
+        Returns:
+            numpy.ndarray: Indices of the new drillers.
+        """
+        start = self.count
+        end = start + len(xs)
+        self.grow(end)
+        indices = np.arange(start, end)
+        ids = np.arange(self.next_id, self.next_id + len(xs))
+        self.next_id += len(xs)
+        if len(self.id_indices) < self.next_id:
+            self.id_indices = np.concatenate((self.id_indices, np.full(max(self.next_id, 2 * len(self.id_indices)) - len(self.id_indices), -1, dtype=np.int64)))
+
+        self.xs[start:end] = xs
+        self.ys[start:end] = ys
+        self.buffers[start:end] = 0
+        self.inventory_ids[start:end] = -1 if inventory is None else self.attach_inventory(inventory)
+        self.ids[start:end] = ids
+        self.id_indices[ids] = indices
+        self.count = end
+        self.read_tiles(indices)
+        self.start_mining(indices[self.ore_lookup[self.tile_types[indices]] >= 0], self.scheduler.tick)
+        return indices
+
+    def remove(self, index):
+        """Removes a driller, the last driller takes its index."""
+        last = self.count - 1
+        self.id_indices[self.ids[index]] = -1
+        self.leave_batches(np.array([index]))
+        if index == last:
+            self.next_ticks[last] = -1
+            self.entities[last] = None
+            self.count = last
+            return
+        for array in (self.xs, self.ys, self.tile_types, self.next_ticks, self.buffers, self.inventory_ids, self.ids, self.batches):
+            array[index] = array[last]
+        self.id_indices[self.ids[index]] = index
+        self.entities[index] = self.entities[last]
+        self.entities[last] = None
+        self.next_ticks[last] = -1
+        self.batches[last] = -1
+        if self.entities[index] is not None:
+            self.entities[index].index = index
+        self.count = last
+
+    def read_tiles(self, indices):
+        """Reads the tile mined by each driller: the first ore tile of its footprint."""
+        width, height = Driller.SHAPE
+        dx, dy = np.meshgrid(np.arange(width), np.arange(height))
+        xs = (self.xs[indices, None] + dx.ravel()).ravel()
+        ys = (self.ys[indices, None] + dy.ravel()).ravel()
+        tiles = self.game_map.get_tiles(xs, ys).reshape(len(indices), width * height)
+        first = np.argmax(self.ore_lookup[tiles] >= 0, axis=1)
+        self.tile_types[indices] = tiles[np.arange(len(indices)), first]
+
+    def on_tile_changed(self, x, y):
+        """Reads the tile of the drillers over a changed tile again, restarting the ones now on ore."""
+        width, height = Driller.SHAPE
+        xs, ys = self.xs[:self.count], self.ys[:self.count]
+        indices = np.flatnonzero((xs <= x) & (x < xs + width) & (ys <= y) & (y < ys + height))
+        if len(indices) == 0:
+            return
+        self.read_tiles(indices)
+        stopped = (self.next_ticks[indices] < 0) & (self.buffers[indices] < self.buffer_size)
+        self.start_mining(indices[stopped & (self.ore_lookup[self.tile_types[indices]] >= 0)], self.scheduler.tick)
+
+    def leave_batches(self, indices):
+        """Takes drillers out of their scheduled batch, cancelling the batches left empty."""
+        batches, counts = np.unique(self.batches[indices], return_counts=True)
+        for batch, count in zip(batches.tolist(), counts.tolist()):
+            if batch < 0:
+                continue
+            entry = self.batch_events[batch]
+            entry[1] -= count
+            if entry[1] == 0:
+                self.scheduler.cancel(entry[0])
+                del self.batch_events[batch]
+        self.batches[indices] = -1
+
+    def start_mining(self, indices, tick):
+        """Schedules the end of the next ore of the given drillers, as one event."""
+        self.leave_batches(indices)
+        self.next_ticks[indices] = -1
+        if len(indices) == 0:
+            return
+        batch = self.next_batch
+        self.next_batch += 1
+        self.next_ticks[indices] = tick + self.mining_time
+        self.batches[indices] = batch
+        event = self.scheduler.schedule(tick + self.mining_time, self.complete, batch, self.ids[indices])
+        self.batch_events[batch] = [event, len(indices)]
+
+    def complete(self, tick, batch, ids):
+        """
+        Ends the mining cycle of a batch of drillers.
+
+        The drillers mine one ore unless their buffer is full or their tile has no ore
+        anymore, then deposit their buffer into their inventory. Drillers whose buffer
+        is still full are parked, see `park`.
+        """
+        del self.batch_events[batch]
+        indices = self.id_indices[ids]
+        indices = indices[indices >= 0]
+        indices = indices[self.batches[indices] == batch]  # Removed, or rescheduled by another batch
+        self.batches[indices] = -1
+        if len(indices) == 0:
+            return
+        item_ids = self.ore_lookup[self.tile_types[indices]]
+        self.next_ticks[indices[item_ids < 0]] = -1
+        on_ore = item_ids >= 0
+        indices, item_ids = indices[on_ore], item_ids[on_ore]
+
+        self.buffers[indices] += self.buffers[indices] < self.buffer_size
+        attached = self.inventory_ids[indices] >= 0
+        if np.any(attached):
+            self.deposit(indices[attached], item_ids[attached])
+
+        running = self.buffers[indices] < self.buffer_size
+        self.park(indices[~running])
+        self.start_mining(indices[running], tick)
+
+    def park(self, indices):
+        """Stops drillers with a full buffer, those with an inventory wait for it to free space."""
+        self.next_ticks[indices] = -1
+        indices = indices[self.inventory_ids[indices] >= 0]
+        inventory_ids = self.inventory_ids[indices]
+        for inventory_id in np.unique(inventory_ids).tolist():
+            self.parked.setdefault(inventory_id, []).append(self.ids[indices[inventory_ids == inventory_id]])
+
+    def on_inventory_change(self, inventory, changes):
+        """Schedules the drillers parked on an inventory again once something left it."""
+        if changes and all(quantity > 0 for quantity in changes.values()):
+            return
+        inventory_id = self.inventory_indices[id(inventory)]
+        ids = self.parked.pop(inventory_id, None)
+        if ids is None:
+            return
+        indices = np.unique(self.id_indices[np.concatenate(ids)])
+        indices = indices[indices >= 0]
+        # Removed, moved to another inventory or restarted since they were parked
+        indices = indices[(self.inventory_ids[indices] == inventory_id) & (self.next_ticks[indices] < 0)]
+        self.start_mining(indices, self.scheduler.tick)
+
+    def deposit(self, indices, item_ids):
+        """Moves the buffers of the given drillers to their inventories, grouped per inventory and item."""
+        amounts = self.buffers[indices]
+        self.buffers[indices] = 0
+        item_count = len(item_registry)
+        keys = self.inventory_ids[indices] * item_count + item_ids
+        totals = np.bincount(keys, weights=amounts).astype(np.int64)
+
+        deposits = {}
+        for key in np.flatnonzero(totals).tolist():
+            inventory_id, item_id = divmod(key, item_count)
+            deposits.setdefault(inventory_id, {})[item_registry.item(item_id)] = int(totals[key])
+
+        for inventory_id, items in deposits.items():
+            added = self.inventories[inventory_id].add_partial(items)
+            for item, quantity in items.items():
+                taken = added.get(item, 0)
+                if taken == quantity:
+                    continue
+                # The inventory is full: the first drillers of the group were served, the others keep
+                # their ores and stop mining once their buffer is full
+                members = (self.inventory_ids[indices] == inventory_id) & (item_ids == item.ID)
+                member_amounts = amounts[members]
+                self.buffers[indices[members]] += np.clip(np.cumsum(member_amounts) - taken, 0, member_amounts)
@@ -2,9 +2,12 @@ from abc import ABC, abstractmethod
 
 
 class Entity(ABC):
+    SHAPE = (1, 1)
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.shape = self.SHAPE
 
 
     @abstractmethod
@@ -1,8 +1,18 @@
+from core.items import register_item
+
+@register_item
 class CoalItem:
     NAME = "COAL"
+    COLOR = (25, 25, 25)
+    SPRITE = "coal.png"
             
+@register_item
 class IronItem:
     NAME = "IRON"
+    COLOR = (200, 200, 200)
+    SPRITE = "iron.png"
     
+@register_item
 class StoneItem:
-    Name = "Stone"
\ No newline at end of file
+    NAME = "STONE"
+    COLOR = (128, 128, 128)
@@ -6,6 +6,10 @@ from core.crafting import CraftingMenu
 from entities.ore import *
 from entities.driller import DrillerItem
 from core.window import Window, Table
+from core.inventory import Inventory
+from core.profiler import profiler
+from core.items import item_registry
+from core.assets import assets
 
 
 class Player(Entity):
@@ -15,24 +19,35 @@ class Player(Entity):
     INVENTORY_SIZE = (10, 10)
     def __init__(self, x, y):
         super().__init__(x, y)        
+        self.previous_x = x
+        self.previous_y = y
 
         self.speed = self.SPEED
         
         self.shape = self.SHAPE
 
-        self.image = pygame.Surface((Config.TILES_SIZE * self.shape[0], Config.TILES_SIZE * self.shape[1]))
-        self.image.fill(self.COLOR)
+        self.image = assets.get_solid(self.COLOR, (Config.TILES_SIZE * self.shape[0], Config.TILES_SIZE * self.shape[1]))
         self.rect = self.image.get_rect()
 
-        self.inventory = Inventory(20, 2)
+        self.inventory = PlayerInventory(20, 2)
         self.crafting = CraftingMenu(self.inventory)
         
         self.crafting.add_recipe(PlayerRecipe.STONE_FURNACE)
         self.crafting.add_recipe(PlayerRecipe.MACHIN)
 
-    def handle_input(self, events, game_map):
-        keys = pygame.key.get_pressed()
-        
+    def save_position(self):
+        """Remembers the position of the last tick, to interpolate the rendering."""
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+    def update(self, game_map, keys):
+        """
+        Moves the player according to the held keys, once per simulation tick.
+
+        Args:
+            game_map (Map): The map walked on.
+            keys (KeyState): Held keys of the tick.
+        """
         if keys[pygame.K_q]:
             _x = self.x - self.speed
             if game_map.is_walkable(_x, self.y, self.shape):
@@ -52,36 +67,66 @@ class Player(Entity):
             _y = self.y + self.speed
             if game_map.is_walkable(self.x, _y, self.shape):
                 self.y = _y
-                
-        for event in events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_e:
-                    self.inventory.window.is_open = not self.inventory.window.is_open
-                               
-                if event.key == pygame.K_c:
-                    self.crafting.windows_open = not self.crafting.windows_open
-                    
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                self.crafting.handle_click(event.pos)
-                
-            self.inventory.handle_event(event)
-            
-    def render(self, camera, screen):
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_e:
+                self.inventory.window.is_open = not self.inventory.window.is_open
+
+            if event.key == pygame.K_c:
+                self.crafting.windows_open = not self.crafting.windows_open
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.crafting.handle_click(event.pos)
+
+        self.inventory.handle_event(event)
+
+    def get_screen_rect(self, camera, alpha=1):
+        """Returns the rectangle covered by the player on the screen."""
+        offset_x, offset_y = camera.get_offset()
+
+        x = self.previous_x + (self.x - self.previous_x) * alpha
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        screen_x = (x * camera.tile_size) - offset_x
+        screen_y = (y * camera.tile_size) - offset_y
+        if camera.zoom_level == 0:
+            return self.image.get_rect(topleft=(screen_x, screen_y))
+        return pygame.Rect(screen_x, screen_y, max(1, self.shape[0] * camera.tile_size), max(1, self.shape[1] * camera.tile_size))
+
+    def get_ui_layers(self):
+        """
+        Returns the open inventory and crafting windows, for the dirty rectangles.
+
+        Returns:
+            dict: {name: (list of pygame.Rect, state)}, the state changes whenever the
+                drawn window would.
+        """
+        center_x, center_y = Config.WINDOW_SIZE[0]//2, Config.WINDOW_SIZE[1]//2
+        layers = {"inventory": ([], None), "crafting": ([], None)}
+        if self.inventory.window.is_open:
+            layers["inventory"] = ([self.inventory.window.rect.copy()], self.inventory.render_state())
+        if self.crafting.windows_open:
+            layers["crafting"] = ([self.crafting.get_rect(center_x, center_y)], self.crafting.render_state(center_x, center_y))
+        return layers
+
+    def render(self, camera, screen, alpha=1):
         """
         Render the player on the screen, considering the camera offset.
         Args:
             screen: The pygame surface to render on.
+            alpha (float): Interpolation between the previous (0) and current (1) tick positions.
         """
-        offset_x, offset_y = camera.get_offset()
-
-        screen_x = (self.x * Config.TILES_SIZE) - offset_x
-        screen_y = (self.y * Config.TILES_SIZE) - offset_y
-
-        self.rect.topleft = (screen_x, screen_y)
-        screen.blit(self.image, self.rect)
+        with profiler.section("render.player"):
+            self.rect = self.get_screen_rect(camera, alpha)
+            if camera.zoom_level == 0:
+                screen.blit(self.image, self.rect)
+            else:
+                screen.fill(self.COLOR, self.rect)
         
-        self.inventory.render(screen)
-        self.crafting.render(screen, Config.WINDOW_SIZE[0]//2, Config.WINDOW_SIZE[1]//2)
+        with profiler.section("render.inventory"):
+            self.inventory.render(screen)
+        with profiler.section("render.crafting"):
+            self.crafting.render(screen, Config.WINDOW_SIZE[0]//2, Config.WINDOW_SIZE[1]//2)
         
         
 class PlayerRecipe:
@@ -89,7 +134,7 @@ class PlayerRecipe:
     MACHIN = Recipe("MACHIN", {CoalItem:2}, (DrillerItem, 1))
     
 
-class Inventory:
+class PlayerInventory(Inventory):
     WINDOW_WIDTH = 400
     WINDOW_HEIGHT = 300
     CELL_WIDTH = 150
@@ -98,17 +143,14 @@ class Inventory:
 
     def __init__(self, rows, cols, title="Player Inventory"):
         """
-        Initialise l'inventaire avec une capacité fixe.
+        Initialise l'inventaire avec une capacité fixe et sa fenêtre.
 
         Args:
-            rows (int): Nombre de lignes (objets uniques max).
-            cols (int): Nombre de colonnes pour afficher les données.
+            rows (int): Nombre de lignes d'emplacements.
+            cols (int): Nombre de colonnes d'emplacements.
             title (str): Titre de la fenêtre.
         """
-        self.rows = rows
-        self.cols = cols
-        self.capacity = rows * cols
-        self.items = {}  # Stockage sous forme {objet: quantité}
+        super().__init__(rows, cols)
         self.window = Window(100, 100, self.WINDOW_WIDTH, self.WINDOW_HEIGHT, title)
         self.table = Table(
             10, self.TITLE_BAR_HEIGHT + 10, self.WINDOW_WIDTH - 20, self.WINDOW_HEIGHT - self.TITLE_BAR_HEIGHT - 20,
@@ -117,60 +159,22 @@ class Inventory:
             header=["Object", "Quantity"]
         )
         self.window.add_component(self.table)
+        self.table_outdated = False
+        self.add_listener(self.update_table)
 
-    def add_item(self, item, quantity=1):
-        """
-        Ajoute un objet à l'inventaire.
-
-        Args:
-            item (str): Nom de l'objet.
-            quantity (int): Quantité à ajouter.
-        """
-        current_count = sum(self.items.values())
-        if current_count + quantity > self.capacity:
-            print("Inventory full!")
-            return
-
-        if item in self.items:
-            self.items[item] += quantity
-        else:
-            if current_count < self.capacity:
-                self.items[item] = quantity
-        self.update_table()
-        
-        
-    def get_item_count(self, item):
-        """
-        Compte le nombre d'item
-
-        Args:
-            item (str): Nom de l'objet.            
-        """
-        if item not in self.items.keys():
-            return 0
-        else:            
-            return self.items[item]
-
-    def remove_item(self, item, quantity=1):
-        """
-        Retire un objet de l'inventaire.
-
-        Args:
-            item (str): Nom de l'objet.
-            quantity (int): Quantité à retirer.
-        """
-        if item in self.items:
-            self.items[item] -= quantity
-            if self.items[item] <= 0:
-                del self.items[item]
-        self.update_table()
+    def update_table(self, inventory=None, changes=None):
+        """Marque le tableau à mettre à jour, il n'est reconstruit qu'au prochain affichage."""
+        self.table_outdated = True
 
-    def update_table(self):
-        """Met à jour les données du tableau avec le contenu de l'inventaire."""
-        self.table.data = [[item, quantity] for item, quantity in self.items.items()]
+    def render_state(self):
+        """Ce dont dépend l'affichage de la fenêtre, elle n'est redessinée que s'il change."""
+        return (tuple(self.window.rect), self.table_outdated, self.table.dirty, self.table.scroll_offset)
 
     def render(self, screen):
         """Affiche l'inventaire."""
+        if self.table_outdated and self.window.is_open:
+            self.table.data = [[item_registry.get(item).name, quantity] for item, quantity in self.items.items()]
+            self.table_outdated = False
         self.window.render(screen)
 
     def handle_event(self, event):
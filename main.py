@@ -1,5 +1,32 @@
+import argparse
+
 from core.game import Game
+from core.input import InputRecording, LiveInput, ReplayInput
+from core.profiler import profiler
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Pyfactorio")
+    parser.add_argument("--headless", action="store_true", help="run the simulation without a window")
+    parser.add_argument("--ticks", type=int, default=None, help="stop after this number of simulation ticks")
+    parser.add_argument("--profile", metavar="PATH", help="dump the profiler statistics (.json or .csv) on exit")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the world generation")
+    parser.add_argument("--record", metavar="PATH", help="record the input of the session to a .npz file")
+    parser.add_argument("--replay", metavar="PATH", help="play a recorded session back, on the world it was recorded on")
+    args = parser.parse_args()
+    if args.record and args.headless:
+        parser.error("--record needs a window to read the input from")
+
+    seed = args.seed
+    game_input = None
+    if args.replay:
+        recording = InputRecording.load(args.replay)
+        seed = recording.seed
+        game_input = ReplayInput(recording)
+    elif args.record:
+        game_input = LiveInput(args.record)
+
+    game = Game(headless=args.headless, seed=seed, game_input=game_input)
+    game.run(max_ticks=args.ticks)
+
+    if args.profile:
+        profiler.dump(args.profile)
@@ -0,0 +1,15 @@
+import os
+
+# Surfaces and fonts are created without a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+from core.config import Config
+
+
+@pytest.fixture
+def unbounded(monkeypatch):
+    """Makes the maps created by the test unbounded, as negative and far chunks need."""
+    monkeypatch.setattr(Config, "MAP_SIZE", None)
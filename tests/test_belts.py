@@ -0,0 +1,142 @@
+from core.config import Config
+from core.inventory import Inventory
+from core.map import Map, TerrainType
+from entities.belt import BeltSystem, Direction
+from entities.driller import Driller
+from entities.ore import CoalItem, IronItem
+
+TILE_TICKS = Config.BELT_TILE_LENGTH // Config.BELT_SPEED  # Ticks to cross a tile
+
+
+def flat_belts():
+    game_map = Map(seed=0)
+    game_map.load_area(0, 0, 32, 32)
+    for chunk in game_map.chunks.values():
+        chunk[:] = TerrainType.GRASS.value
+    return BeltSystem(game_map)
+
+
+def place_row(belts, x0, x1, y=0, direction=Direction.RIGHT):
+    for x in range(x0, x1):
+        assert belts.place(x, y, direction)
+
+
+def run(belts, ticks):
+    for _ in range(ticks):
+        belts.tick()
+
+
+def test_a_row_of_belts_is_one_line():
+    belts = flat_belts()
+
+    place_row(belts, 0, 5)
+
+    assert len(belts) == 5 and len(belts.lines) == 1
+    assert belts.tile_lines[(0, 0)].tiles == [(x, 0) for x in range(5)]
+
+
+def test_a_belt_between_two_lines_joins_them_with_their_items():
+    belts = flat_belts()
+    place_row(belts, 0, 3)
+    place_row(belts, 4, 7)
+    belts.port(0, 0).add_many({CoalItem: 1})
+    belts.port(5, 0).add_many({IronItem: 1})
+    assert len(belts.lines) == 2
+
+    belts.place(3, 0, Direction.RIGHT)
+
+    line = belts.tile_lines[(0, 0)]
+    assert len(belts.lines) == 1 and line.tiles == [(x, 0) for x in range(7)]
+    assert line.items[line.head:line.tail].tolist() == [IronItem.ID, CoalItem.ID]
+
+
+def test_items_are_delivered_in_order_at_the_end_of_the_line():
+    belts = flat_belts()
+    place_row(belts, 0, 4)
+    inventory = Inventory(1, 2)
+    belts.connect_output(3, 0, inventory)
+    line = belts.tile_lines[(0, 0)]
+    line.add_many({IronItem: 1})
+    run(belts, Config.BELT_ITEM_SPACING)
+    line.add_many({CoalItem: 1})
+
+    run(belts, 4 * TILE_TICKS)
+    assert inventory.items == {IronItem: 1, CoalItem: 1}
+    assert inventory.slots[0][0] is IronItem
+    assert len(line) == 0
+    # Nothing left to move, the line sleeps
+    assert line not in belts.active_lines
+
+
+def test_a_full_output_stops_the_line_without_losing_items():
+    belts = flat_belts()
+    place_row(belts, 0, 2)
+    inventory = Inventory(1, 1)
+    inventory.add_item(CoalItem, inventory.stack_size(CoalItem))
+    belts.connect_output(1, 0, inventory)
+    belts.port(1, 0).add_many({IronItem: 2})
+
+    run(belts, 4 * TILE_TICKS)
+    assert len(belts.tile_lines[(0, 0)]) == 2
+
+    inventory.remove_item(CoalItem, inventory.stack_size(CoalItem))
+    run(belts, 4 * TILE_TICKS)
+    assert inventory.items == {IronItem: 2}
+
+
+def test_belts_pointing_into_a_line_side_load_onto_it():
+    belts = flat_belts()
+    place_row(belts, 0, 5, y=2)
+    for y in (0, 1):
+        belts.place(2, y, Direction.DOWN)
+    inventory = Inventory(1, 1)
+    belts.connect_output(4, 2, inventory)
+    side = belts.tile_lines[(2, 0)]
+    assert side is not belts.tile_lines[(2, 2)]
+    assert side.output_tile == (2, 2)
+
+    side.add_many({CoalItem: 3})
+    run(belts, 10 * TILE_TICKS)
+
+    assert inventory.items == {CoalItem: 3}
+
+
+def test_ports_take_what_fits_on_their_tile():
+    belts = flat_belts()
+    place_row(belts, 0, 2)
+    port = belts.port(0, 0)
+    spots = Config.BELT_TILE_LENGTH // Config.BELT_ITEM_SPACING
+
+    assert not port.add_many({CoalItem: spots + 1})
+    assert port.add_partial({CoalItem: spots - 1, IronItem: 5}) == {CoalItem: spots - 1, IronItem: 1}
+    assert port.add_partial({CoalItem: 1}) == {}
+    assert port.take(IronItem) is IronItem
+    assert port.take(IronItem) is None
+    assert port.add_partial({CoalItem: 5}) == {CoalItem: 1}
+
+
+def test_port_listeners_hear_items_moving_away():
+    belts = flat_belts()
+    place_row(belts, 0, 3)
+    port = belts.port(0, 0)
+    heard = []
+    port.add_listener(lambda changed, changes: heard.append(changed))
+    port.add_many({CoalItem: 1})
+
+    run(belts, 2)
+    # Joining keeps the listeners of both lines
+    belts.place(3, 0, Direction.RIGHT)
+    heard.clear()
+    run(belts, 2)
+
+    assert heard == [port, port]
+
+
+def test_belts_and_drillers_cant_overlap():
+    belts = flat_belts()
+    assert belts.place(1, 1, Direction.RIGHT)
+
+    assert not belts.game_map.place_entity(Driller(0, 0))
+    assert belts.game_map.place_entity(Driller(4, 4))
+    assert not belts.place(5, 5, Direction.RIGHT)
+    assert not belts.place(1, 1, Direction.UP)
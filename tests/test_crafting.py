@@ -0,0 +1,105 @@
+import numpy as np
+
+from core.crafting import CraftingMenu, Recipe
+from core.inventory import Inventory
+from core.items import register_item
+from entities.ore import CoalItem, IronItem
+
+
+@register_item
+class PlateItem:
+    NAME = "TEST_PLATE"
+
+
+@register_item
+class GearItem:
+    NAME = "TEST_GEAR"
+
+
+@register_item
+class MotorItem:
+    NAME = "TEST_MOTOR"
+
+
+PLATE = Recipe("PLATE", {IronItem: 1}, (PlateItem, 2))
+GEAR = Recipe("GEAR", {PlateItem: 2}, (GearItem, 1))
+MOTOR = Recipe("MOTOR", {GearItem: 1, PlateItem: 1, CoalItem: 1}, (MotorItem, 1))
+
+
+def menu(items, rows=2, cols=5):
+    inventory = Inventory(rows, cols)
+    inventory.add_many(items)
+    crafting = CraftingMenu(inventory)
+    for recipe in (PLATE, GEAR, MOTOR):
+        crafting.add_recipe(recipe)
+    return crafting
+
+
+def test_craftable_recipes_follow_the_inventory():
+    crafting = menu({IronItem: 3, PlateItem: 4})
+
+    crafting.update_craftable()
+    assert crafting.craftable.tolist() == [True, True, False]
+    assert crafting.max_crafts[:2].tolist() == [3, 2]
+
+    crafting.inventory.remove_item(PlateItem, 3)
+    assert crafting.can_craft(PLATE, 3)
+    assert not crafting.can_craft(GEAR)
+
+
+def test_craft_swaps_ingredients_for_the_output():
+    crafting = menu({IronItem: 3})
+
+    assert crafting.craft(PLATE, 2)
+    assert crafting.inventory.items == {IronItem: 1, PlateItem: 4}
+    assert not crafting.craft(PLATE, 2)
+    assert crafting.inventory.items == {IronItem: 1, PlateItem: 4}
+
+
+def test_craft_changes_nothing_when_the_output_doesnt_fit():
+    crafting = menu({IronItem: 5, CoalItem: 1}, rows=1, cols=2)
+
+    assert not crafting.craft(PLATE)
+    assert crafting.inventory.items == {IronItem: 5, CoalItem: 1}
+
+
+def test_plan_resolves_the_intermediate_crafts_in_order():
+    crafting = menu({IronItem: 2, CoalItem: 1})
+
+    steps = crafting.plan_craft(MOTOR)
+
+    assert steps == [(PLATE, 1), (GEAR, 1), (PLATE, 1), (MOTOR, 1)]
+    assert crafting.inventory.items == {IronItem: 2, CoalItem: 1}
+
+
+def test_plan_fails_on_missing_raw_materials():
+    crafting = menu({IronItem: 1, CoalItem: 1})
+
+    assert crafting.plan_craft(MOTOR) is None
+    assert not crafting.craft_recursive(MOTOR)
+    assert crafting.inventory.items == {IronItem: 1, CoalItem: 1}
+
+
+def test_craft_recursive_crafts_the_missing_items():
+    crafting = menu({IronItem: 4, CoalItem: 2})
+
+    # 3 plate crafts give the 4 plates of the gears and the 2 of the motors
+    assert crafting.craft_recursive(MOTOR, 2)
+    assert crafting.inventory.items == {MotorItem: 2, IronItem: 1}
+
+
+def test_craft_recursive_restores_the_inventory_when_a_step_fails():
+    # Room for the ingredients but not for the plates crafted from them
+    crafting = menu({IronItem: 2, CoalItem: 1}, rows=1, cols=2)
+    before = crafting.inventory.save_slots()
+
+    assert not crafting.craft_recursive(MOTOR)
+    assert np.array_equal(crafting.inventory.save_slots(), before)
+
+
+def test_cyclic_recipes_are_not_planned():
+    crafting = menu({})
+    crafting.add_recipe(Recipe("GEAR_BACK", {GearItem: 1}, (PlateItem, 2)))
+    crafting.producers[PlateItem.ID] = crafting.recipes[-1]
+
+    assert crafting.plan_craft(GEAR) is None
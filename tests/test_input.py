@@ -0,0 +1,129 @@
+from collections import defaultdict
+
+import numpy as np
+import pygame
+import pytest
+
+from core.config import Config
+from core.game import Game
+from core.input import InputRecording, KeyState, ReplayInput
+from core.map import Map
+from core.worldcache import world_cache
+
+SEED = 3
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps the worlds generated by the test out of the user's world cache."""
+    monkeypatch.setattr(world_cache, "cache_dir", str(tmp_path / "worlds"))
+
+
+def click(tick, x, y, button):
+    screen_x, screen_y = (x + 0.5) * Config.TILES_SIZE, (y + 0.5) * Config.TILES_SIZE
+    return [(tick, pygame.MOUSEMOTION, 0, screen_x, screen_y), (tick, pygame.MOUSEBUTTONDOWN, button, screen_x, screen_y)]
+
+
+def session(ticks=120):
+    """Places the two drillers of the player inventory, walks right, then zooms out."""
+    events = click(2, 12, 8, 3) + click(3, 15, 9, 3) + [(90, pygame.MOUSEWHEEL, 0, 0, -1)]
+    keys = [(10, KeyState.BITS[pygame.K_d]), (40, 0)]
+    return InputRecording(Map(seed=SEED).generator_params(), ticks,
+                          np.array(events, dtype=InputRecording.EVENT_DTYPE),
+                          np.array(keys, dtype=InputRecording.KEY_DTYPE))
+
+
+def replay(recording):
+    """Plays a recording back headlessly, returns the main scene once the recording ended."""
+    game = Game(headless=True, seed=recording.seed, game_input=ReplayInput(recording))
+    game.alpha = 1
+    while game.running:
+        game.scene_manager.handle_events()
+        if game.running:
+            game.update()
+    scene = game.scene_manager.current_scene
+    state = scene.state_hash()
+    game.close()
+    return scene, state
+
+
+def test_key_states_read_like_pressed_keys():
+    # Indexed by key code like pygame.key.get_pressed()
+    pressed = defaultdict(bool, {pygame.K_z: True, pygame.K_LEFT: True})
+
+    keys = KeyState.from_pressed(pressed)
+
+    assert keys[pygame.K_z] and keys[pygame.K_LEFT]
+    assert not keys[pygame.K_s] and not keys[pygame.K_a]
+    assert KeyState(keys.mask)[pygame.K_z]
+
+
+def test_events_encode_and_decode():
+    events = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_e, mod=0, unicode="e"),
+              pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(3, 4)),
+              pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-1),
+              pygame.event.Event(pygame.QUIT)]
+
+    records = np.array([InputRecording.encode(7, event) for event in events], dtype=InputRecording.EVENT_DTYPE)
+    decoded = [InputRecording.decode(record) for record in records]
+
+    assert [event.type for event in decoded] == [event.type for event in events]
+    assert decoded[0].key == pygame.K_e
+    assert (decoded[1].button, decoded[1].pos) == (1, (3, 4))
+    assert decoded[2].y == -1
+    assert InputRecording.encode(7, pygame.event.Event(pygame.ACTIVEEVENT, gain=1, state=1)) is None
+
+
+def test_recordings_load_back(tmp_path):
+    path = str(tmp_path / "session.npz")
+    recording = session()
+
+    recording.save(path)
+    loaded = InputRecording.load(path)
+
+    assert loaded.params == recording.params and loaded.ticks == recording.ticks
+    assert np.array_equal(loaded.events, recording.events)
+    assert np.array_equal(loaded.keys, recording.keys)
+
+
+def test_replay_input_plays_events_and_keys_at_their_tick():
+    replay_input = ReplayInput(session())
+    replay_input.start(Map(seed=SEED))
+    polled = []
+    held = []
+    while not replay_input.finished:
+        polled.append([event.type for event in replay_input.poll_events()])
+        held.append(replay_input.step()[pygame.K_d])
+
+    assert len(polled) == 120
+    assert polled[2] == [pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN]
+    assert polled[90] == [pygame.MOUSEWHEEL]
+    assert sum(len(events) for events in polled) == 5
+    assert held.index(True) == 10 and held.count(True) == 30
+
+
+def test_recordings_only_replay_on_their_world():
+    replay_input = ReplayInput(session())
+
+    with pytest.raises(ValueError):
+        replay_input.start(Map(seed=SEED + 1))
+
+
+def test_replays_end_on_the_same_state(cache_dir):
+    recording = session()
+
+    scene, state = replay(recording)
+    _, state_again = replay(recording)
+
+    assert scene.scheduler.tick == recording.ticks
+    assert len(scene.drillers) == 2
+    assert scene.player.x > 5 and scene.camera.zoom_level == 1
+    assert state == state_again
+
+
+def test_a_different_session_ends_on_another_state(cache_dir):
+    recording = session()
+    other = session()
+    other.events = other.events[:2]
+
+    assert replay(recording)[1] != replay(other)[1]
@@ -0,0 +1,106 @@
+import numpy as np
+
+from core.inventory import Inventory
+from entities.ore import CoalItem, IronItem, StoneItem
+
+
+def stacks(inventory):
+    return [None if stack is None else (stack[0], stack[1]) for stack in inventory.slots]
+
+
+def test_items_fill_stacks_up_to_the_stack_size():
+    inventory = Inventory(1, 3)
+    stack_size = inventory.stack_size(CoalItem)
+
+    assert inventory.add_item(CoalItem, stack_size + 5)
+    assert inventory.add_item(CoalItem, 2)
+
+    assert stacks(inventory) == [(CoalItem, stack_size), (CoalItem, 7), None]
+    assert inventory.get_item_count(CoalItem) == stack_size + 7
+    assert inventory.total == stack_size + 7
+    assert inventory.count_vector()[CoalItem.ID] == stack_size + 7
+
+
+def test_add_many_adds_nothing_unless_everything_fits():
+    inventory = Inventory(1, 2)
+    stack_size = inventory.stack_size(CoalItem)
+    inventory.add_item(CoalItem, 1)
+
+    assert not inventory.add_many({CoalItem: stack_size, IronItem: 1})
+    assert stacks(inventory) == [(CoalItem, 1), None]
+    assert inventory.add_many({CoalItem: stack_size - 1, IronItem: 1})
+    assert stacks(inventory) == [(CoalItem, stack_size), (IronItem, 1)]
+
+
+def test_remove_many_removes_nothing_unless_everything_is_there():
+    inventory = Inventory(2, 2)
+    inventory.add_many({CoalItem: 3, IronItem: 1})
+
+    assert not inventory.remove_many({CoalItem: 2, IronItem: 2})
+    assert inventory.items == {CoalItem: 3, IronItem: 1}
+    assert inventory.remove_many({CoalItem: 3, IronItem: 1})
+    assert inventory.items == {} and inventory.total == 0
+    assert len(inventory.free_slots) == 4
+
+
+def test_freed_slots_are_reused_first():
+    inventory = Inventory(1, 3)
+    stack_size = inventory.stack_size(CoalItem)
+    inventory.add_many({CoalItem: stack_size, IronItem: 1, StoneItem: 1})
+
+    inventory.remove_item(CoalItem, stack_size)
+    inventory.add_item(StoneItem, inventory.stack_size(StoneItem))
+
+    assert stacks(inventory)[0] == (StoneItem, 1)
+
+
+def test_add_partial_adds_what_fits():
+    inventory = Inventory(1, 1)
+    stack_size = inventory.stack_size(CoalItem)
+    inventory.add_item(CoalItem, stack_size - 2)
+
+    added = inventory.add_partial({CoalItem: 5, IronItem: 3})
+
+    assert added == {CoalItem: 2}
+    assert inventory.space_for(CoalItem) == 0 and inventory.space_for(IronItem) == 0
+
+
+def test_listeners_get_every_applied_change():
+    inventory = Inventory(1, 2)
+    changes = []
+    inventory.add_listener(lambda changed, items: changes.append(items))
+
+    inventory.add_many({CoalItem: 2})
+    inventory.remove_many({CoalItem: 1})
+    inventory.add_many({CoalItem: 1000})
+
+    assert changes == [{CoalItem: 2}, {CoalItem: -1}]
+
+
+def test_saved_slots_load_back():
+    inventory = Inventory(2, 2)
+    inventory.add_many({CoalItem: 70, IronItem: 3})
+    inventory.remove_item(CoalItem, 1)
+    data = inventory.save_slots()
+
+    loaded = Inventory(2, 2)
+    loaded.load_slots(data)
+
+    assert stacks(loaded) == stacks(inventory)
+    assert loaded.items == inventory.items
+    assert np.array_equal(loaded.count_vector(), inventory.count_vector())
+    assert loaded.free_slots == inventory.free_slots
+
+
+def test_loaded_partial_stacks_are_merged():
+    inventory = Inventory(1, 3)
+    stack_size = inventory.stack_size(CoalItem)
+    data = np.array([[CoalItem.ID, 5], [CoalItem.ID, stack_size], [CoalItem.ID, 7]], dtype=np.int32)
+
+    inventory.load_slots(data)
+
+    assert stacks(inventory) == [(CoalItem, stack_size), (CoalItem, 12), None]
+    space = inventory.space_for(CoalItem)
+    assert space == 2 * stack_size - 12
+    assert inventory.add_many({CoalItem: space})
+    assert not inventory.add_many({CoalItem: 1})
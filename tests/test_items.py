@@ -0,0 +1,68 @@
+import numpy as np
+
+from core.config import Config
+from core.crafting import Recipe
+from core.inventory import Inventory
+from core.items import ItemRegistry, item_registry
+from entities.ore import CoalItem, IronItem, StoneItem
+
+
+def test_ids_are_dense_in_registration_order():
+    registry = ItemRegistry()
+
+    class Plate:
+        NAME = "PLATE"
+        STACK_SIZE = 100
+
+    class Gear:
+        NAME = "GEAR"
+
+    registry.register(Plate)
+    registry.register(Gear)
+    registry.register(Plate)
+
+    assert (Plate.ID, Gear.ID) == (0, 1)
+    assert len(registry) == 2
+    assert registry.get(Gear) is registry.get(1) is registry.get_by_name("GEAR")
+    assert registry.item(0) is Plate
+    assert registry.get(Plate).stack_size == 100
+    assert registry.get(Gear).stack_size == Config.MAX_STACK_SIZE
+    assert registry.get(Gear).color == ItemRegistry.DEFAULT_COLOR
+    assert registry.names() == ["PLATE", "GEAR"]
+
+
+def test_vectors_are_indexed_by_id():
+    vector = item_registry.vector({IronItem: 3, CoalItem: 2})
+
+    assert len(vector) == len(item_registry)
+    assert vector[IronItem.ID] == 3 and vector[CoalItem.ID] == 2
+    assert vector.sum() == 5
+
+
+def test_saved_ids_are_remapped_by_name():
+    inventory = Inventory(1, 3)
+    inventory.add_many({CoalItem: 4, IronItem: 2, StoneItem: 1})
+    data = inventory.save_slots()
+
+    # The same slots as saved by a registry listing the items in another order
+    names = item_registry.names()[::-1]
+    old_ids = {name: index for index, name in enumerate(names)}
+    old_data = data.copy()
+    for row in old_data:
+        if row[0] >= 0:
+            row[0] = old_ids[item_registry.get(int(row[0])).name]
+
+    loaded = Inventory(1, 3)
+    loaded.load_slots(old_data, names)
+
+    assert loaded.items == {CoalItem: 4, IronItem: 2, StoneItem: 1}
+    assert np.array_equal(loaded.save_slots(), data)
+
+
+def test_recipes_and_inventories_share_the_ids():
+    recipe = Recipe("TEST", {IronItem: 2, CoalItem: 1}, (StoneItem, 1))
+    inventory = Inventory(1, 2)
+    inventory.add_many({IronItem: 2, CoalItem: 1})
+
+    assert np.array_equal(recipe.get_vector(), inventory.count_vector())
+    assert recipe.output_id == StoneItem.ID
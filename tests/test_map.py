@@ -0,0 +1,156 @@
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from core.config import Config
+from core.map import Map, TerrainType
+
+
+def test_chunks_are_generated_on_first_access(unbounded):
+    game_map = Map(seed=1)
+    assert game_map.chunks == {}
+
+    game_map.get_tile(-1, Config.CHUNK_SIZE)
+
+    assert list(game_map.chunks) == [(-1, 1)]
+
+
+def test_chunks_dont_depend_on_the_generation_order(unbounded):
+    area = Map(seed=7)
+    area.generate_area(-1, -1, 3, 3)
+    lazy = Map(seed=7)
+
+    for key in reversed(sorted(area.chunks)):
+        assert np.array_equal(lazy.get_chunk(*key), area.chunks[key])
+
+
+def test_seeds_give_different_worlds():
+    assert not np.array_equal(Map(seed=1).generate_area(0, 0, 4, 4), Map(seed=2).generate_area(0, 0, 4, 4))
+
+
+def test_get_tiles_reads_across_chunks_and_outside_the_world():
+    game_map = Map(seed=3)
+    xs = np.array([0, Config.CHUNK_SIZE + 1, 5, -1, Config.MAP_SIZE])
+    ys = np.array([0, 3, Config.CHUNK_SIZE * 2, 0, 0])
+
+    tiles = game_map.get_tiles(xs, ys)
+
+    assert tiles[:3].tolist() == [game_map.get_tile(x, y) for x, y in zip(xs[:3].tolist(), ys[:3].tolist())]
+    assert tiles[3:].tolist() == [TerrainType.EMPTY.value] * 2
+
+
+def test_evicted_chunks_are_generated_again_identical(unbounded):
+    game_map = Map(seed=4)
+    far = game_map.get_chunk(20, 0).copy()
+    game_map.get_chunk(0, 0)
+
+    evicted = game_map.evict_chunks([(0, 0)], radius=2)
+
+    assert evicted == [(20, 0)]
+    assert (20, 0) not in game_map.chunks and (0, 0) in game_map.chunks
+    assert np.array_equal(game_map.get_chunk(20, 0), far)
+
+
+def test_edited_chunks_are_paged_out_and_keep_their_edits(unbounded):
+    game_map = Map(seed=5)
+    game_map.set_tile(20 * Config.CHUNK_SIZE, 0, TerrainType.WATER.value)
+
+    game_map.evict_chunks([(0, 0)], radius=2)
+
+    assert (20, 0) in game_map.paged_chunks
+    assert os.listdir(game_map.page_dir)
+    assert game_map.get_tile(20 * Config.CHUNK_SIZE, 0) == TerrainType.WATER.value
+    assert (20, 0) not in game_map.paged_chunks
+
+
+def test_clear_pages_removes_the_page_directory(unbounded):
+    game_map = Map(seed=5)
+    game_map.set_tile(20 * Config.CHUNK_SIZE, 0, TerrainType.WATER.value)
+    game_map.evict_chunks([(0, 0)], radius=2)
+    page_dir = game_map.page_dir
+
+    game_map.clear_pages()
+
+    assert not os.path.exists(page_dir)
+    assert game_map.paged_chunks == set()
+
+
+def test_the_page_directory_goes_with_the_map(unbounded):
+    game_map = Map(seed=5)
+    game_map.set_tile(20 * Config.CHUNK_SIZE, 0, TerrainType.WATER.value)
+    game_map.evict_chunks([(0, 0)], radius=2)
+    page_dir = game_map.page_dir
+
+    del game_map
+    gc.collect()
+
+    assert not os.path.exists(page_dir)
+
+
+def test_saved_maps_load_the_same_tiles(tmp_path, unbounded):
+    path = str(tmp_path / "world.map")
+    game_map = Map(seed=6)
+    game_map.generate_area(0, 0, 2, 2)
+    game_map.set_tile(40, 3, TerrainType.WATER.value)
+    game_map.set_tile(20 * Config.CHUNK_SIZE, 0, TerrainType.IRON.value)
+    game_map.evict_chunks([(0, 0)], radius=2)
+
+    game_map.save_map(path)
+    loaded = Map(filename=path)
+
+    assert loaded.seed == 6 and loaded.size is None
+    assert set(loaded.file_chunks) == {(0, 0), (1, 0), (0, 1), (1, 1), (20, 0)}
+    for key in loaded.file_chunks:
+        assert np.array_equal(loaded.get_chunk(*key), game_map.get_chunk(*key))
+    # Chunks missing from the file are generated as they would have been
+    assert np.array_equal(loaded.get_chunk(5, 5), Map(seed=6).get_chunk(5, 5))
+
+
+def test_saving_twice_writes_the_same_file(tmp_path):
+    game_map = Map(seed=6)
+    game_map.generate_area(0, 0, 2, 2)
+    game_map.save_map(str(tmp_path / "first.map"))
+    other = Map(seed=6)
+    other.generate_area(0, 0, 2, 2)
+    other.save_map(str(tmp_path / "second.map"))
+
+    assert (tmp_path / "first.map").read_bytes() == (tmp_path / "second.map").read_bytes()
+
+
+def test_editing_a_loaded_map_leaves_the_file_unchanged(tmp_path):
+    path = tmp_path / "world.map"
+    game_map = Map(seed=6)
+    game_map.generate_area(0, 0, 1, 1)
+    game_map.save_map(str(path))
+    saved = path.read_bytes()
+
+    loaded = Map(filename=str(path))
+    loaded.set_tile(0, 0, TerrainType.WATER.value)
+
+    assert loaded.get_tile(0, 0) == TerrainType.WATER.value
+    assert path.read_bytes() == saved
+
+
+def test_maps_of_another_generator_are_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / "world.map")
+    game_map = Map(seed=6)
+    game_map.generate_area(0, 0, 1, 1)
+    game_map.save_map(path)
+
+    monkeypatch.setattr(Map, "GENERATOR_VERSION", Map.GENERATOR_VERSION + 1)
+    with pytest.raises(ValueError):
+        Map(filename=path)
+    monkeypatch.undo()
+    monkeypatch.setattr(Config, "LAKE_DENSITY", Config.LAKE_DENSITY * 2)
+    with pytest.raises(ValueError):
+        Map(filename=path)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "world.map"
+    path.write_bytes(b"not a map" * 100)
+
+    with pytest.raises(ValueError):
+        Map(filename=str(path))
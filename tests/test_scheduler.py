@@ -0,0 +1,114 @@
+from core.config import Config
+from core.inventory import Inventory
+from core.map import Map, TerrainType
+from core.scheduler import Scheduler
+from entities.driller import DrillerSystem
+from entities.ore import CoalItem
+
+
+def recorder():
+    runs = []
+    return runs, lambda tick, name: runs.append((tick, name))
+
+
+def test_events_run_at_their_tick_in_schedule_order():
+    scheduler = Scheduler(wheel_size=8)
+    runs, callback = recorder()
+    scheduler.schedule(3, callback, "a")
+    scheduler.schedule(20, callback, "far")
+    scheduler.schedule(3, callback, "b")
+    scheduler.schedule_in(1, callback, "next")
+
+    scheduler.advance(30)
+
+    assert runs == [(1, "next"), (3, "a"), (3, "b"), (20, "far")]
+
+
+def test_past_ticks_run_on_the_next_tick():
+    scheduler = Scheduler()
+    runs, callback = recorder()
+    scheduler.advance(5)
+
+    scheduler.schedule(2, callback, "late")
+    scheduler.step()
+
+    assert runs == [(6, "late")]
+
+
+def test_cancelled_events_dont_run_nor_count():
+    scheduler = Scheduler(wheel_size=8)
+    runs, callback = recorder()
+    near = scheduler.schedule(2, callback, "near")
+    far = scheduler.schedule(50, callback, "far")
+    scheduler.schedule(4, callback, "kept")
+    assert len(scheduler) == 3
+
+    scheduler.cancel(near)
+    scheduler.cancel(far)
+    scheduler.cancel(far)
+
+    assert len(scheduler) == 1
+    scheduler.advance(60)
+    assert runs == [(4, "kept")]
+    assert len(scheduler) == 0
+
+
+def test_cancelling_a_run_event_changes_nothing():
+    scheduler = Scheduler()
+    runs, callback = recorder()
+    event = scheduler.schedule(1, callback, "done")
+    scheduler.step()
+
+    scheduler.cancel(event)
+
+    assert len(scheduler) == 0
+
+
+def test_events_scheduled_by_a_callback_run_later():
+    scheduler = Scheduler(wheel_size=4)
+    ticks = []
+
+    def repeat(tick):
+        ticks.append(tick)
+        if len(ticks) < 3:
+            scheduler.schedule(tick + 5, repeat)
+
+    scheduler.schedule(1, repeat)
+    scheduler.advance(20)
+
+    assert ticks == [1, 6, 11]
+
+
+def coal_drillers():
+    game_map = Map(seed=0)
+    game_map.load_area(0, 0, 8, 8)
+    for chunk in game_map.chunks.values():
+        chunk[:] = TerrainType.COAL.value
+    scheduler = Scheduler()
+    return scheduler, DrillerSystem(game_map, scheduler)
+
+
+def test_removed_drillers_leave_the_scheduler():
+    scheduler, drillers = coal_drillers()
+    batch = drillers.add_many([0, 2], [0, 0])
+    alone = drillers.add(4, 0)
+    assert len(scheduler) == 2
+
+    drillers.remove(alone)
+    assert len(scheduler) == 1
+    drillers.remove(int(batch[0]))
+    assert len(scheduler) == 1
+    drillers.remove(0)
+    assert len(scheduler) == 0
+
+
+def test_removed_drillers_stop_mining():
+    scheduler, drillers = coal_drillers()
+    inventory = Inventory(1, 1)
+    drillers.add(0, 0, inventory)
+    last = drillers.add(2, 0, inventory)
+
+    drillers.remove(last)
+    scheduler.advance(Config.DRILLER_MINING_TIME)
+
+    assert inventory.get_item_count(CoalItem) == 1